@@ -23,6 +23,46 @@ class Settings(BaseSettings):
     supabase_anon_key: str = os.getenv("SUPABASE_ANON_KEY", "")
     supabase_service_key: str = os.getenv("SUPABASE_SERVICE_KEY", "")
     
+    # Storage backend: supabase | sqlite | mock
+    database_backend: str = os.getenv("DATABASE_BACKEND", "supabase")
+    sqlite_path: str = os.getenv("SQLITE_PATH", "data/blog.sqlite3")
+    
+    # Local SQLite read replica of blog_articles (supabase backend only)
+    replica_enabled: bool = os.getenv("REPLICA_ENABLED", "false").lower() == "true"
+    replica_path: str = os.getenv("REPLICA_PATH", "data/replica.sqlite3")
+    replica_sync_interval: int = int(os.getenv("REPLICA_SYNC_INTERVAL", "300"))  # seconds
+    
+    # Database connection pool (shared by every DatabaseManager in the process)
+    db_pool_max_connections: int = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "10"))
+    db_pool_max_keepalive: int = int(os.getenv("DB_POOL_MAX_KEEPALIVE", "5"))
+    db_keepalive_expiry: float = float(os.getenv("DB_KEEPALIVE_EXPIRY", "30"))
+    db_timeout: float = float(os.getenv("DB_TIMEOUT", "30"))
+    db_connect_timeout: float = float(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    db_slow_query_ms: float = float(os.getenv("DB_SLOW_QUERY_MS", "1000"))  # log queries slower than this
+    db_metrics_dump: str = os.getenv("DB_METRICS_DUMP", "")  # JSON file written at exit
+    stats_cache_ttl: int = int(os.getenv("STATS_CACHE_TTL", "60"))  # seconds
+    read_cache_size: int = int(os.getenv("READ_CACHE_SIZE", "256"))  # entries
+    read_cache_ttl: int = int(os.getenv("READ_CACHE_TTL", "300"))  # seconds
+    known_row_ttl: int = int(os.getenv("KNOWN_ROW_TTL", "30"))  # seconds an update may diff against a remembered row
+    
+    # Backups
+    backup_dir: str = os.getenv("BACKUP_DIR", "backups")
+    backup_compression: str = os.getenv("BACKUP_COMPRESSION", "gzip")  # gzip | zstd | none
+    backup_max_incrementals: int = int(os.getenv("BACKUP_MAX_INCREMENTALS", "30"))
+    restore_chunk_size: int = int(os.getenv("RESTORE_CHUNK_SIZE", "500"))
+    restore_concurrency: int = int(os.getenv("RESTORE_CONCURRENCY", "4"))
+    export_dir: str = os.getenv("EXPORT_DIR", "exports")  # Parquet/Arrow exports
+    
+    # Outbox for writes that failed while the database was unavailable
+    outbox_path: str = os.getenv("OUTBOX_PATH", "data/outbox.sqlite3")
+    outbox_drain_interval: int = int(os.getenv("OUTBOX_DRAIN_INTERVAL", "60"))  # seconds
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
+    
+    # Page views posted to the health server, flushed to article_stats
+    view_flush_interval: int = int(os.getenv("VIEW_FLUSH_INTERVAL", "60"))  # seconds
+    trusted_proxies: str = os.getenv("TRUSTED_PROXIES", "")  # comma-separated; only their X-Forwarded-For is used
+    trending_half_life_hours: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+    
     # General
     environment: str = os.getenv("ENVIRONMENT", "development")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
@@ -110,9 +150,11 @@ GOOGLE_NEWS_CONFIG = {
 # Publishing Schedule
 PUBLISHING_SCHEDULE = {
     "frequency": "every_3_days",
-    "optimal_times": ["09:00", "14:00"],  # CET/CEST
+    "optimal_times": ["09:00", "14:00"],  # CET/CEST, publish slots for scheduled drafts
+    "generation_time": "03:00",  # Off-peak generation of the scheduled drafts
     "posts_per_month": 10,
     "categories_rotation": True,
+    "trending_weight": 1.0,  # How strongly category traffic steers the rotation (0 = off)
     
     "seasonal_topics": {
         "lente": ["broedseizoen", "natuurbeheer", "flora"],
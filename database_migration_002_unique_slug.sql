@@ -0,0 +1,14 @@
+-- Migration: enforce unique slugs on blog_articles
+-- Run this in your Supabase SQL editor after database_migration.sql
+--
+-- DatabaseManager.create_article relies on this constraint to detect slug
+-- races between concurrent workers and retries with a suffixed slug.
+
+-- Resolve existing duplicates first (keeps the oldest row's slug)
+UPDATE public.blog_articles AS a
+SET slug = a.slug || '-' || to_char(a.created_at, 'YYYYMMDD-HH24MISS')
+FROM public.blog_articles AS b
+WHERE a.slug = b.slug
+  AND a.created_at > b.created_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_blog_slug_unique ON public.blog_articles(slug);
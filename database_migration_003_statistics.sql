@@ -0,0 +1,32 @@
+-- Migration: aggregate statistics RPC for blog_articles
+-- Run this in your Supabase SQL editor after database_migration_002_unique_slug.sql
+--
+-- DatabaseManager.get_statistics calls this function once instead of issuing
+-- four queries and counting categories client-side.
+
+CREATE OR REPLACE FUNCTION public.blog_article_statistics(recent_days INTEGER DEFAULT 7)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total_articles', COUNT(*),
+        'published_articles', COUNT(*) FILTER (WHERE status = 'published'),
+        'recent_articles', COUNT(*) FILTER (
+            WHERE created_at >= NOW() - make_interval(days => recent_days)
+        ),
+        'category_distribution', COALESCE((
+            SELECT jsonb_object_agg(category, article_count)
+            FROM (
+                SELECT COALESCE(category, 'unknown') AS category, COUNT(*) AS article_count
+                FROM public.blog_articles
+                WHERE status = 'published'
+                GROUP BY 1
+            ) AS categories
+        ), '{}'::jsonb)
+    )
+    FROM public.blog_articles;
+$$;
+
+-- Supports the recent-activity counter
+CREATE INDEX IF NOT EXISTS idx_blog_created ON public.blog_articles(created_at DESC);
@@ -0,0 +1,7 @@
+-- Migration: composite index for keyset pagination over blog_articles
+-- Run this in your Supabase SQL editor after database_migration_003_statistics.sql
+--
+-- DatabaseManager.iter_articles pages by (published_at, id); this index lets
+-- every page start with an index seek instead of scanning past an offset.
+
+CREATE INDEX IF NOT EXISTS idx_blog_published_id ON public.blog_articles(published_at, id);
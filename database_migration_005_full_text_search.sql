@@ -0,0 +1,56 @@
+-- Migration: ranked Dutch full-text search over blog_articles
+-- Run this in your Supabase SQL editor after database_migration_004_keyset_index.sql
+--
+-- Adds a weighted tsvector (title > excerpt > content) using the Dutch text
+-- search configuration, a GIN index on it, and the search_blog_articles RPC
+-- used by DatabaseManager.search_articles.
+
+ALTER TABLE public.blog_articles
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('dutch', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('dutch', COALESCE(excerpt, '')), 'B') ||
+    setweight(to_tsvector('dutch', regexp_replace(COALESCE(content, ''), '<[^>]+>', ' ', 'g')), 'C')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_blog_search_vector ON public.blog_articles USING GIN(search_vector);
+
+-- Returns one JSON object per match: the requested columns (all when
+-- result_columns is NULL) plus rank and a highlighted headline.
+CREATE OR REPLACE FUNCTION public.search_blog_articles(
+    search_query TEXT,
+    result_columns TEXT[] DEFAULT NULL,
+    result_limit INTEGER DEFAULT 20
+)
+RETURNS SETOF JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('dutch', search_query) AS q
+    ),
+    ranked AS (
+        SELECT a, ts_rank_cd(a.search_vector, query.q) AS rank, query.q
+        FROM public.blog_articles AS a, query
+        WHERE a.status = 'published'
+          AND a.search_vector @@ query.q
+        ORDER BY rank DESC
+        LIMIT result_limit
+    )
+    SELECT COALESCE((
+            SELECT jsonb_object_agg(key, value)
+            FROM jsonb_each(to_jsonb(ranked.a) - 'search_vector')
+            WHERE result_columns IS NULL OR key = ANY(result_columns)
+        ), '{}'::jsonb)
+        || jsonb_build_object(
+            'rank', ranked.rank,
+            'headline', ts_headline(
+                'dutch',
+                COALESCE((ranked.a).excerpt, '') || ' ' ||
+                    regexp_replace(COALESCE((ranked.a).content, ''), '<[^>]+>', ' ', 'g'),
+                ranked.q,
+                'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2'
+            )
+        )
+    FROM ranked
+    ORDER BY ranked.rank DESC;
+$$;
@@ -0,0 +1,21 @@
+-- Migration: precomputed related articles
+-- Run this in your Supabase SQL editor after database_migration_005_full_text_search.sql
+--
+-- DatabaseManager.refresh_related_articles fills this table with the top-K
+-- related articles per published article (MinHash/LSH over tags and
+-- keywords); get_related_articles reads it with one indexed lookup.
+
+CREATE TABLE IF NOT EXISTS public.related_articles (
+    article_id UUID NOT NULL,
+    related_id UUID NOT NULL,
+    rank SMALLINT NOT NULL,
+    score REAL NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (article_id, rank),
+    CONSTRAINT related_articles_article_id_fkey
+        FOREIGN KEY (article_id) REFERENCES public.blog_articles(id) ON DELETE CASCADE,
+    CONSTRAINT related_articles_related_id_fkey
+        FOREIGN KEY (related_id) REFERENCES public.blog_articles(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_related_related_id ON public.related_articles(related_id);
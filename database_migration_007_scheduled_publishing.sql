@@ -0,0 +1,13 @@
+-- Migration: scheduled publishing
+-- Run this in your Supabase SQL editor after database_migration_006_related_articles.sql
+--
+-- Scheduled articles are stored as drafts with a scheduled_at time.
+-- DatabaseManager.publish_due_articles releases every due draft with one
+-- bulk UPDATE ... WHERE status = 'draft' AND scheduled_at <= now; the
+-- partial index keeps that scan (and get_publishing_queue) limited to the
+-- scheduled drafts instead of the whole table.
+
+ALTER TABLE public.blog_articles ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_blog_scheduled_drafts ON public.blog_articles(scheduled_at)
+    WHERE status = 'draft' AND scheduled_at IS NOT NULL;
@@ -0,0 +1,18 @@
+-- Migration: article revision history
+-- Run this in your Supabase SQL editor after database_migration_007_scheduled_publishing.sql
+--
+-- DatabaseManager records a revision whenever an update changes versioned
+-- fields (title, content, SEO fields ...). Revision 1 and every 20th
+-- revision after it hold a full snapshot ("base"); the others hold a
+-- line-level delta on the previous revision ("delta"). data is
+-- zlib-compressed JSON, base64-encoded.
+
+CREATE TABLE IF NOT EXISTS public.article_revisions (
+    article_id UUID NOT NULL REFERENCES public.blog_articles(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('base', 'delta')),
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (article_id, revision)
+);
@@ -0,0 +1,23 @@
+-- Migration: idempotent article inserts
+-- Run this in your Supabase SQL editor after database_migration_008_article_revisions.sql
+--
+-- create_article stores md5(topic_id || ':' || content) as idempotency_key.
+-- When an insert conflicts, DatabaseManager looks the key up and returns
+-- the stored row, so tenacity retries after a lost response and outbox
+-- replays no longer create date-suffixed duplicates.
+
+ALTER TABLE public.blog_articles ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+-- Backfill existing rows; of existing duplicates only the oldest gets the key
+UPDATE public.blog_articles AS a
+SET idempotency_key = k.key
+FROM (
+    SELECT id, key, ROW_NUMBER() OVER (PARTITION BY key ORDER BY created_at, id) AS n
+    FROM (
+        SELECT id, created_at, md5(COALESCE(NULLIF(topic_id, 0)::text, '') || ':' || content) AS key
+        FROM public.blog_articles
+    ) AS keyed
+) AS k
+WHERE a.id = k.id AND k.n = 1 AND a.idempotency_key IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_blog_idempotency_key ON public.blog_articles(idempotency_key);
@@ -0,0 +1,13 @@
+-- Migration: derived content columns
+-- Run this in your Supabase SQL editor after database_migration_009_idempotency_key.sql
+--
+-- _prepare_article_for_db computes word_count, plain_text and content_hash
+-- (and read_time) from content once at write time, so analytics, search
+-- and dedupe jobs read them instead of reparsing the HTML. Existing rows
+-- are filled in by `python main.py backfill`.
+
+ALTER TABLE public.blog_articles ADD COLUMN IF NOT EXISTS word_count INTEGER;
+ALTER TABLE public.blog_articles ADD COLUMN IF NOT EXISTS plain_text TEXT;
+ALTER TABLE public.blog_articles ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_blog_content_hash ON public.blog_articles(content_hash);
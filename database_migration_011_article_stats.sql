@@ -0,0 +1,34 @@
+-- Migration: per-article view statistics
+-- Run this in your Supabase SQL editor after database_migration_010_derived_columns.sql
+--
+-- The health server counts page views (POST /views) in memory and flushes
+-- them here periodically: one read and one upsert per flush, never one
+-- write per view. visitors_hll holds the HyperLogLog registers (base64) so
+-- unique visitors keep merging across flushes.
+
+CREATE TABLE IF NOT EXISTS public.article_stats (
+    article_id UUID NOT NULL REFERENCES public.blog_articles(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views BIGINT NOT NULL DEFAULT 0,
+    unique_visitors INTEGER NOT NULL DEFAULT 0,
+    visitors_hll TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (article_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_stats_day ON public.article_stats(day);
+
+-- Most viewed articles since a day, for DatabaseManager.get_popular_articles
+CREATE OR REPLACE FUNCTION public.blog_popular_articles(since DATE, max_results INTEGER DEFAULT 10)
+RETURNS TABLE (article_id UUID, views BIGINT, unique_visitors BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.article_id, SUM(s.views)::BIGINT, SUM(s.unique_visitors)::BIGINT
+    FROM public.article_stats AS s
+    JOIN public.blog_articles AS a ON a.id = s.article_id
+    WHERE s.day >= since AND a.status = 'published'
+    GROUP BY s.article_id
+    ORDER BY 2 DESC
+    LIMIT max_results;
+$$;
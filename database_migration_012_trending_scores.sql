@@ -0,0 +1,17 @@
+-- Migration: decayed trending scores
+-- Run this in your Supabase SQL editor after database_migration_011_article_stats.sql
+--
+-- Every view flush adds its views to an exponentially decayed score per
+-- article and per category (src/trending.py). A score is stored as its
+-- value at reference_epoch (seconds since 1970); its current value is
+-- value * 2^(-(now - reference_epoch) / half_life), so rows only change
+-- when their article or category gets views.
+
+CREATE TABLE IF NOT EXISTS public.trending_scores (
+    scope TEXT NOT NULL CHECK (scope IN ('article', 'category')),
+    key TEXT NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    reference_epoch DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (scope, key)
+);
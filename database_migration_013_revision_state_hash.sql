@@ -0,0 +1,12 @@
+-- Migration: revision chain fingerprints
+-- Run this in your Supabase SQL editor after database_migration_012_trending_scores.sql
+--
+-- state_hash is a sha256 of the snapshot a revision rebuilds to. Before
+-- appending a delta, DatabaseManager compares it with the row it is
+-- about to change; when a write recorded no revision (batch update,
+-- restore, a failed recording) the next revision is stored as a full
+-- keyframe instead, so deltas are always applied to the right base.
+-- Existing revisions have no hash, so each article's next revision
+-- is a keyframe.
+
+ALTER TABLE public.article_revisions ADD COLUMN IF NOT EXISTS state_hash TEXT;
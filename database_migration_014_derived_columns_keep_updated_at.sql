@@ -0,0 +1,29 @@
+-- Migration: derived column backfill keeps updated_at
+-- Run this in your Supabase SQL editor after database_migration_013_revision_state_hash.sql
+--
+-- `python main.py backfill` writes only word_count, plain_text and
+-- content_hash. Bumping updated_at for those writes would restart the
+-- purge retention window of soft-deleted rows and put every article in
+-- the next incremental backup, so an update that changes nothing but the
+-- derived columns keeps the row's updated_at. Every other update still
+-- sets it to NOW().
+
+CREATE OR REPLACE FUNCTION update_blog_articles_updated_at_column()
+RETURNS TRIGGER AS $$
+DECLARE
+    derived TEXT[] := ARRAY['word_count', 'plain_text', 'content_hash', 'updated_at'];
+BEGIN
+    IF (to_jsonb(NEW) - derived) = (to_jsonb(OLD) - derived)
+       AND (to_jsonb(NEW) - 'updated_at') IS DISTINCT FROM (to_jsonb(OLD) - 'updated_at') THEN
+        NEW.updated_at = OLD.updated_at;
+    ELSE
+        NEW.updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_blog_articles_updated_at ON public.blog_articles;
+CREATE TRIGGER update_blog_articles_updated_at
+    BEFORE UPDATE ON public.blog_articles
+    FOR EACH ROW EXECUTE FUNCTION update_blog_articles_updated_at_column();
@@ -4,17 +4,51 @@ Simple health check server for Railway
 Runs alongside the main worker to provide health monitoring
 """
 
+import asyncio
+import hashlib
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from src.utils import setup_logging
+from src.views import ViewAggregator
 from loguru import logger
 
 
+# Page views counted between flushes to article_stats
+VIEWS = ViewAggregator()
+
+# Seconds between full reloads of the slug index used to verify view slugs
+SLUG_REFRESH_INTERVAL = 3600
+_slugs_refreshed_at = float("-inf")
+
+# Limits for one POST /views request
+MAX_VIEW_BODY = 64 * 1024
+MAX_VIEW_EVENTS = 500
+
+
+def client_address(peer: str, forwarded_for: str, trusted_proxies) -> str:
+    """Address of the client: the peer, unless it is a trusted proxy
+    
+    Behind trusted proxies the client is the last X-Forwarded-For hop not
+    added by one of them; entries before it are whatever the client sent.
+    """
+    if peer not in trusted_proxies or not forwarded_for:
+        return peer
+    for hop in reversed([hop.strip() for hop in forwarded_for.split(',')]):
+        if hop and hop not in trusted_proxies:
+            return hop
+    return peer
+
+
 class HealthHandler(BaseHTTPRequestHandler):
     """HTTP handler for health checks"""
     
+    # Peers whose X-Forwarded-For header is believed (Settings.trusted_proxies)
+    trusted_proxies = frozenset()
+    
     def do_GET(self):
         """Handle GET requests"""
         
@@ -28,9 +62,70 @@ class HealthHandler(BaseHTTPRequestHandler):
             self.test_api_connectivity()
         elif self.path == '/sheets':
             self.get_sheets_url()
+        elif self.path == '/metrics':
+            self.send_query_metrics()
+        else:
+            self.send_404()
+    
+    def do_POST(self):
+        """Handle POST requests"""
+        
+        if self.path == '/views':
+            self.ingest_views()
         else:
             self.send_404()
     
+    def do_OPTIONS(self):
+        """Answer CORS preflight requests for /views"""
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    def ingest_views(self):
+        """Count page-view events: {"slug": ..., "visitor": ...} or a list of them
+        
+        Views are only aggregated in memory here; flush_views writes them
+        to article_stats in batches.
+        """
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if not 0 < length <= MAX_VIEW_BODY:
+                self.send_json_response(413 if length else 400, {"status": "error", "message": "Invalid body size"})
+                return
+            
+            events = json.loads(self.rfile.read(length))
+            if isinstance(events, dict):
+                events = [events]
+            if not isinstance(events, list):
+                raise ValueError("Expected an event or a list of events")
+            
+            accepted = 0
+            for event in events[:MAX_VIEW_EVENTS]:
+                slug = event.get("slug") if isinstance(event, dict) else None
+                if not isinstance(slug, str) or not slug.strip("/"):
+                    continue
+                visitor = str(event.get("visitor") or self.visitor_fingerprint())
+                if VIEWS.record(slug.strip("/"), visitor):
+                    accepted += 1
+            
+            self.send_json_response(202, {"accepted": accepted})
+            
+        except ValueError as e:
+            self.send_json_response(400, {"status": "error", "message": str(e)})
+        except Exception as e:
+            logger.error(f"View ingestion error: {e}")
+            self.send_json_response(500, {"status": "error", "message": str(e)})
+    
+    def visitor_fingerprint(self) -> str:
+        """Anonymous visitor id from client address and user agent (never stored)"""
+        address = client_address(
+            self.client_address[0], self.headers.get('X-Forwarded-For', ''), self.trusted_proxies
+        )
+        user_agent = self.headers.get('User-Agent', '')
+        return hashlib.sha256(f"{address}|{user_agent}".encode()).hexdigest()
+    
     def send_health_check(self):
         """Send basic health check response"""
         try:
@@ -77,6 +172,16 @@ class HealthHandler(BaseHTTPRequestHandler):
             logger.error(f"Status check error: {e}")
             self.send_json_response(500, {"status": "error", "message": str(e)})
     
+    def send_query_metrics(self):
+        """Send per-operation database latency, row and payload histograms"""
+        try:
+            from src.metrics import QUERY_METRICS
+            self.send_json_response(200, QUERY_METRICS.snapshot())
+            
+        except Exception as e:
+            logger.error(f"Metrics error: {e}")
+            self.send_json_response(500, {"status": "error", "message": str(e)})
+    
     def send_json_response(self, status_code, data):
         """Send JSON response"""
         self.send_response(status_code)
@@ -217,6 +322,63 @@ class HealthHandler(BaseHTTPRequestHandler):
         logger.info(f"HTTP: {format % args}")
 
 
+def flush_views(database_manager) -> int:
+    """Write the views counted since the last flush; returns views written
+    
+    The slug index is reloaded at most every SLUG_REFRESH_INTERVAL; in
+    between, only slugs of pending buckets missing from it are looked up.
+    """
+    global _slugs_refreshed_at
+    
+    buckets = VIEWS.drain()
+    if not buckets:
+        return 0
+    
+    from src.database import close_postgrest_client
+    
+    refresh = time.monotonic() - _slugs_refreshed_at >= SLUG_REFRESH_INTERVAL
+    
+    async def run():
+        try:
+            if refresh:
+                await database_manager.get_article_slugs(refresh=True)
+            written = await database_manager.record_article_views(buckets)
+            # Slugs resolved by this flush are counted without a lookup from now on
+            VIEWS.set_known_slugs(await database_manager.get_article_slugs())
+            return written
+        finally:
+            await close_postgrest_client()
+    
+    try:
+        written = asyncio.run(run())
+        if refresh:
+            _slugs_refreshed_at = time.monotonic()
+        return written
+    except Exception as e:
+        logger.error(f"View flush failed, keeping {len(buckets)} buckets for the next one: {e}")
+        VIEWS.restore(buckets)
+        return 0
+
+
+def start_view_flusher(interval: int):
+    """Flush counted views every interval seconds in a background thread"""
+    def run():
+        database_manager = None
+        while True:
+            time.sleep(interval)
+            try:
+                if database_manager is None:
+                    from src.database import create_database_manager
+                    database_manager = create_database_manager()
+                flush_views(database_manager)
+            except Exception as e:
+                logger.error(f"View flusher error: {e}")
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
 def start_health_server(port=8000):
     """Start the health check server"""
     setup_logging("INFO")
@@ -224,9 +386,18 @@ def start_health_server(port=8000):
     server_address = ('', port)
     httpd = HTTPServer(server_address, HealthHandler)
     
+    from config.settings import Settings
+    settings = Settings()
+    HealthHandler.trusted_proxies = frozenset(
+        proxy.strip() for proxy in settings.trusted_proxies.split(',') if proxy.strip()
+    )
+    start_view_flusher(settings.view_flush_interval)
+    
     logger.info(f"🏥 Health server starting on port {port}")
     logger.info(f"📍 Health check: http://localhost:{port}/health")
     logger.info(f"📊 Status check: http://localhost:{port}/status")
+    logger.info(f"⏱️ Query metrics: http://localhost:{port}/metrics")
+    logger.info(f"👀 Page views: POST http://localhost:{port}/views")
     
     try:
         httpd.serve_forever()
@@ -19,7 +19,8 @@ from src.topics import TopicManager
 from src.generator import ContentGenerator
 from src.seo import SEOOptimizer
 # Use real Supabase database for production
-from src.database import DatabaseManager
+from src.database import close_postgrest_client, create_database_manager
+from src.metrics import QUERY_METRICS
 from src.scheduler import BlogScheduler, run_scheduler_daemon, emergency_generation
 from config.settings import Settings
 from loguru import logger
@@ -33,8 +34,8 @@ class JachtexamenBlogSystem:
         self.topic_manager = TopicManager()
         self.content_generator = ContentGenerator()
         self.seo_optimizer = SEOOptimizer()
-        self.database_manager = DatabaseManager()
-        self.scheduler = BlogScheduler()
+        self.database_manager = create_database_manager()
+        self.scheduler = BlogScheduler(database_manager=self.database_manager)
     
     async def initialize(self) -> bool:
         """Initialize the blog system"""
@@ -53,6 +54,11 @@ class JachtexamenBlogSystem:
             logger.error(f"❌ Database connection failed: {e}")
             return False
         
+        # Replay writes queued while the database was unavailable
+        outbox = await self.database_manager.drain_outbox()
+        if outbox["remaining"]:
+            logger.warning(f"⚠️ {outbox['remaining']} queued database writes still pending")
+        
         # Load topics
         topic_stats = self.topic_manager.get_topic_statistics()
         logger.info(f"✅ Topics loaded. Available: {topic_stats['unused_topics']}/{topic_stats['total_topics']}")
@@ -159,11 +165,11 @@ class JachtexamenBlogSystem:
         logger.info(f"📊 System health check complete. Status: {health['status']}")
         return health
     
-    async def backup_system(self) -> str:
+    async def backup_system(self, incremental: bool = False) -> str:
         """Create system backup"""
         logger.info("💾 Creating system backup...")
         
-        backup_file = await self.database_manager.backup_articles()
+        backup_file = await self.database_manager.backup_articles(incremental=incremental)
         if backup_file:
             logger.info(f"✅ Backup created: {backup_file}")
         else:
@@ -171,6 +177,19 @@ class JachtexamenBlogSystem:
         
         return backup_file
     
+    async def restore_system(self, paths: Optional[list] = None, concurrency: Optional[int] = None) -> Optional[dict]:
+        """Restore articles from backup files (default: the current backup chain)"""
+        logger.info(f"♻️ Restoring articles from {', '.join(paths) if paths else 'backup chain'}...")
+        
+        try:
+            summary = await self.database_manager.restore_articles(paths or None, concurrency=concurrency)
+        except Exception as e:
+            logger.error(f"❌ Restore failed: {e}")
+            return None
+        
+        logger.info(f"✅ Restored {summary['restored']} articles ({summary.get('rows_per_second', 0)} rows/s)")
+        return summary
+    
     async def discover_new_topics(self) -> int:
         """Discover new topics from Google News"""
         logger.info("🔍 Discovering new topics...")
@@ -191,6 +210,9 @@ class JachtexamenBlogSystem:
         """Get comprehensive system statistics"""
         return {
             "database": await self.database_manager.get_statistics(),
+            "database_cache": self.database_manager.get_cache_stats(),
+            "database_outbox": self.database_manager.get_outbox_stats(),
+            "database_queries": QUERY_METRICS.snapshot()["totals"],
             "topics": self.topic_manager.get_topic_statistics(),
             "content_generator": self.content_generator.get_generation_stats(),
             "scheduler": self.scheduler.get_scheduler_status()
@@ -201,10 +223,18 @@ async def main():
     """Main function with CLI interface"""
     parser = argparse.ArgumentParser(description="Jachtexamen Blog System")
     parser.add_argument("command", choices=[
-        "init", "generate", "scheduler", "check", "backup", "discover", "stats", "emergency"
+        "init", "generate", "scheduler", "check", "backup", "restore", "purge", "backfill", "export", "discover", "stats", "emergency"
     ], help="Command to execute")
     parser.add_argument("--category", help="Category for article generation")
     parser.add_argument("--count", type=int, default=1, help="Number of articles for emergency generation")
+    parser.add_argument("paths", nargs="*", help="Backup files for restore (default: current backup chain)")
+    parser.add_argument("--incremental", action="store_true", help="Only back up articles changed since the last backup")
+    parser.add_argument("--concurrency", type=int, help="Concurrent upsert requests for restore")
+    parser.add_argument("--status", choices=["draft", "deleted"], default="draft", help="Articles to purge")
+    parser.add_argument("--days", type=int, default=30, help="Purge articles older than this many days")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the articles a purge would delete")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet", help="Columnar export file format")
+    parser.add_argument("--output", help="Export file (default: timestamped file in EXPORT_DIR)")
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     
     args = parser.parse_args()
@@ -255,9 +285,52 @@ async def main():
         if not await system.initialize():
             return 1
         
-        backup_file = await system.backup_system()
+        backup_file = await system.backup_system(incremental=args.incremental)
         return 0 if backup_file else 1
     
+    elif args.command == "restore":
+        if not await system.initialize():
+            return 1
+        
+        summary = await system.restore_system(args.paths, args.concurrency)
+        if not summary:
+            return 1
+        print(f"Restored: {summary['restored']} articles in {summary.get('seconds', 0)}s "
+              f"({summary.get('rows_per_second', 0)} rows/s)")
+        print(f"Invalid: {summary['invalid']}, Failed: {summary['failed']}")
+        return 0 if summary['failed'] == 0 else 1
+    
+    elif args.command == "purge":
+        if not await system.initialize():
+            return 1
+        
+        date_column = "created_at" if args.status == "draft" else "updated_at"
+        summary = await system.database_manager.purge_articles(
+            args.status, args.days, date_column, dry_run=args.dry_run
+        )
+        if args.dry_run:
+            print(f"Would purge: {summary['matched']} {args.status} articles older than {summary['cutoff']}")
+        else:
+            print(f"Purged: {summary['deleted']} {args.status} articles in {summary['chunks']} chunks")
+        return 0
+    
+    elif args.command == "backfill":
+        if not await system.initialize():
+            return 1
+        
+        updated = await system.database_manager.backfill_derived_columns()
+        print(f"Backfilled derived columns on {updated} articles")
+        return 0
+    
+    elif args.command == "export":
+        if not await system.initialize():
+            return 1
+        
+        export_file = await system.database_manager.export_articles(args.output, args.format)
+        if export_file:
+            print(f"Exported articles to {export_file}")
+        return 0 if export_file else 1
+    
     elif args.command == "discover":
         if not await system.initialize():
             return 1
@@ -274,6 +347,9 @@ async def main():
         print("\n📊 System Statistics:")
         print(f"Database Articles: {stats['database'].get('total_articles', 0)}")
         print(f"Published Articles: {stats['database'].get('published_articles', 0)}")
+        print(f"Read Cache Hit Rate: {stats['database_cache']['hit_rate']}%")
+        print(f"Database Queries: {stats['database_queries']['queries']} in {stats['database_queries']['total_ms']} ms")
+        print(f"Queued Writes: {stats['database_outbox']['pending']} pending, {stats['database_outbox']['dead']} failed")
         print(f"Topics Available: {stats['topics']['unused_topics']}/{stats['topics']['total_topics']}")
         print(f"API Calls Made: {stats['content_generator']['total_api_calls']}")
         return 0
@@ -289,6 +365,14 @@ async def main():
         return 1
 
 
+async def run_cli():
+    """Run the CLI and release the shared database connection pool afterwards"""
+    try:
+        return await main()
+    finally:
+        await close_postgrest_client()
+
+
 def run_interactive_mode():
     """Run system in interactive mode"""
     print("🎯 Jachtexamen Blog System - Interactive Mode")
@@ -343,7 +427,7 @@ if __name__ == "__main__":
             run_interactive_mode()
         else:
             # Arguments provided, run CLI mode
-            exit_code = asyncio.run(main())
+            exit_code = asyncio.run(run_cli())
             sys.exit(exit_code)
     except KeyboardInterrupt:
         logger.info("👋 System stopped by user")
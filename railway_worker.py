@@ -20,8 +20,8 @@ from src.generator import ContentGenerator
 from src.seo import SEOOptimizer
 from loguru import logger
 
-# Use ONLY real Supabase database - no fallbacks
-from src.database import DatabaseManager
+# Storage backend comes from DATABASE_BACKEND (Supabase unless set) - no fallbacks
+from src.database import close_postgrest_client, create_database_manager
 
 
 class RailwayBlogWorker:
@@ -32,15 +32,16 @@ class RailwayBlogWorker:
         self.topic_manager = TopicManager()
         self.content_generator = ContentGenerator()
         self.seo_optimizer = SEOOptimizer()
-        self.database_manager = DatabaseManager()
+        self.database_manager = create_database_manager()
         
     async def generate_article(self) -> bool:
         """Generate and publish a single article"""
         try:
             logger.info("🚀 Starting article generation...")
             
-            # Get next topic
-            topic = self.topic_manager.get_next_topic()
+            # Get next topic, favouring categories that get traffic
+            self.topic_manager.set_category_trends(await self.database_manager.get_trending_categories())
+            topic = self.topic_manager.get_next_topic(self.topic_manager.get_next_category())
             if not topic:
                 logger.warning("❌ No available topics found")
                 return False
@@ -93,6 +94,16 @@ class RailwayBlogWorker:
         try:
             logger.info("🔧 Running maintenance tasks...")
             
+            # Replay writes queued while the database was unavailable
+            outbox = await self.database_manager.drain_outbox()
+            if outbox["replayed"]:
+                logger.info(f"📮 Replayed {outbox['replayed']} queued database writes")
+            
+            # Release scheduled drafts whose publish time has passed
+            published = await self.database_manager.publish_due_articles()
+            if published:
+                logger.info(f"📰 Published {len(published)} scheduled articles")
+            
             # Get statistics
             stats = await self.database_manager.get_statistics()
             topic_stats = self.topic_manager.get_topic_statistics()
@@ -107,8 +118,8 @@ class RailwayBlogWorker:
                 if discovered:
                     logger.info("✅ New topics discovered")
             
-            # Create backup
-            backup_file = await self.database_manager.backup_articles()
+            # Create incremental backup (only rows changed since the last one)
+            backup_file = await self.database_manager.backup_articles(incremental=True)
             if backup_file:
                 logger.info(f"💾 Backup created: {backup_file}")
             
@@ -193,7 +204,10 @@ async def main():
     worker = RailwayBlogWorker()
     
     # Run the generation cycle
-    success = await worker.run_once()
+    try:
+        success = await worker.run_once()
+    finally:
+        await close_postgrest_client()
     
     if success:
         # Update last run timestamp only on success
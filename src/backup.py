@@ -0,0 +1,326 @@
+"""
+Backup file handling for Jachtexamen Blog System
+Streaming, compressed NDJSON backups with a trailing manifest
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from loguru import logger
+
+from src.utils import load_json_file, save_json_file
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+BACKUP_FORMAT_VERSION = 1
+
+# Key of the manifest object written as the last line of every backup
+MANIFEST_KEY = "_manifest"
+
+# Chain of full + incremental backups and the updated_at watermark
+STATE_FILENAME = "backup_state.json"
+
+COMPRESSION_EXTENSIONS = {
+    "gzip": "ndjson.gz",
+    "zstd": "ndjson.zst",
+    "none": "ndjson"
+}
+
+
+def resolve_compression(compression: str) -> str:
+    """Validate compression name, falling back to gzip when zstd is not installed"""
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unknown backup compression: {compression}")
+
+    if compression == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstd backups not available, using gzip. Install: pip install zstandard")
+        return "gzip"
+
+    return compression
+
+
+def backup_extension(compression: str) -> str:
+    """Get the file extension for a compression type"""
+    return COMPRESSION_EXTENSIONS[resolve_compression(compression)]
+
+
+def detect_compression(path: str) -> str:
+    """Detect compression of a backup file from its extension"""
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def open_backup_stream(path: str, mode: str, compression: Optional[str] = None):
+    """Open a backup file as a binary stream, (de)compressing transparently"""
+    compression = compression or detect_compression(path)
+
+    if compression == "gzip":
+        return gzip.open(path, mode + "b")
+
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd backups require the zstandard package")
+        raw = open(path, mode + "b")
+        if mode == "w":
+            return zstandard.ZstdCompressor().stream_writer(raw)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw))
+
+    return open(path, mode + "b")
+
+
+class BackupWriter:
+    """Writes articles one NDJSON line at a time and seals the file with a manifest
+
+    The file is written under a temporary name and only renamed into place
+    once the manifest has been written, so a partial backup never looks
+    complete.
+    """
+
+    def __init__(self, path: str, compression: str = "gzip"):
+        self.path = path
+        self.compression = resolve_compression(compression)
+        self.row_count = 0
+        self.manifest: Optional[Dict[str, Any]] = None
+        self._checksum = hashlib.sha256()
+        self._tmp_path = f"{path}.tmp"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._stream = open_backup_stream(self._tmp_path, "w", self.compression)
+
+    def write(self, article: Dict) -> None:
+        """Append one article as an NDJSON line"""
+        line = json.dumps(article, ensure_ascii=False, separators=(",", ":"), default=str)
+        data = (line + "\n").encode("utf-8")
+        self._checksum.update(data)
+        self._stream.write(data)
+        self.row_count += 1
+
+    def close(self, **extra: Any) -> Dict[str, Any]:
+        """Write the trailing manifest and move the file into place"""
+        self.manifest = {
+            "format_version": BACKUP_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "row_count": self.row_count,
+            "sha256": self._checksum.hexdigest(),
+            "compression": self.compression,
+            **extra
+        }
+        line = json.dumps({MANIFEST_KEY: self.manifest}, ensure_ascii=False, default=str)
+        self._stream.write((line + "\n").encode("utf-8"))
+        self._stream.close()
+        os.replace(self._tmp_path, self.path)
+        return self.manifest
+
+    def abort(self) -> None:
+        """Discard the partially written file"""
+        try:
+            self._stream.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def __enter__(self) -> "BackupWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        elif self.manifest is None:
+            self.close()
+
+
+class BackupIntegrityError(Exception):
+    """Raised when a backup file is truncated or its checksum does not match"""
+
+
+class BackupReader:
+    """Iterates the articles of an NDJSON backup and verifies its manifest
+
+    The manifest is checked once iteration reaches the end of the file;
+    use verify_backup() to validate a file before applying any rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest: Optional[Dict[str, Any]] = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        checksum = hashlib.sha256()
+        row_count = 0
+
+        with open_backup_stream(self.path, "r") as stream:
+            for data in stream:
+                if not data.strip():
+                    continue
+                record = json.loads(data)
+                if MANIFEST_KEY in record:
+                    self.manifest = record[MANIFEST_KEY]
+                    break
+                checksum.update(data)
+                row_count += 1
+                yield record
+
+        if self.manifest is None:
+            raise BackupIntegrityError(f"{self.path}: missing manifest (truncated backup?)")
+        if self.manifest.get("row_count") != row_count:
+            raise BackupIntegrityError(
+                f"{self.path}: manifest lists {self.manifest.get('row_count')} rows, found {row_count}"
+            )
+        if self.manifest.get("sha256") != checksum.hexdigest():
+            raise BackupIntegrityError(f"{self.path}: checksum mismatch")
+
+
+def is_ndjson_backup(path: str) -> bool:
+    """Check whether a backup is NDJSON (first line is one article or the manifest)"""
+    with open_backup_stream(path, "r") as stream:
+        first_line = stream.readline()
+    try:
+        record = json.loads(first_line)
+    except ValueError:
+        return False
+    return isinstance(record, dict) and not isinstance(record.get("articles"), list)
+
+
+def iter_json_backup(path: str, chunk_size: int = 1024 * 1024) -> Iterator[Dict]:
+    """Incrementally parse a plain JSON backup without loading it whole
+
+    Accepts the legacy {"created_at": ..., "articles": [...]} layout as
+    well as a bare top-level array of articles. Only one article (plus one
+    read chunk) is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    stream = io.TextIOWrapper(open_backup_stream(path, "r"), encoding="utf-8")
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        data = stream.read(chunk_size)
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[pos:] + data
+        pos = 0
+        return True
+
+    def skip(chars: str = " \t\r\n") -> str:
+        """Skip whitespace (and optional separators), returning the next char"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise BackupIntegrityError(f"{path}: unexpected end of JSON backup")
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(buffer) and not eof and isinstance(value, (int, float)):
+                if fill():
+                    continue
+            pos = end
+            return value
+
+    def iter_array() -> Iterator[Dict]:
+        nonlocal pos
+        pos += 1  # [
+        if skip() == "]":
+            pos += 1
+            return
+        while True:
+            skip()
+            yield decode()
+            if skip() == ",":
+                pos += 1
+                continue
+            if buffer[pos] != "]":
+                raise BackupIntegrityError(f"{path}: malformed article array")
+            pos += 1
+            return
+
+    try:
+        fill()
+        first = skip()
+        if first == "[":
+            yield from iter_array()
+            return
+        if first != "{":
+            raise BackupIntegrityError(f"{path}: not a JSON backup")
+
+        pos += 1
+        while skip(" \t\r\n,") != "}":
+            key = decode()
+            if skip() != ":":
+                raise BackupIntegrityError(f"{path}: malformed JSON backup")
+            pos += 1
+            if key == "articles" and skip() == "[":
+                yield from iter_array()
+            else:
+                skip()
+                decode()
+    finally:
+        stream.close()
+
+
+def iter_backup_articles(path: str) -> Iterator[Dict]:
+    """Stream articles from any backup file (NDJSON or plain JSON, compressed or not)"""
+    if is_ndjson_backup(path):
+        yield from BackupReader(path)
+    else:
+        yield from iter_json_backup(path)
+
+
+def verify_backup(path: str) -> Dict[str, Any]:
+    """Read a backup end to end and return its manifest if it is intact"""
+    reader = BackupReader(path)
+    for _ in reader:
+        pass
+    return reader.manifest
+
+
+def load_backup_state(backup_dir: str) -> Dict[str, Any]:
+    """Load the backup chain state (base, incrementals, watermark)"""
+    return load_json_file(os.path.join(backup_dir, STATE_FILENAME), default=None) or {
+        "base": None,
+        "incrementals": [],
+        "watermark": None
+    }
+
+
+def save_backup_state(backup_dir: str, state: Dict[str, Any]) -> bool:
+    """Persist the backup chain state"""
+    state["updated_at"] = datetime.now().isoformat()
+    return save_json_file(state, os.path.join(backup_dir, STATE_FILENAME))
+
+
+def backup_chain(state: Dict[str, Any]) -> List[str]:
+    """Files to replay for a restore: the base backup, then incrementals in order"""
+    if not state.get("base"):
+        return []
+    return [state["base"], *state.get("incrementals", [])]
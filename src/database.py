@@ -3,14 +3,239 @@ Database Manager for Jachtexamen Blog
 Handles all Supabase operations for blog articles
 """
 
+import asyncio
 import json
+import os
+import time
+import uuid
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from supabase import create_client, Client
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+from postgrest.utils import AsyncClient
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config.settings import Settings, ERROR_HANDLING
+from src.backup import (
+    BackupWriter, backup_chain, backup_extension, is_ndjson_backup,
+    iter_backup_articles, load_backup_state, save_backup_state, verify_backup
+)
+from src.cache import TTLCache
+from src.export import EXPORT_BATCH_SIZE, EXPORT_COLUMNS, EXPORT_EXTENSIONS, ColumnarWriter
+from src.metrics import QUERY_METRICS, InstrumentedTransport, dump_metrics_at_exit
+from src.outbox import OUTBOX_INSERT, OUTBOX_UPDATE, WriteOutbox
+from src.related import FEATURE_COLUMNS, RelatedArticlesIndex
+from src.revisions import REVISION_FIELDS, build_revision, keyframe_of, reconstruct, snapshot, state_hash
+from src.search import derived_columns
+from src.trending import TrendingEngine
+from src.views import merge_stats
+from src.seo import generate_sitemap_entry
+from src.utils import create_backup_filename, format_file_size, get_file_size, hash_content
+
+# Postgres error code raised by the unique constraint on slug
+UNIQUE_VIOLATION = "23505"
+
+# PostgREST error code when an RPC function does not exist
+MISSING_FUNCTION = "PGRST202"
+
+# SQLSTATE classes (connection, transaction rollback, resources, operator
+# intervention) and PostgREST connection codes that a later replay can fix
+TRANSIENT_ERROR_CODES = ("08", "40", "53", "57", "PGRST000", "PGRST001", "PGRST002", "PGRST003")
+
+# Rows per request when loading the slug index (PostgREST caps responses at 1000)
+SLUG_INDEX_PAGE_SIZE = 1000
+
+# Slugs per lookup when resolving slugs missing from the index (keeps the URL short)
+SLUG_RESOLVE_CHUNK_SIZE = 100
+
+# Named column projections for reads. List endpoints default to "summary"
+# so they do not ship full HTML content and JSONB blobs for every row.
+PROJECTIONS = {
+    "summary": (
+        "id, title, slug, excerpt, category, tags, cover_image_url, cover_image_alt, "
+        "author, read_time, status, published_at"
+    ),
+    "seo": (
+        "id, title, slug, excerpt, category, tags, status, published_at, updated_at, "
+        "meta_description, primary_keyword, secondary_keywords, internal_links, seo_score, "
+        "word_count, read_time"
+    ),
+    "full": "*"
+}
+
+# Precomputed related articles (database_migration_006_related_articles.sql)
+RELATED_TABLE = "related_articles"
+RELATED_FOREIGN_KEY = "related_articles_related_id_fkey"
+RELATED_TOP_K = 5
+RELATED_WRITE_BATCH = 200
+
+# Outbox entries replayed per drain_outbox round
+OUTBOX_BATCH_SIZE = 100
+
+# Columns of the internal-link index
+LINK_INDEX_COLUMNS = "id, slug, title, category, primary_keyword, secondary_keywords, tags"
+
+# Rows per page in iter_articles
+ITER_PAGE_SIZE = 500
+
+# Rows per page when streaming backups (pages carry full HTML content)
+BACKUP_PAGE_SIZE = 200
+
+# Seconds re-read before the watermark by incremental backups
+INCREMENTAL_BACKUP_OVERLAP = 300
+
+# Columns taken from the backup as-is instead of _prepare_article_for_db defaults
+RESTORE_PRESERVED_COLUMNS = (
+    "published_at", "created_at", "updated_at", "status", "geo_targeting", "language"
+)
+
+# Columns an upsert must carry to satisfy NOT NULL checks on the insert path
+UPSERT_REQUIRED_COLUMNS = {"id", "title", "slug", "content"}
+
+# Rows per upsert request in batch_update_articles
+BATCH_UPSERT_SIZE = 100
+
+# Largest list result kept in the read cache (bulk scans bypass it)
+READ_CACHE_MAX_ROWS = 100
+
+# Concurrent requests for heterogeneous partial updates
+BATCH_UPDATE_CONCURRENCY = 5
+
+# Revision history (database_migration_008_article_revisions.sql)
+REVISIONS_TABLE = "article_revisions"
+
+# Attempts to append a revision when a concurrent update took the number
+REVISION_INSERT_ATTEMPTS = 3
+
+# Per-article daily view counters (database_migration_011_article_stats.sql)
+ARTICLE_STATS_TABLE = "article_stats"
+
+# Decayed trending scores (database_migration_012_trending_scores.sql)
+TRENDING_TABLE = "trending_scores"
+
+# Seconds before a reader reloads trending scores written by the view flusher
+TRENDING_RELOAD_SECONDS = 300
+
+# Rows scanned per batch of concurrent writes in backfill_derived_columns
+BACKFILL_BATCH_SIZE = 100
+
+# Rows deleted per statement by purge_articles, and the pause between chunks
+PURGE_CHUNK_SIZE = 200
+PURGE_CHUNK_PAUSE = 0.5
+
+# Columns read for each purge candidate (enough to invalidate caches)
+PURGE_COLUMNS = "id, slug, status, category"
+
+
+def _local_timestamp(value) -> str:
+    """ISO timestamp in local time without offset, like the other timestamp columns"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+def article_idempotency_key(article: Dict) -> str:
+    """Key shared by every insert of the same generated article (topic + content)"""
+    return hash_content(f"{article.get('topic_id') or ''}:{article['content']}")
+
+
+def _with_derived_columns(updates: Dict) -> Dict:
+    """Recompute the derived columns of an update that changes content"""
+    if "content" not in updates:
+        return updates
+    derived = derived_columns(updates["content"])
+    if "read_time" in updates:
+        derived.pop("read_time")
+    return {**updates, **derived}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Connection, timeout and 5xx failures, as opposed to errors in the write itself"""
+    if isinstance(error, (httpx.TransportError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if len(code) == 3 and code.isdigit():
+            # HTTP status of a response PostgREST could not turn into JSON
+            return int(code) >= 500
+        return code.startswith(TRANSIENT_ERROR_CODES)
+    return False
+
+
+def _columns(projection: str) -> str:
+    """Resolve a projection profile name to a PostgREST select list"""
+    try:
+        return PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"Unknown projection '{projection}', expected one of {sorted(PROJECTIONS)}")
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose HTTP session uses a bounded keep-alive pool
+    
+    Every request is timed and sized by InstrumentedTransport (see src/metrics.py).
+    """
+    
+    def __init__(self, base_url: str, *, headers: Dict[str, str], timeout: httpx.Timeout, limits: httpx.Limits):
+        self.limits = limits
+        super().__init__(base_url, headers=headers, timeout=timeout)
+    
+    def create_session(self, base_url: str, headers: Dict[str, str], timeout, verify: bool = True) -> AsyncClient:
+        return AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=InstrumentedTransport(
+                httpx.AsyncHTTPTransport(verify=verify, http2=True, limits=self.limits)
+            ),
+        )
+
+
+# One pooled client per event loop; httpx connections cannot be shared across loops
+_postgrest_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PooledPostgrestClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_postgrest_client(settings: Settings) -> PooledPostgrestClient:
+    """Get the process-wide PostgREST client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _postgrest_clients.get(loop)
+    
+    if client is None:
+        client = PooledPostgrestClient(
+            f"{settings.supabase_url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": settings.supabase_service_key,
+                "Authorization": f"Bearer {settings.supabase_service_key}",
+            },
+            timeout=httpx.Timeout(settings.db_timeout, connect=settings.db_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.db_pool_max_connections,
+                max_keepalive_connections=settings.db_pool_max_keepalive,
+                keepalive_expiry=settings.db_keepalive_expiry,
+            ),
+        )
+        _postgrest_clients[loop] = client
+        QUERY_METRICS.slow_query_ms = settings.db_slow_query_ms
+        dump_metrics_at_exit(settings.db_metrics_dump)
+        logger.debug(f"Created Supabase connection pool (max {settings.db_pool_max_connections} connections)")
+    
+    return client
+
+
+async def close_postgrest_client() -> None:
+    """Close the pooled PostgREST client of the running event loop"""
+    client = _postgrest_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 
 class DatabaseManager:
@@ -18,71 +243,158 @@ class DatabaseManager:
     
     def __init__(self):
         self.settings = Settings()
-        try:
-            # Create Supabase client with explicit parameters only
-            self.supabase: Client = create_client(
-                supabase_url=self.settings.supabase_url,
-                supabase_key=self.settings.supabase_service_key
-            )
-            logger.info("✅ Supabase client initialized successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Supabase client: {e}")
-            logger.error(f"❌ URL: {self.settings.supabase_url[:20]}...")
-            logger.error(f"❌ Key: {self.settings.supabase_service_key[:20]}...")
-            raise Exception(f"Cannot connect to Supabase: {e}")
+        self._open_storage()
         self.table_name = "blog_articles"
+        # slug -> article id, loaded lazily and kept in sync on writes
+        self._slug_index: Optional[Dict[str, Optional[str]]] = None
+        # Cached get_statistics snapshot and its monotonic timestamp
+        self._stats_snapshot: Optional[Dict] = None
+        self._stats_snapshot_at = 0.0
+        # LSH index behind related_articles, built lazily
+        self._related_index: Optional[RelatedArticlesIndex] = None
+        # Outbox for failed writes, opened on first use
+        self._outbox: Optional[WriteOutbox] = None
+        self._outbox_drainer: Optional[asyncio.Task] = None
+        # Local read replica (settings.replica_enabled), opened on first use
+        self._replica = None
+        # Read-through cache for get_article / list_articles / get_articles_by_category
+        self._read_cache = TTLCache(
+            maxsize=self.settings.read_cache_size, ttl=self.settings.read_cache_ttl
+        )
+        # Last-known column values per article id, so updates send only changes.
+        # Per process: a change made by another process (worker, health server)
+        # is not seen, so rows are only trusted for a short known_row_ttl
+        self._known_rows = TTLCache(
+            maxsize=self.settings.read_cache_size, ttl=self.settings.known_row_ttl
+        )
+        # Trending scores (loaded lazily) and article id -> category for them
+        self._trending: Optional[TrendingEngine] = None
+        self._trending_loaded_at = 0.0
+        self._article_categories: Dict[str, Optional[str]] = {}
+    
+    def _open_storage(self) -> None:
+        """Check the Supabase configuration (the client itself is pooled per event loop)"""
+        if not self.settings.supabase_url or not self.settings.supabase_service_key:
+            logger.error("❌ Failed to initialize Supabase client: SUPABASE_URL and SUPABASE_SERVICE_KEY are required")
+            raise Exception("Cannot connect to Supabase: missing URL or service key")
+        logger.info("✅ Supabase client initialized successfully")
+    
+    @property
+    def supabase(self) -> PooledPostgrestClient:
+        """Async PostgREST client sharing the process-wide connection pool"""
+        return get_postgrest_client(self.settings)
         
+    async def create_article(self, article_data: Dict) -> Optional[Dict]:
+        """Create a new blog article in the database
+        
+        If the insert still fails after retries with a connection, timeout
+        or 5xx error and queue_failed_writes is enabled, the prepared row is
+        queued in the outbox and returned with "queued": True; drain_outbox
+        inserts it once the database is back. Any other failure is raised.
+        """
+        # Prepare article data for database; the id is assigned here so a
+        # queued insert can be replayed idempotently
+        db_article = self._prepare_article_for_db(article_data)
+        db_article["id"] = str(article_data.get("id") or uuid.uuid4())
+        
+        try:
+            return await self._insert_with_retry(db_article)
+        except Exception as e:
+            logger.error(f"Error creating article: {e}")
+            if not is_transient_error(e) or not self._queue_write(OUTBOX_INSERT, db_article["id"], db_article):
+                raise
+            self._start_outbox_drainer()
+            return {**db_article, "queued": True}
+    
+    async def _get_by_idempotency_key(self, key: str) -> Optional[Dict]:
+        result = await self.supabase.table(self.table_name).select("*").eq(
+            "idempotency_key", key
+        ).limit(1).execute()
+        return result.data[0] if result.data else None
+    
     @retry(
         stop=stop_after_attempt(ERROR_HANDLING["database_errors"]["max_retries"]),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        reraise=True
     )
-    async def create_article(self, article_data: Dict) -> Optional[Dict]:
-        """Create a new blog article in the database"""
-        try:
-            # Prepare article data for database
-            db_article = self._prepare_article_for_db(article_data)
-            
-            # Check for duplicates and make slug unique if necessary
-            original_slug = db_article["slug"]
-            if await self._check_duplicate(db_article["slug"]):
-                # Add timestamp to make it unique
-                timestamp = datetime.now().strftime("%Y%m%d")
-                db_article["slug"] = f"{original_slug}-{timestamp}"
-                logger.info(f"Slug already exists, using unique slug: {db_article['slug']}")
-                
-                # Check again with new slug
-                if await self._check_duplicate(db_article["slug"]):
-                    # If still duplicate, add hour/minute
-                    timestamp = datetime.now().strftime("%Y%m%d-%H%M")
-                    db_article["slug"] = f"{original_slug}-{timestamp}"
-                    logger.info(f"Using more unique slug: {db_article['slug']}")
+    async def _insert_with_retry(self, db_article: Dict) -> Optional[Dict]:
+        """Insert a prepared article, retrying transient failures"""
+        return await self._insert_article(db_article)
+    
+    async def _insert_article(self, db_article: Dict) -> Optional[Dict]:
+        """Insert a prepared article, resolving slug collisions"""
+        db_article = dict(db_article)
+        
+        # Resolve slug collisions against the in-memory index and let the
+        # unique constraint on slug catch races with other workers
+        original_slug = db_article["slug"]
+        slug_index = await self._get_slug_index()
+        
+        for candidate in self._slug_candidates(original_slug):
+            if candidate in slug_index and slug_index[candidate] != db_article.get("id"):
+                continue
+            
+            db_article["slug"] = candidate
+            if candidate != original_slug:
+                logger.info(f"Slug already exists, using unique slug: {candidate}")
             
-            # Insert article
-            result = self.supabase.table(self.table_name).insert(db_article).execute()
+            try:
+                result = await self.supabase.table(self.table_name).insert(db_article).execute()
+            except APIError as e:
+                if e.code != UNIQUE_VIOLATION:
+                    raise
+                # An earlier attempt (lost response, retry, outbox replay) already stored it
+                existing = await self._get_by_idempotency_key(db_article["idempotency_key"])
+                if existing:
+                    logger.info(f"Article already stored, returning existing row: {existing['slug']}")
+                    slug_index[existing["slug"]] = existing["id"]
+                    self._remember(existing)
+                    return existing
+                # Another writer took this slug since the index was loaded
+                logger.info(f"Slug conflict on insert, retrying: {candidate}")
+                slug_index[candidate] = None
+                continue
             
             if result.data:
+                created = result.data[0]
+                slug_index[created["slug"]] = created.get("id")
+                self._invalidate_statistics()
+                self._invalidate_article(created)
+                self._remember(created)
+                self._replicate([created])
                 logger.info(f"Successfully created article: {db_article['title']}")
-                return result.data[0]
-            else:
-                logger.error("Failed to create article - no data returned")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error creating article: {e}")
-            raise
+                if created.get("status") == "published":
+                    await self.refresh_related_articles([created])
+                return created
+            
+            logger.error("Failed to create article - no data returned")
+            return None
+        
+        logger.error(f"Could not find a unique slug for: {original_slug}")
+        return None
     
-    async def get_article(self, article_id: str = None, slug: str = None) -> Optional[Dict]:
+    async def get_article(self, article_id: str = None, slug: str = None, projection: str = "full") -> Optional[Dict]:
         """Get article by ID or slug"""
         try:
             if article_id:
-                result = self.supabase.table(self.table_name).select("*").eq("id", article_id).execute()
+                cache_key = ("article", "id", article_id, projection)
             elif slug:
-                result = self.supabase.table(self.table_name).select("*").eq("slug", slug).execute()
+                cache_key = ("article", "slug", slug, projection)
             else:
                 raise ValueError("Either article_id or slug must be provided")
             
+            cached = self._read_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            
+            result = await self.supabase.table(self.table_name).select(_columns(projection)).eq(
+                cache_key[1], cache_key[2]
+            ).execute()
+            
             if result.data:
-                return result.data[0]
+                self._read_cache.set(cache_key, result.data[0])
+                self._remember(result.data[0])
+                return dict(result.data[0])
             return None
             
         except Exception as e:
@@ -90,32 +402,67 @@ class DatabaseManager:
             return None
     
     async def update_article(self, article_id: str, updates: Dict) -> Optional[Dict]:
-        """Update article with new data"""
+        """Update article with new data, sending only changed columns (None on failure)"""
+        changes = self._changed_columns(article_id, _with_derived_columns(updates))
+        if not changes:
+            logger.debug(f"Update of article {article_id} changes nothing, skipped")
+            return await self._unchanged_row(article_id)
+        
+        # Add updated timestamp without touching the caller's dict
+        updates = {**changes, "updated_at": datetime.now().isoformat()}
+        
+        outbox = self._get_outbox(create=False)
+        if outbox is not None and outbox.has_pending(article_id):
+            self._known_rows.pop(article_id)
+            if self._queue_write(OUTBOX_UPDATE, article_id, updates):
+                return {"id": article_id, **updates, "queued": True}
+        
         try:
-            # Add updated timestamp
-            updates["updated_at"] = datetime.now().isoformat()
-            
-            result = self.supabase.table(self.table_name).update(updates).eq("id", article_id).execute()
-            
-            if result.data:
-                logger.info(f"Successfully updated article: {article_id}")
-                return result.data[0]
-            return None
+            return await self._apply_update(article_id, updates)
             
         except Exception as e:
             logger.error(f"Error updating article: {e}")
-            return None
+            # The write may or may not have landed; diff against a fresh read next time
+            self._known_rows.pop(article_id)
+            if not is_transient_error(e) or not self._queue_write(OUTBOX_UPDATE, article_id, updates):
+                return None
+            self._start_outbox_drainer()
+            return {"id": article_id, **updates, "queued": True}
+    
+    async def _apply_update(self, article_id: str, updates: Dict) -> Optional[Dict]:
+        """Write an update and keep the local indexes in sync (raises on failure)"""
+        previous = await self._revision_before(article_id, updates)
+        result = await self.supabase.table(self.table_name).update(updates).eq("id", article_id).execute()
+        
+        if result.data:
+            if previous is not None:
+                await self._record_revision(article_id, previous, result.data[0])
+            if "slug" in updates:
+                self._index_slug(result.data[0]["slug"], article_id)
+            self._invalidate_statistics()
+            self._invalidate_article(result.data[0])
+            self._remember(result.data[0])
+            self._replicate(result.data)
+            logger.info(f"Successfully updated article: {article_id}")
+            return result.data[0]
+        return None
     
     async def delete_article(self, article_id: str) -> bool:
         """Delete article (soft delete by updating status)"""
         try:
-            result = self.supabase.table(self.table_name).update({
+            result = await self.supabase.table(self.table_name).update({
                 "status": "deleted",
                 "updated_at": datetime.now().isoformat()
             }).eq("id", article_id).execute()
             
             if result.data:
+                self._invalidate_statistics()
+                self._invalidate_article(result.data[0])
+                self._remember(result.data[0])
+                self._replicate(result.data)
                 logger.info(f"Successfully deleted article: {article_id}")
+                if self._related_index is not None:
+                    await self.refresh_related_articles(result.data)
                 return True
             return False
             
@@ -123,6 +470,132 @@ class DatabaseManager:
             logger.error(f"Error deleting article: {e}")
             return False
     
+    async def get_article_revisions(self, article_id: str) -> List[Dict]:
+        """Revision metadata for an article, oldest first"""
+        try:
+            result = await self.supabase.table(REVISIONS_TABLE).select(
+                "revision, kind, size, created_at"
+            ).eq("article_id", article_id).order("revision").execute()
+            return result.data or []
+            
+        except Exception as e:
+            logger.error(f"Error getting revisions: {e}")
+            return []
+    
+    async def get_article_revision(self, article_id: str, revision: int) -> Optional[Dict]:
+        """Reconstruct the versioned fields of an article at a revision"""
+        try:
+            rows = await self._load_revisions(article_id, keyframe_of(revision), revision)
+            if not rows or rows[-1]["revision"] != revision:
+                return None
+            return reconstruct(rows)
+            
+        except Exception as e:
+            logger.error(f"Error reconstructing revision {revision} of {article_id}: {e}")
+            return None
+    
+    async def rollback_article(self, article_id: str, revision: int) -> Optional[Dict]:
+        """Restore an article to a revision (recorded as a new revision)"""
+        state = await self.get_article_revision(article_id, revision)
+        if state is None:
+            logger.error(f"Revision {revision} of article {article_id} not found")
+            return None
+        
+        logger.info(f"Rolling back article {article_id} to revision {revision}")
+        return await self.update_article(article_id, state)
+    
+    async def _record_revision(self, article_id: str, previous: Dict, current: Dict) -> None:
+        """Append the change from previous to current to the revision chain (never raises)"""
+        try:
+            current = snapshot(current)
+            if current == previous:
+                return
+            
+            for _attempt in range(REVISION_INSERT_ATTEMPTS):
+                latest = await self._latest_revision(article_id)
+                rows = []
+                if latest is None:
+                    rows.append(build_revision(article_id, 1, None, previous))
+                    number, base = 1, previous
+                else:
+                    number = latest["revision"]
+                    base = previous if latest.get("state_hash") == state_hash(previous) else None
+                rows.append(build_revision(article_id, number + 1, base, current))
+                if await self._insert_revisions(rows):
+                    return
+            
+            logger.warning(f"Revision of {article_id} not recorded: revision numbers kept conflicting")
+            
+        except Exception as e:
+            logger.warning(f"Error recording revision for {article_id}: {e}")
+    
+    async def _revision_before(self, article_id: str, updates: Dict) -> Optional[Dict]:
+        """Versioned fields before an update, or None if the update does not touch them"""
+        if not any(field in updates for field in REVISION_FIELDS):
+            return None
+        try:
+            return await self._revision_snapshot(article_id)
+        except Exception as e:
+            logger.warning(f"Error reading revision base for {article_id}: {e}")
+            return None
+    
+    async def _revision_snapshots(self, rows: List[Dict]) -> Dict[str, Dict]:
+        """Versioned fields before a bulk write, keyed by id, for rows that change them"""
+        article_ids = [row["id"] for row in rows if any(field in row for field in REVISION_FIELDS)]
+        snapshots = {}
+        try:
+            for start in range(0, len(article_ids), BATCH_UPSERT_SIZE):
+                result = await self.supabase.table(self.table_name).select(
+                    ", ".join(("id",) + REVISION_FIELDS)
+                ).in_("id", article_ids[start:start + BATCH_UPSERT_SIZE]).execute()
+                snapshots.update({str(row["id"]): snapshot(row) for row in result.data or []})
+        except Exception as e:
+            logger.warning(f"Error reading revision bases: {e}")
+        return snapshots
+    
+    async def _record_revisions(self, snapshots: Dict[str, Dict], rows: List[Dict]) -> None:
+        """Record a revision for each written row that has a snapshot from before the write"""
+        semaphore = asyncio.Semaphore(BATCH_UPDATE_CONCURRENCY)
+        
+        async def record(row: Dict) -> None:
+            async with semaphore:
+                await self._record_revision(row["id"], snapshots[str(row["id"])], row)
+        
+        # An article written twice in one batch gets one revision, of its final state
+        latest = {str(row.get("id")): row for row in rows}
+        await asyncio.gather(*(record(row) for key, row in latest.items() if key in snapshots))
+    
+    async def _revision_snapshot(self, article_id: str) -> Optional[Dict]:
+        """Current versioned fields of an article"""
+        result = await self.supabase.table(self.table_name).select(
+            ", ".join(REVISION_FIELDS)
+        ).eq("id", article_id).limit(1).execute()
+        return snapshot(result.data[0]) if result.data else None
+    
+    async def _latest_revision(self, article_id: str) -> Optional[Dict]:
+        """Number and state_hash of the last revision, None without history"""
+        result = await self.supabase.table(REVISIONS_TABLE).select("revision, state_hash").eq(
+            "article_id", article_id
+        ).order("revision", desc=True).limit(1).execute()
+        return result.data[0] if result.data else None
+    
+    async def _insert_revisions(self, rows: List[Dict]) -> bool:
+        """Insert revision rows; False when a revision number is already taken"""
+        try:
+            await self.supabase.table(REVISIONS_TABLE).insert(rows, returning=ReturnMethod.minimal).execute()
+            return True
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                return False
+            raise
+    
+    async def _load_revisions(self, article_id: str, first: int, last: int) -> List[Dict]:
+        """Revision rows first..last, in order"""
+        result = await self.supabase.table(REVISIONS_TABLE).select("revision, kind, data").eq(
+            "article_id", article_id
+        ).gte("revision", first).lte("revision", last).order("revision").execute()
+        return result.data or []
+    
     async def list_articles(
         self, 
         status: str = "published",
@@ -130,11 +603,19 @@ class DatabaseManager:
         limit: int = 50,
         offset: int = 0,
         order_by: str = "published_at",
-        order_direction: str = "desc"
+        order_direction: str = "desc",
+        projection: str = "summary"
     ) -> List[Dict]:
         """List articles with filtering and pagination"""
         try:
-            query = self.supabase.table(self.table_name).select("*")
+            cache_key = ("list", status, category, limit, offset, order_by, order_direction, projection)
+            cacheable = limit <= READ_CACHE_MAX_ROWS
+            if cacheable:
+                cached = self._read_cache.get(cache_key)
+                if cached is not None:
+                    return [dict(row) for row in cached]
+            
+            query = self.supabase.table(self.table_name).select(_columns(projection))
             
             # Apply filters
             if status:
@@ -146,20 +627,99 @@ class DatabaseManager:
             query = query.order(order_by, desc=(order_direction == "desc"))
             query = query.range(offset, offset + limit - 1)
             
-            result = query.execute()
-            return result.data if result.data else []
+            result = await query.execute()
+            rows = result.data if result.data else []
+            if cacheable:
+                self._read_cache.set(cache_key, rows)
+            return [dict(row) for row in rows]
             
         except Exception as e:
             logger.error(f"Error listing articles: {e}")
             return []
     
-    async def search_articles(self, search_term: str, limit: int = 20) -> List[Dict]:
-        """Search articles by title and content"""
+    async def iter_articles(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        columns: str = "*",
+        order_by: str = "published_at",
+        start_after: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Stream articles in (order_by, id) order using keyset pagination
+        
+        Each page continues after the last row of the previous one, so deep
+        pages cost the same as the first and concurrent writes never shift
+        rows between pages. Rows where order_by is null follow, ordered by
+        id, unless start_after restricts the scan to order_by > start_after.
+        """
+        if columns != "*":
+            selected = [c.strip() for c in columns.split(",")]
+            columns = ", ".join(selected + [c for c in ("id", order_by) if c not in selected])
+        
+        def base_query():
+            query = self.supabase.table(self.table_name).select(columns)
+            for column, value in (filters or {}).items():
+                query = query.eq(column, value)
+            return query
+        
+        # Rows with a sort value, paged by (order_by, id)
+        cursor = None
+        while True:
+            query = base_query().not_.is_(order_by, "null")
+            if start_after is not None:
+                query = query.gt(order_by, start_after)
+            if cursor:
+                key, article_id = cursor
+                query = query.or_(
+                    f'{order_by}.gt."{key}",'
+                    f'and({order_by}.eq."{key}",id.gt."{article_id}")'
+                )
+            result = await query.order(order_by).order("id").limit(page_size).execute()
+            rows = result.data or []
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                break
+            cursor = (rows[-1][order_by], rows[-1]["id"])
+        
+        if start_after is not None:
+            return
+        
+        # Rows without a sort value, paged by id
+        last_id = None
+        while True:
+            query = base_query().is_(order_by, "null")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            result = await query.order("id").limit(page_size).execute()
+            rows = result.data or []
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+    
+    async def search_articles(self, search_term: str, limit: int = 20, projection: str = "summary") -> List[Dict]:
+        """Ranked Dutch full-text search over title, excerpt and content
+        
+        Uses the search_blog_articles RPC (database_migration_005_full_text_search.sql).
+        Results are ordered best first and carry `rank` and a `headline`
+        snippet with matches wrapped in <mark>.
+        """
+        replica = await self._get_replica()
+        if replica is not None:
+            return await replica.search_articles(search_term, limit, projection)
+        
         try:
-            # Search in title and content using full-text search
-            result = self.supabase.table(self.table_name).select("*").text_search(
-                "title", search_term
-            ).limit(limit).execute()
+            columns = None
+            if projection != "full":
+                columns = [column.strip() for column in _columns(projection).split(",")]
+            
+            result = await self.supabase.rpc("search_blog_articles", {
+                "search_query": search_term,
+                "result_columns": columns,
+                "result_limit": limit
+            }).execute()
             
             return result.data if result.data else []
             
@@ -167,28 +727,71 @@ class DatabaseManager:
             logger.error(f"Error searching articles: {e}")
             return []
     
-    async def get_articles_by_category(self, category: str, limit: int = 10) -> List[Dict]:
+    async def get_articles_by_category(self, category: str, limit: int = 10, projection: str = "summary") -> List[Dict]:
         """Get recent articles from specific category"""
         try:
-            result = self.supabase.table(self.table_name).select("*").eq(
+            cache_key = ("list", "published", category, limit, 0, "published_at", "desc", projection)
+            cached = self._read_cache.get(cache_key)
+            if cached is not None:
+                return [dict(row) for row in cached]
+            
+            result = await self.supabase.table(self.table_name).select(_columns(projection)).eq(
                 "category", category
             ).eq("status", "published").order(
                 "published_at", desc=True
             ).limit(limit).execute()
             
-            return result.data if result.data else []
+            rows = result.data if result.data else []
+            self._read_cache.set(cache_key, rows)
+            return [dict(row) for row in rows]
             
         except Exception as e:
             logger.error(f"Error getting articles by category: {e}")
             return []
     
-    async def get_popular_articles(self, days: int = 30, limit: int = 10) -> List[Dict]:
-        """Get popular articles based on views (if tracking is implemented)"""
+    async def get_popular_articles(self, days: int = 30, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Get the most viewed published articles of the last days
+        
+        Ranked by views in article_stats, with "views" and "unique_visitors"
+        (sum of daily unique visitors) on each row. Falls back to recent
+        articles while there is no traffic data.
+        """
+        try:
+            since = (datetime.now() - timedelta(days=days)).date().isoformat()
+            result = await self.supabase.rpc("blog_popular_articles", {
+                "since": since,
+                "max_results": limit
+            }).execute()
+            
+            ranked = {row["article_id"]: row for row in result.data or []}
+            if ranked:
+                articles = await self.supabase.table(self.table_name).select(_columns(projection)).in_(
+                    "id", list(ranked)
+                ).eq("status", "published").execute()
+                rows = [
+                    {**article, "views": ranked[article["id"]]["views"],
+                     "unique_visitors": ranked[article["id"]]["unique_visitors"]}
+                    for article in articles.data or [] if article.get("id") in ranked
+                ]
+                if rows:
+                    return sorted(rows, key=lambda row: row["views"], reverse=True)
+            
+        except APIError as e:
+            if e.code == MISSING_FUNCTION:
+                logger.warning("Popular articles RPC missing - run database_migration_011_article_stats.sql")
+            else:
+                logger.error(f"Error getting popular articles: {e}")
+        except Exception as e:
+            logger.error(f"Error getting popular articles: {e}")
+        
+        return await self._get_recent_articles(days, limit, projection)
+    
+    async def _get_recent_articles(self, days: int, limit: int, projection: str) -> List[Dict]:
+        """Most recently published articles of the last days"""
         try:
-            # For now, return recent articles (can be enhanced with view tracking)
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            result = self.supabase.table(self.table_name).select("*").eq(
+            result = await self.supabase.table(self.table_name).select(_columns(projection)).eq(
                 "status", "published"
             ).gte("published_at", cutoff_date).order(
                 "published_at", desc=True
@@ -197,19 +800,188 @@ class DatabaseManager:
             return result.data if result.data else []
             
         except Exception as e:
-            logger.error(f"Error getting popular articles: {e}")
+            logger.error(f"Error getting recent articles: {e}")
+            return []
+    
+    async def record_article_views(self, buckets: List[Dict]) -> int:
+        """Add drained view buckets (see src.views.ViewAggregator) to article_stats
+        
+        One read of the touched rows and one upsert per call, however many
+        views the buckets hold. Counters and visitor sketches are merged
+        here, so there must be a single writer. Buckets whose slug is not
+        an article are discarded. Raises on failure so the caller can keep
+        the buckets for the next flush.
+        """
+        if not buckets:
+            return 0
+        
+        slug_index = await self._get_slug_index()
+        unknown = sorted({bucket["slug"] for bucket in buckets if not slug_index.get(bucket["slug"])})
+        # Articles created by another process since the index was loaded
+        for start in range(0, len(unknown), SLUG_RESOLVE_CHUNK_SIZE):
+            for row in await self._resolve_slugs(unknown[start:start + SLUG_RESOLVE_CHUNK_SIZE]):
+                self._index_slug(row["slug"], row["id"])
+        
+        by_key = {}
+        discarded = 0
+        for bucket in buckets:
+            article_id = slug_index.get(bucket["slug"])
+            if article_id:
+                by_key[(str(article_id), bucket["day"])] = bucket
+            else:
+                discarded += bucket["views"]
+        if discarded:
+            logger.warning(f"Discarded {discarded} views of unknown slugs")
+        if not by_key:
+            return 0
+        
+        existing = await self._load_article_stats(
+            sorted({key[0] for key in by_key}), sorted({key[1] for key in by_key})
+        )
+        timestamp = datetime.now().isoformat()
+        rows = [
+            {"article_id": article_id, "day": day, **merge_stats(existing.get((article_id, day)), bucket),
+             "updated_at": timestamp}
+            for (article_id, day), bucket in by_key.items()
+        ]
+        await self._store_article_stats(rows)
+        
+        try:
+            # The counters are already stored; trending must not fail the flush
+            await self._update_trending(by_key)
+        except Exception as e:
+            logger.warning(f"Could not update trending scores: {e}")
+        
+        views = sum(bucket["views"] for bucket in by_key.values())
+        logger.info(f"Recorded {views} views on {len(rows)} article days")
+        return views
+    
+    async def _resolve_slugs(self, slugs: List[str]) -> List[Dict]:
+        result = await self.supabase.table(self.table_name).select("id, slug").in_("slug", slugs).execute()
+        return result.data or []
+    
+    async def _load_article_stats(self, article_ids: List[str], days: List[str]) -> Dict[tuple, Dict]:
+        """Stored article_stats rows keyed by (article_id, day)"""
+        result = await self.supabase.table(ARTICLE_STATS_TABLE).select(
+            "article_id, day, views, visitors_hll"
+        ).in_("article_id", article_ids).in_("day", days).execute()
+        return {(str(row["article_id"]), row["day"]): row for row in result.data or []}
+    
+    async def _store_article_stats(self, rows: List[Dict]) -> None:
+        await self.supabase.table(ARTICLE_STATS_TABLE).upsert(
+            rows, on_conflict="article_id,day", returning=ReturnMethod.minimal
+        ).execute()
+    
+    async def get_trending_articles(self, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Published articles with the highest decayed view score
+        
+        Read from the maintained ranking, so the cost does not depend on
+        how much traffic history there is. Each row gets "trending_score".
+        """
+        try:
+            engine = await self._get_trending()
+            # Ask for a few extra in case some of them are no longer published
+            ranked = dict(engine.articles.top(limit * 2))
+            if not ranked:
+                return []
+            
+            rows = [
+                {**row, "trending_score": ranked[str(row["id"])]}
+                for row in await self._get_articles_by_ids(list(ranked), _columns(projection))
+                if row.get("status", "published") == "published" and str(row.get("id")) in ranked
+            ]
+            return sorted(rows, key=lambda row: row["trending_score"], reverse=True)[:limit]
+            
+        except Exception as e:
+            logger.error(f"Error getting trending articles: {e}")
             return []
     
-    async def get_related_articles(self, article_id: str, limit: int = 5) -> List[Dict]:
-        """Get related articles based on category and tags"""
+    async def get_trending_categories(self) -> Dict[str, float]:
+        """Decayed view score per category (empty without traffic data)"""
+        try:
+            engine = await self._get_trending()
+            return engine.categories.scores()
+        except Exception as e:
+            logger.error(f"Error getting trending categories: {e}")
+            return {}
+    
+    async def _get_trending(self) -> TrendingEngine:
+        """Trending engine, reloaded from trending_scores every TRENDING_RELOAD_SECONDS
+        
+        The writer (record_article_views) keeps its engine current itself;
+        a reload only picks up scores flushed by another process.
+        """
+        now = time.monotonic()
+        if self._trending is None or now - self._trending_loaded_at > TRENDING_RELOAD_SECONDS:
+            engine = TrendingEngine(self.settings.trending_half_life_hours)
+            engine.load(await self._load_trending_rows())
+            self._trending = engine
+            self._trending_loaded_at = now
+        return self._trending
+    
+    async def _update_trending(self, by_key: Dict[tuple, Dict]) -> None:
+        """Add flushed views to the decayed scores and store the changed ones"""
+        views: Dict[str, int] = {}
+        for (article_id, _day), bucket in by_key.items():
+            views[article_id] = views.get(article_id, 0) + bucket["views"]
+        
+        missing = [article_id for article_id in views if article_id not in self._article_categories]
+        if missing:
+            for row in await self._get_articles_by_ids(missing, "id, category"):
+                self._article_categories[str(row["id"])] = row.get("category")
+        
+        engine = await self._get_trending()
+        for article_id, count in views.items():
+            engine.record(article_id, self._article_categories.get(article_id), count)
+        # Keep this engine: it is now ahead of the table until the upsert lands
+        self._trending_loaded_at = time.monotonic()
+        await self._store_trending(engine.dirty_rows())
+    
+    async def _get_articles_by_ids(self, article_ids: List[str], columns: str) -> List[Dict]:
+        result = await self.supabase.table(self.table_name).select(columns).in_("id", article_ids).execute()
+        return result.data or []
+    
+    async def _load_trending_rows(self) -> List[Dict]:
+        result = await self.supabase.table(TRENDING_TABLE).select("scope, key, value, reference_epoch").execute()
+        return result.data or []
+    
+    async def _store_trending(self, rows: List[Dict]) -> None:
+        if rows:
+            await self.supabase.table(TRENDING_TABLE).upsert(
+                rows, on_conflict="scope,key", returning=ReturnMethod.minimal
+            ).execute()
+    
+    async def get_related_articles(self, article_id: str, limit: int = 5, projection: str = "summary") -> List[Dict]:
+        """Get related articles from the precomputed related_articles table
+        
+        One indexed read embedding the related rows; falls back to recent
+        articles from the same category until the table has been computed
+        for this article (see refresh_related_articles). Served from the
+        local replica when enabled.
+        """
+        replica = await self._get_replica()
+        if replica is not None:
+            return await replica.get_related_articles(article_id, limit, projection)
+        
         try:
-            # First get the source article
-            source_article = await self.get_article(article_id=article_id)
+            result = await self.supabase.table(RELATED_TABLE).select(
+                f"score, article:{self.table_name}!{RELATED_FOREIGN_KEY}({_columns(projection)})"
+            ).eq("article_id", article_id).order("rank").limit(limit).execute()
+            
+            related = [
+                {**row["article"], "related_score": row["score"]}
+                for row in (result.data or [])
+                if row.get("article") and row["article"].get("status", "published") == "published"
+            ]
+            if related:
+                return related
+            
+            # Not computed yet: same category, most recent first
+            source_article = await self.get_article(article_id=article_id, projection="summary")
             if not source_article:
                 return []
             
-            # Find articles with same category or overlapping tags
-            result = self.supabase.table(self.table_name).select("*").eq(
+            result = await self.supabase.table(self.table_name).select(_columns(projection)).eq(
                 "category", source_article["category"]
             ).eq("status", "published").neq(
                 "id", article_id
@@ -221,111 +993,880 @@ class DatabaseManager:
             logger.error(f"Error getting related articles: {e}")
             return []
     
-    async def get_statistics(self) -> Dict:
-        """Get comprehensive database statistics"""
-        try:
-            # Total articles
-            total_result = self.supabase.table(self.table_name).select("id", count="exact").execute()
-            total_count = total_result.count if total_result.count else 0
-            
-            # Published articles
-            published_result = self.supabase.table(self.table_name).select(
-                "id", count="exact"
-            ).eq("status", "published").execute()
-            published_count = published_result.count if published_result.count else 0
-            
-            # Articles by category
-            categories_result = self.supabase.table(self.table_name).select(
-                "category", count="exact"
-            ).eq("status", "published").execute()
-            
-            category_counts = {}
-            if categories_result.data:
-                for row in categories_result.data:
-                    category = row.get("category", "unknown")
-                    category_counts[category] = category_counts.get(category, 0) + 1
-            
-            # Recent activity (last 7 days)
-            week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            recent_result = self.supabase.table(self.table_name).select(
-                "id", count="exact"
-            ).gte("created_at", week_ago).execute()
-            recent_count = recent_result.count if recent_result.count else 0
-            
-            return {
-                "total_articles": total_count,
-                "published_articles": published_count,
-                "draft_articles": total_count - published_count,
-                "category_distribution": category_counts,
-                "recent_articles_7_days": recent_count,
+    async def refresh_related_articles(self, articles: Optional[List[Dict]] = None) -> int:
+        """Recompute precomputed related articles
+        
+        Without arguments every published article is recomputed from a fresh
+        index. Given changed article rows, only those rows and the articles
+        sharing an LSH bucket with them are recomputed and rewritten.
+        Returns the number of articles whose related list was written.
+        """
+        try:
+            if articles is None:
+                self._related_index = None
+            index = await self._get_related_index()
+            
+            if articles is None:
+                targets = set(index.articles)
+            else:
+                targets = set()
+                for article in articles:
+                    article_id = str(article["id"])
+                    targets |= index.affected_by(article_id)
+                    if article.get("status") == "published":
+                        index.add(article)
+                    else:
+                        index.remove(article_id)
+                    targets |= index.affected_by(article_id)
+            
+            related = index.compute(targets, k=RELATED_TOP_K)
+            target_ids = sorted(targets)
+            await self._store_related(target_ids, related)
+            
+            logger.info(f"Refreshed related articles for {len(target_ids)} articles")
+            return len(target_ids)
+            
+        except Exception as e:
+            logger.error(f"Error refreshing related articles: {e}")
+            return 0
+    
+    async def _store_related(self, target_ids: List[str], related: Dict[str, List[tuple]]) -> None:
+        """Replace the related_articles rows of the given articles"""
+        for i in range(0, len(target_ids), RELATED_WRITE_BATCH):
+            chunk_ids = target_ids[i:i + RELATED_WRITE_BATCH]
+            rows = [
+                {"article_id": article_id, "related_id": related_id, "rank": rank, "score": score}
+                for article_id in chunk_ids
+                for rank, (related_id, score) in enumerate(related.get(article_id, []))
+            ]
+            await self.supabase.table(RELATED_TABLE).delete().in_("article_id", chunk_ids).execute()
+            if rows:
+                await self.supabase.table(RELATED_TABLE).insert(
+                    rows, returning=ReturnMethod.minimal
+                ).execute()
+    
+    async def _get_related_index(self) -> RelatedArticlesIndex:
+        """Get the LSH index of published articles, loading features on first use"""
+        if self._related_index is None:
+            index = RelatedArticlesIndex()
+            async for article in self.iter_articles(
+                filters={"status": "published"}, columns=FEATURE_COLUMNS
+            ):
+                index.add(article)
+            self._related_index = index
+            logger.debug(f"Built related articles index over {len(index)} articles")
+        
+        return self._related_index
+    
+    async def get_internal_link_index(self) -> List[Dict]:
+        """Published articles as internal link targets (slug, title, keywords)"""
+        try:
+            source = await self._get_replica() or self
+            return [
+                row async for row in source.iter_articles(
+                    filters={"status": "published"}, columns=LINK_INDEX_COLUMNS
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error building internal link index: {e}")
+            return []
+    
+    async def get_sitemap_entries(self) -> List[Dict]:
+        """Sitemap entries for all published articles"""
+        try:
+            source = await self._get_replica() or self
+            return [
+                generate_sitemap_entry(row) async for row in source.iter_articles(
+                    filters={"status": "published"}, columns="slug, created_at, updated_at"
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error building sitemap: {e}")
+            return []
+    
+    async def get_statistics(self, use_cache: bool = True) -> Dict:
+        """Get comprehensive database statistics
+        
+        All counters come from one aggregate RPC (see
+        database_migration_003_statistics.sql); the snapshot is cached for
+        settings.stats_cache_ttl seconds.
+        """
+        if (use_cache and self._stats_snapshot is not None
+                and time.monotonic() - self._stats_snapshot_at < self.settings.stats_cache_ttl):
+            return dict(self._stats_snapshot)
+        
+        replica = await self._get_replica()
+        if replica is not None:
+            return await replica.get_statistics()
+        
+        try:
+            result = await self.supabase.rpc(
+                "blog_article_statistics", {"recent_days": 7}
+            ).execute()
+            data = result.data or {}
+            
+            stats = {
+                "total_articles": data.get("total_articles", 0),
+                "published_articles": data.get("published_articles", 0),
+                "draft_articles": data.get("total_articles", 0) - data.get("published_articles", 0),
+                "category_distribution": data.get("category_distribution") or {},
+                "recent_articles_7_days": data.get("recent_articles", 0),
                 "last_updated": datetime.now().isoformat()
             }
             
+            self._stats_snapshot = stats
+            self._stats_snapshot_at = time.monotonic()
+            return dict(stats)
+            
+        except APIError as e:
+            if e.code == MISSING_FUNCTION:
+                logger.error("Statistics RPC missing - run database_migration_003_statistics.sql")
+            else:
+                logger.error(f"Error getting statistics: {e}")
+            return {}
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
             return {}
     
+    def _invalidate_statistics(self) -> None:
+        """Drop the cached statistics snapshot after a write"""
+        self._stats_snapshot = None
+    
+    def _invalidate_article(self, row: Dict) -> None:
+        """Drop cached reads that contain the article or whose filters match it now"""
+        article_id = row.get("id")
+        
+        def is_stale(key, value) -> bool:
+            if key[0] == "article":
+                return value.get("id") == article_id
+            _, status, category = key[:3]
+            if any(cached.get("id") == article_id for cached in value):
+                return True
+            return ((status is None or status == row.get("status"))
+                    and (category is None or category == row.get("category")))
+        
+        self._read_cache.invalidate(is_stale)
+    
+    def _remember(self, row: Dict) -> None:
+        """Merge a row read from or written to the database into the known rows"""
+        article_id = row.get("id")
+        if article_id is None:
+            return
+        known = self._known_rows.get(article_id) or {}
+        self._known_rows.set(article_id, {**known, **row})
+        if "category" in row:
+            self._article_categories[str(article_id)] = row["category"]
+    
+    def _changed_columns(self, article_id: str, updates: Dict) -> Dict:
+        """Columns of updates whose value differs from the last-known row
+        
+        Columns the known row does not have are always kept; with no known
+        row every column is sent.
+        """
+        known = self._known_rows.get(article_id)
+        if known is None:
+            return dict(updates)
+        return {
+            column: value for column, value in updates.items()
+            if column not in known or known[column] != value
+        }
+    
+    async def _unchanged_row(self, article_id: str) -> Optional[Dict]:
+        """Row returned for an update that changes nothing"""
+        known = self._known_rows.get(article_id)
+        if known is not None:
+            return dict(known)
+        return await self.get_article(article_id=article_id)
+    
+    def get_cache_stats(self) -> Dict:
+        """Get read cache hit/miss statistics"""
+        return self._read_cache.stats()
+    
     async def batch_update_articles(self, updates: List[Dict]) -> List[Dict]:
-        """Batch update multiple articles"""
-        results = []
+        """Batch update multiple articles with as few requests as possible
+        
+        Updates carrying every column required for an insert are grouped by
+        column set and sent as chunked upserts keyed on id, limited to ids
+        that exist (an update never inserts). Partial updates sharing the
+        same values become a single filtered update. Heterogeneous partial
+        updates still cost one request each; they are only run concurrently.
+        """
+        timestamp = datetime.now().isoformat()
+        upsert_groups: Dict[tuple, List[Dict]] = {}
+        shared_updates: Dict[str, tuple] = {}
+        
+        unchanged = []
         
         for update in updates:
             if "id" not in update:
                 logger.warning("Skipping update without ID")
                 continue
+            
+            changes = self._changed_columns(update["id"], _with_derived_columns(update))
+            if not changes.keys() - {"id"}:
+                row = await self._unchanged_row(update["id"])
+                if row is not None:
+                    unchanged.append(row)
+                continue
+            
+            row = {**changes, "id": update["id"], "updated_at": timestamp}
+            if UPSERT_REQUIRED_COLUMNS.issubset(row):
+                upsert_groups.setdefault(tuple(sorted(row)), []).append(row)
+            else:
+                values = {k: v for k, v in row.items() if k != "id"}
+                key = json.dumps(values, sort_keys=True, default=str)
+                shared_updates.setdefault(key, (values, []))[1].append(row["id"])
+        
+        results = []
+        
+        for columns, rows in upsert_groups.items():
+            for i in range(0, len(rows), BATCH_UPSERT_SIZE):
+                chunk = rows[i:i + BATCH_UPSERT_SIZE]
+                previous = await self._revision_snapshots(chunk)
+                written = await self._upsert_chunk(chunk, columns)
+                await self._record_revisions(previous, written)
+                results.extend(written)
+        
+        single_updates = []
+        for values, article_ids in shared_updates.values():
+            if len(article_ids) == 1:
+                single_updates.append((article_ids[0], values))
+                continue
+            try:
+                previous = await self._revision_snapshots([{**values, "id": i} for i in article_ids])
+                result = await self.supabase.table(self.table_name).update(values).in_(
+                    "id", article_ids
+                ).execute()
+                await self._record_revisions(previous, result.data or [])
+                results.extend(result.data or [])
+            except Exception as e:
+                logger.error(f"Error in shared batch update: {e}")
+        
+        # Heterogeneous partial updates: one request each, run concurrently
+        semaphore = asyncio.Semaphore(BATCH_UPDATE_CONCURRENCY)
+        
+        async def run_update(article_id: str, values: Dict) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self.update_article(article_id, values)
+                except Exception as e:
+                    logger.error(f"Error in batch update of article {article_id}: {e}")
+                    return None
+        
+        updated = await asyncio.gather(
+            *(run_update(article_id, values) for article_id, values in single_updates)
+        )
+        results.extend(row for row in updated if row and not row.get("queued"))
+        
+        for row in results:
+            if "slug" in row:
+                self._index_slug(row["slug"], row.get("id"))
+            self._invalidate_article(row)
+            self._remember(row)
+        
+        if results:
+            self._invalidate_statistics()
+            self._replicate(results)
+        logger.info(f"Batch updated {len(results)} articles ({len(unchanged)} unchanged, skipped)")
+        return results + unchanged
+    
+    async def _upsert_chunk(self, rows: List[Dict], columns: tuple) -> List[Dict]:
+        """Upsert rows sharing the same column set in one request
+        
+        Only ids that already exist are sent, so an update of a deleted or
+        purged article is dropped instead of re-inserting a partial row.
+        """
+        try:
+            existing = await self.supabase.table(self.table_name).select("id").in_(
+                "id", [row["id"] for row in rows]
+            ).execute()
+            existing_ids = {str(row["id"]) for row in existing.data or []}
+            missing = [row["id"] for row in rows if str(row["id"]) not in existing_ids]
+            if missing:
+                logger.warning(f"Skipping updates of {len(missing)} articles that no longer exist: {missing}")
+            rows = [row for row in rows if str(row["id"]) in existing_ids]
+            if not rows:
+                return []
+            
+            result = await self.supabase.table(self.table_name).upsert(
+                rows, on_conflict="id", ignore_duplicates=False
+            ).execute()
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Error upserting {len(rows)} articles ({', '.join(columns)}): {e}")
+            return []
+    
+    def _open_replica(self):
+        """Open the local read replica if settings.replica_enabled"""
+        if self._replica is None and self.settings.replica_enabled:
+            from src.replica import ArticleReplica
+            self._replica = ArticleReplica(self.settings.replica_path)
+        return self._replica
+    
+    async def _get_replica(self):
+        """Replica for reads, synced first when older than replica_sync_interval
+        
+        If the primary cannot be reached the last synced data is served;
+        returns None (read from the primary) when there is no usable replica.
+        """
+        try:
+            replica = self._open_replica()
+        except Exception as e:
+            logger.warning(f"Replica unavailable, reading from primary: {e}")
+            return None
+        if replica is None:
+            return None
+        
+        if replica.is_stale(self.settings.replica_sync_interval):
+            try:
+                await replica.sync(self)
+            except Exception as e:
+                logger.warning(f"Replica sync failed, serving last synced data: {e}")
+                if replica.watermark is None:
+                    return None
+        return replica
+    
+    async def sync_replica(self) -> int:
+        """Pull changes into the local replica now; returns rows applied"""
+        try:
+            replica = self._open_replica()
+            return await replica.sync(self) if replica is not None else 0
+        except Exception as e:
+            logger.error(f"Error syncing replica: {e}")
+            return 0
+    
+    def _replicate(self, rows: List[Dict]) -> None:
+        """Mirror rows just written to the primary into an open replica"""
+        if self._replica is None:
+            return
+        try:
+            self._replica.apply(rows)
+        except Exception as e:
+            # The next poll re-reads everything past the watermark
+            logger.warning(f"Error updating replica: {e}")
+    
+    def _replicate_removal(self, article_ids: List[str]) -> None:
+        """Mirror hard deletes into the replica, opening it if enabled"""
+        try:
+            replica = self._open_replica()
+            if replica is None:
+                return
+            replica.remove(article_ids)
+        except Exception as e:
+            logger.warning(f"Error updating replica: {e}")
+    
+    def _get_outbox(self, create: bool = True) -> Optional[WriteOutbox]:
+        """Open the outbox; with create=False only if the file already exists"""
+        if self._outbox is None:
+            path = self.settings.outbox_path
+            if not ERROR_HANDLING["database_errors"]["queue_failed_writes"]:
+                return None
+            if not create and not os.path.exists(path):
+                return None
+            self._outbox = WriteOutbox(path, max_attempts=self.settings.outbox_max_attempts)
+        return self._outbox
+    
+    def _queue_write(self, op: str, article_id: str, payload: Dict) -> bool:
+        """Queue a failed write in the outbox; False when queueing is disabled or fails"""
+        try:
+            outbox = self._get_outbox()
+            if outbox is None:
+                return False
+            outbox.enqueue(op, article_id, payload)
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing {op} for article {article_id}: {e}")
+            return False
+    
+    def _start_outbox_drainer(self) -> None:
+        """Drain the outbox in the background until it is empty"""
+        if self._outbox_drainer is not None and not self._outbox_drainer.done():
+            return
+        try:
+            self._outbox_drainer = asyncio.get_running_loop().create_task(self._run_outbox_drainer())
+        except RuntimeError:
+            logger.debug("No running event loop, outbox will be drained on the next drain_outbox call")
+    
+    async def _run_outbox_drainer(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.outbox_drain_interval)
+            await self.drain_outbox()
+            if not self.get_outbox_stats()["pending"]:
+                return
+    
+    async def drain_outbox(self, batch_size: int = OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+        """Replay queued writes in order
+        
+        Inserts are checked against existing ids in one query, so rows that
+        did reach the database before the failure are not written twice.
+        Updates are coalesced per article and applied after that article's
+        pending insert; an article with an older entry still backing off or
+        dead is skipped. Stops at the first connection failure.
+        """
+        summary = {"replayed": 0, "failed": 0, "remaining": 0}
+        outbox = self._get_outbox(create=False)
+        if outbox is None:
+            return summary
+        
+        entries = outbox.pending(batch_size)
+        while entries:
+            inserts = [entry for entry in entries if entry["op"] == OUTBOX_INSERT]
+            blocked = set()
+            
+            if inserts:
+                try:
+                    result = await self.supabase.table(self.table_name).select("id").in_(
+                        "id", [entry["article_id"] for entry in inserts]
+                    ).execute()
+                except Exception as e:
+                    logger.warning(f"Outbox drain paused, database unavailable: {e}")
+                    outbox.mark_failed([entry["id"] for entry in inserts], str(e))
+                    summary["failed"] += len(inserts)
+                    break
                 
-            article_id = update.pop("id")
-            result = await self.update_article(article_id, update)
-            if result:
-                results.append(result)
+                existing = {str(row["id"]) for row in (result.data or [])}
+                for entry in inserts:
+                    if entry["article_id"] not in existing:
+                        try:
+                            if await self._insert_article(entry["payload"]) is None:
+                                raise RuntimeError("insert returned no data")
+                        except Exception as e:
+                            outbox.mark_failed([entry["id"]], str(e))
+                            summary["failed"] += 1
+                            blocked.add(entry["article_id"])
+                            continue
+                    outbox.mark_done([entry["id"]])
+                    summary["replayed"] += 1
+            
+            # Coalesce updates per article, later values winning
+            merged: Dict[str, Dict] = {}
+            entry_ids: Dict[str, List[int]] = {}
+            for entry in entries:
+                if entry["op"] != OUTBOX_UPDATE or entry["article_id"] in blocked:
+                    continue
+                merged.setdefault(entry["article_id"], {}).update(entry["payload"])
+                entry_ids.setdefault(entry["article_id"], []).append(entry["id"])
+            
+            semaphore = asyncio.Semaphore(BATCH_UPDATE_CONCURRENCY)
+            
+            async def replay(article_id: str) -> None:
+                async with semaphore:
+                    try:
+                        if await self._apply_update(article_id, merged[article_id]) is None:
+                            raise RuntimeError("article not found")
+                    except Exception as e:
+                        outbox.mark_failed(entry_ids[article_id], str(e))
+                        summary["failed"] += len(entry_ids[article_id])
+                        return
+                outbox.mark_done(entry_ids[article_id])
+                summary["replayed"] += len(entry_ids[article_id])
+            
+            await asyncio.gather(*(replay(article_id) for article_id in merged))
+            
+            if len(entries) < batch_size or summary["failed"]:
+                break
+            entries = outbox.pending(batch_size)
         
-        logger.info(f"Batch updated {len(results)} articles")
-        return results
+        summary["remaining"] = outbox.stats()["pending"]
+        if summary["replayed"] or summary["failed"]:
+            logger.info(
+                f"Outbox drained: {summary['replayed']} replayed, "
+                f"{summary['failed']} failed, {summary['remaining']} pending"
+            )
+        return summary
+    
+    def get_outbox_stats(self) -> Dict:
+        """Get pending/dead counts of the write outbox"""
+        outbox = self._get_outbox(create=False)
+        if outbox is None:
+            return {"pending": 0, "dead": 0, "oldest_pending": None}
+        return outbox.stats()
     
-    async def cleanup_old_drafts(self, days: int = 30) -> int:
-        """Clean up old draft articles"""
+    async def cleanup_old_drafts(self, days: int = 30, dry_run: bool = False) -> int:
+        """Clean up old draft articles (dry_run only counts them)"""
+        result = await self.purge_articles("draft", days, "created_at", dry_run=dry_run)
+        return result["matched"] if dry_run else result["deleted"]
+    
+    async def purge_deleted_articles(self, days: int = 30, dry_run: bool = False) -> int:
+        """Hard-delete articles soft-deleted more than days ago (dry_run only counts them)"""
+        result = await self.purge_articles("deleted", days, "updated_at", dry_run=dry_run)
+        return result["matched"] if dry_run else result["deleted"]
+    
+    async def backfill_derived_columns(self, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+        """Fill word_count, plain_text and content_hash on rows missing them
+        
+        Rows whose content_hash already matches their content are skipped.
+        Only the three derived columns are written, by primary key and only
+        while the row's updated_at is the one scanned: updated_at and
+        read_time are left alone, and a row deleted or edited since the
+        scan is skipped instead of rewritten.
+        """
+        updated = 0
+        batch: List[Dict] = []
+        semaphore = asyncio.Semaphore(BATCH_UPDATE_CONCURRENCY)
+        
+        async def store(row: Dict) -> Optional[Dict]:
+            values = derived_columns(row["content"])
+            values.pop("read_time")
+            async with semaphore:
+                try:
+                    return await self._store_derived_columns(row["id"], values, row.get("updated_at"))
+                except Exception as e:
+                    logger.error(f"Error backfilling article {row['id']}: {e}")
+                    return None
+        
+        async def flush() -> int:
+            rows = [row for row in await asyncio.gather(*(store(row) for row in batch)) if row]
+            batch.clear()
+            for row in rows:
+                self._invalidate_article(row)
+                self._remember(row)
+            self._replicate(rows)
+            return len(rows)
+        
         try:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            async for row in self.iter_articles(columns="id, content, content_hash, updated_at"):
+                if row.get("content") and row.get("content_hash") != hash_content(row["content"]):
+                    batch.append(row)
+                if len(batch) >= batch_size:
+                    updated += await flush()
+            if batch:
+                updated += await flush()
             
-            result = self.supabase.table(self.table_name).delete().eq(
-                "status", "draft"
-            ).lt("created_at", cutoff_date).execute()
+        except Exception as e:
+            logger.error(f"Error backfilling derived columns: {e}")
+        
+        logger.info(f"Backfilled derived columns on {updated} articles")
+        return updated
+    
+    async def _store_derived_columns(self, article_id: str, values: Dict, updated_at: Optional[str]) -> Optional[Dict]:
+        """UPDATE the derived columns of one row if it is unchanged since updated_at
+        
+        The updated_at trigger keeps updated_at on updates that only touch
+        derived columns (database_migration_014).
+        """
+        query = self.supabase.table(self.table_name).update(values).eq("id", article_id)
+        query = query.is_("updated_at", "null") if updated_at is None else query.eq("updated_at", updated_at)
+        result = await query.execute()
+        return result.data[0] if result.data else None
+    
+    async def purge_articles(
+        self,
+        status: str,
+        days: int,
+        date_column: str = "created_at",
+        dry_run: bool = False,
+        chunk_size: int = PURGE_CHUNK_SIZE,
+        pause: float = PURGE_CHUNK_PAUSE
+    ) -> Dict[str, Any]:
+        """Hard-delete articles with status whose date_column is older than days, in chunks"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        summary = {"status": status, "cutoff": cutoff, "dry_run": dry_run, "matched": 0, "deleted": 0, "chunks": 0}
+        
+        try:
+            if dry_run:
+                summary["matched"] = await self._count_purgeable(status, date_column, cutoff)
+                logger.info(f"Dry run: {summary['matched']} {status} articles older than {cutoff} would be purged")
+                return summary
             
-            deleted_count = len(result.data) if result.data else 0
-            logger.info(f"Cleaned up {deleted_count} old draft articles")
-            return deleted_count
+            after_id = None
+            while True:
+                rows = await self._purge_candidates(status, date_column, cutoff, after_id, chunk_size)
+                if not rows:
+                    break
+                if summary["chunks"] and pause:
+                    await asyncio.sleep(pause)
+                
+                after_id = rows[-1]["id"]
+                deleted = set(await self._delete_rows([row["id"] for row in rows], status, date_column, cutoff))
+                summary["matched"] += len(rows)
+                summary["deleted"] += len(deleted)
+                summary["chunks"] += 1
+                
+                for row in rows:
+                    if row["id"] not in deleted:
+                        continue
+                    self._invalidate_article(row)
+                    self._known_rows.pop(row["id"])
+                    if self._slug_index is not None:
+                        self._slug_index.pop(row["slug"], None)
+                self._replicate_removal(sorted(deleted))
+                if len(rows) < chunk_size:
+                    break
             
         except Exception as e:
-            logger.error(f"Error cleaning up drafts: {e}")
-            return 0
+            logger.error(f"Error purging {status} articles: {e}")
+        
+        if summary["deleted"]:
+            self._invalidate_statistics()
+        logger.info(f"Purged {summary['deleted']} {status} articles in {summary['chunks']} chunks")
+        return summary
+    
+    @staticmethod
+    def _purgeable(query, status: str, date_column: str, cutoff: str):
+        """Filter a query to the rows a purge may delete (never scheduled drafts)"""
+        query = query.eq("status", status).lt(date_column, cutoff)
+        if status == "draft":
+            query = query.is_("scheduled_at", "null")
+        return query
+    
+    async def _count_purgeable(self, status: str, date_column: str, cutoff: str) -> int:
+        """Count rows a purge would delete"""
+        query = self.supabase.table(self.table_name).select("id", count=CountMethod.exact)
+        result = await self._purgeable(query, status, date_column, cutoff).limit(1).execute()
+        return result.count or 0
+    
+    async def _purge_candidates(
+        self, status: str, date_column: str, cutoff: str, after_id: Optional[str], limit: int
+    ) -> List[Dict]:
+        """Next chunk of rows to purge, in primary key order"""
+        query = self._purgeable(
+            self.supabase.table(self.table_name).select(PURGE_COLUMNS), status, date_column, cutoff
+        )
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        result = await query.order("id").limit(limit).execute()
+        return result.data or []
+    
+    async def _delete_rows(self, article_ids: List[str], status: str, date_column: str, cutoff: str) -> List[str]:
+        """Delete rows by primary key that still match the purge filters; returns the deleted ids
+        
+        Only a count comes back; the rare chunk where some rows no longer
+        matched costs one extra id lookup to tell which were kept.
+        """
+        query = self.supabase.table(self.table_name).delete(
+            count=CountMethod.exact, returning=ReturnMethod.minimal
+        ).in_("id", article_ids)
+        result = await self._purgeable(query, status, date_column, cutoff).execute()
+        if result.count == len(article_ids):
+            return list(article_ids)
+        
+        kept = await self.supabase.table(self.table_name).select("id").in_("id", article_ids).execute()
+        kept_ids = {str(row["id"]) for row in kept.data or []}
+        return [article_id for article_id in article_ids if str(article_id) not in kept_ids]
     
-    async def backup_articles(self, filename: str = None) -> str:
-        """Create backup of all articles"""
+    async def backup_articles(
+        self,
+        filename: str = None,
+        compression: str = None,
+        incremental: bool = False
+    ) -> str:
+        """Create a streaming, compressed NDJSON backup of all articles
+        
+        Articles are paged through with iter_articles and written line by
+        line, so memory stays bounded by one page regardless of corpus size.
+        The last line holds a manifest with row count and checksum.
+        
+        With incremental=True only rows whose updated_at is past the stored
+        watermark are exported and appended to the current backup chain; a
+        full backup is taken instead when there is no base yet or the chain
+        has reached settings.backup_max_incrementals.
+        """
+        compression = compression or self.settings.backup_compression
+        backup_dir = self.settings.backup_dir
         try:
+            state = load_backup_state(backup_dir)
+            if incremental and (
+                not state.get("base") or not state.get("watermark")
+                or len(state.get("incrementals", [])) >= self.settings.backup_max_incrementals
+            ):
+                logger.info("No usable backup chain, taking a full backup")
+                incremental = False
+            
             if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"blog_backup_{timestamp}.json"
+                prefix = "blog_backup_incr" if incremental else "blog_backup"
+                filename = os.path.join(
+                    backup_dir, create_backup_filename(prefix, backup_extension(compression))
+                )
             
-            # Get all articles
-            all_articles = await self.list_articles(status=None, limit=10000)
+            since = None
+            if incremental:
+                # Re-read a short overlap so rows committed late are not missed
+                since = (
+                    datetime.fromisoformat(state["watermark"])
+                    - timedelta(seconds=INCREMENTAL_BACKUP_OVERLAP)
+                ).isoformat()
+                articles = self.iter_articles(
+                    page_size=BACKUP_PAGE_SIZE, order_by="updated_at", start_after=since
+                )
+            else:
+                articles = self.iter_articles(page_size=BACKUP_PAGE_SIZE)
             
-            # Save to file
-            backup_data = {
-                "created_at": datetime.now().isoformat(),
-                "total_articles": len(all_articles),
-                "articles": all_articles
-            }
+            watermark = state.get("watermark") if incremental else None
+            with BackupWriter(filename, compression) as writer:
+                async for article in articles:
+                    writer.write(article)
+                    updated_at = article.get("updated_at")
+                    if updated_at and (watermark is None or updated_at > watermark):
+                        watermark = updated_at
+                manifest = writer.close(
+                    table=self.table_name,
+                    type="incremental" if incremental else "full",
+                    since=since,
+                    watermark=watermark
+                )
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            if incremental:
+                state["incrementals"].append(filename)
+            else:
+                state = {"base": filename, "incrementals": []}
+            state["watermark"] = watermark
+            save_backup_state(backup_dir, state)
             
-            logger.info(f"Backup created: {filename} ({len(all_articles)} articles)")
+            logger.info(
+                f"{manifest['type'].capitalize()} backup created: {filename} "
+                f"({manifest['row_count']} articles, {format_file_size(get_file_size(filename))})"
+            )
             return filename
             
         except Exception as e:
             logger.error(f"Error creating backup: {e}")
             return ""
     
+    async def export_articles(
+        self, filename: str = None, fmt: str = "parquet", batch_size: int = EXPORT_BATCH_SIZE
+    ) -> str:
+        """Export all articles with their numeric SEO features to a columnar file
+        
+        Parquet (zstd-compressed) or Arrow IPC, for analysis with pandas,
+        polars or DuckDB. Articles are paged through with iter_articles and
+        written in record batches of batch_size rows, so memory stays
+        bounded by one batch.
+        """
+        try:
+            if not filename:
+                filename = os.path.join(
+                    self.settings.export_dir, create_backup_filename("blog_articles", EXPORT_EXTENSIONS[fmt])
+                )
+            
+            with ColumnarWriter(filename, fmt, batch_size) as writer:
+                async for article in self.iter_articles(columns=EXPORT_COLUMNS):
+                    writer.write(article)
+                row_count = writer.close()
+            
+            logger.info(f"Exported {row_count} articles to {filename} ({format_file_size(get_file_size(filename))})")
+            return filename
+            
+        except Exception as e:
+            logger.error(f"Error exporting articles: {e}")
+            return ""
+    
+    async def restore_articles(
+        self,
+        paths: Optional[List[str]] = None,
+        concurrency: int = None,
+        chunk_size: int = None
+    ) -> Dict:
+        """Bulk-restore articles from backup files, replayed in order
+        
+        Accepts NDJSON and plain JSON backups, compressed or not, parsed
+        incrementally. Without paths the current chain (full base plus
+        incrementals) is restored. NDJSON files are verified against their
+        manifest before any rows are written. Rows are normalized to the
+        _prepare_article_for_db shape and upserted on id in chunks, with up
+        to `concurrency` chunks in flight; files are applied one after the
+        other so later incrementals win.
+        """
+        concurrency = concurrency or self.settings.restore_concurrency
+        chunk_size = chunk_size or self.settings.restore_chunk_size
+        
+        if paths is None:
+            paths = backup_chain(load_backup_state(self.settings.backup_dir))
+            if not paths:
+                logger.error("No backup chain found to restore")
+                return {"files": 0, "restored": 0, "invalid": 0, "failed": 0}
+        
+        summary = {"files": len(paths), "restored": 0, "invalid": 0, "failed": 0}
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def apply(chunk: List[Dict]) -> None:
+            try:
+                restored, failed = await self._restore_chunk(chunk)
+                summary["restored"] += restored
+                summary["failed"] += failed
+            finally:
+                semaphore.release()
+        
+        for path in paths:
+            if is_ndjson_backup(path):
+                verify_backup(path)
+            
+            pending = []
+            chunk = []
+            for article in iter_backup_articles(path):
+                row = self._normalize_restored_row(article)
+                if row is None:
+                    summary["invalid"] += 1
+                    continue
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    await semaphore.acquire()
+                    pending.append(asyncio.create_task(apply(chunk)))
+                    await asyncio.sleep(0)  # let the request start while we keep parsing
+                    chunk = []
+            if chunk:
+                await semaphore.acquire()
+                pending.append(asyncio.create_task(apply(chunk)))
+            
+            await asyncio.gather(*pending)
+            logger.info(f"Restored {path} ({summary['restored']} articles so far)")
+        
+        elapsed = time.monotonic() - started
+        summary["seconds"] = round(elapsed, 2)
+        summary["rows_per_second"] = round(summary["restored"] / elapsed, 1) if elapsed else 0.0
+        
+        self._slug_index = None
+        self._invalidate_statistics()
+        self._read_cache.clear()
+        self._known_rows.clear()
+        # Restored rows keep their old updated_at, so the replica needs a full copy
+        replica = self._open_replica()
+        if replica is not None:
+            replica.reset()
+        logger.info(
+            f"Restore complete: {summary['restored']} articles from {len(paths)} file(s) "
+            f"in {summary['seconds']}s ({summary['rows_per_second']} rows/s), "
+            f"{summary['invalid']} invalid, {summary['failed']} failed"
+        )
+        return summary
+    
+    async def _restore_chunk(self, rows: List[Dict]) -> tuple:
+        """Upsert restored rows, bisecting a failed chunk to isolate bad rows
+        
+        Returns (restored, failed) counts.
+        """
+        try:
+            await self.supabase.table(self.table_name).upsert(
+                rows, on_conflict="id", returning=ReturnMethod.minimal
+            ).execute()
+            return len(rows), 0
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Error restoring article {rows[0].get('id')}: {e}")
+                return 0, 1
+            
+            middle = len(rows) // 2
+            left = await self._restore_chunk(rows[:middle])
+            right = await self._restore_chunk(rows[middle:])
+            return left[0] + right[0], left[1] + right[1]
+    
+    def _normalize_restored_row(self, article: Dict) -> Optional[Dict]:
+        """Shape a backed-up row like _prepare_article_for_db, keeping its id and history"""
+        if not article.get("id"):
+            return None
+        
+        try:
+            row = self._prepare_article_for_db(article)
+        except KeyError:
+            return None
+        if not (row["title"] and row["slug"] and row["content"]):
+            return None
+        
+        row.update({column: article[column] for column in RESTORE_PRESERVED_COLUMNS if column in article})
+        row["id"] = article["id"]
+        return row
+    
     def _prepare_article_for_db(self, article_data: Dict) -> Dict:
         """Prepare article data for database insertion"""
         current_time = datetime.now().isoformat()
@@ -349,7 +1890,6 @@ class DatabaseManager:
             "updated_at": current_time,
             "status": "published",
             "author": article_data.get("author", "Jachtexamen Expert"),
-            "read_time": article_data.get("read_time", 5),
             "geo_targeting": ["Nederland", "België"],
             "language": "nl-NL"
         }
@@ -360,23 +1900,82 @@ class DatabaseManager:
             if field in article_data:
                 db_article[field] = article_data[field]
         
+        # Word count, plain text, hash and reading time, so readers never reparse the HTML
+        db_article.update(derived_columns(db_article["content"]))
+        if article_data.get("read_time"):
+            db_article["read_time"] = article_data["read_time"]
+        
+        # Keep the JSON-LD word count in line with the content actually stored
+        markup = db_article["schema_markup"]
+        if isinstance(markup, dict) and isinstance(markup.get("article"), dict):
+            db_article["schema_markup"] = {
+                **markup, "article": {**markup["article"], "wordCount": db_article["word_count"]}
+            }
+        
+        # Unique per topic + content, so a repeated insert resolves to the first row
+        db_article["idempotency_key"] = article_data.get("idempotency_key") or article_idempotency_key(article_data)
+        
+        # Scheduled articles wait as drafts until publish_due_articles releases them
+        if article_data.get("scheduled_at"):
+            db_article["scheduled_at"] = _local_timestamp(article_data["scheduled_at"])
+            db_article["status"] = "draft"
+            db_article["published_at"] = None
+        
         return db_article
     
     async def _check_duplicate(self, slug: str) -> bool:
         """Check if article with slug already exists"""
         try:
-            result = self.supabase.table(self.table_name).select("id").eq("slug", slug).execute()
-            return len(result.data) > 0 if result.data else False
+            return slug in await self._get_slug_index()
         except Exception as e:
             logger.error(f"Error checking duplicate: {e}")
             return False
     
-    async def get_publishing_queue(self, limit: int = 10) -> List[Dict]:
-        """Get articles ready for publishing"""
+    async def _get_slug_index(self) -> Dict[str, Optional[str]]:
+        """Get the slug -> id index, loading it with a light select on first use"""
+        if self._slug_index is None:
+            slug_index = {}
+            async for row in self.iter_articles(columns="id, slug", page_size=SLUG_INDEX_PAGE_SIZE):
+                slug_index[row["slug"]] = row["id"]
+            
+            self._slug_index = slug_index
+            logger.debug(f"Loaded slug index with {len(slug_index)} slugs")
+        
+        return self._slug_index
+    
+    async def get_article_slugs(self, refresh: bool = False) -> Set[str]:
+        """Slugs of all articles from the slug index, reloaded first if refresh (raises on failure)"""
+        if refresh:
+            self._slug_index = None
+        return {slug for slug, article_id in (await self._get_slug_index()).items() if article_id}
+    
+    def _index_slug(self, slug: str, article_id: Optional[str]) -> None:
+        """Record a slug write, dropping any previous slug of the same article"""
+        if self._slug_index is None:
+            return
+        
+        if article_id is not None:
+            stale = [s for s, i in self._slug_index.items() if i == article_id and s != slug]
+            for stale_slug in stale:
+                del self._slug_index[stale_slug]
+        self._slug_index[slug] = article_id
+    
+    @staticmethod
+    def _slug_candidates(slug: str, max_attempts: int = 10):
+        """Yield slug candidates: the original, date and minute suffixes, then counters"""
+        now = datetime.now()
+        yield slug
+        yield f"{slug}-{now.strftime('%Y%m%d')}"
+        yield f"{slug}-{now.strftime('%Y%m%d-%H%M')}"
+        for counter in range(2, max_attempts + 2):
+            yield f"{slug}-{now.strftime('%Y%m%d-%H%M')}-{counter}"
+    
+    async def get_publishing_queue(self, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Get scheduled drafts, next to be published first (idx_blog_scheduled_drafts)"""
         try:
-            result = self.supabase.table(self.table_name).select("*").eq(
+            result = await self.supabase.table(self.table_name).select(_columns(projection)).eq(
                 "status", "draft"
-            ).order("created_at", desc=False).limit(limit).execute()
+            ).not_.is_("scheduled_at", "null").order("scheduled_at").limit(limit).execute()
             
             return result.data if result.data else []
             
@@ -384,6 +1983,39 @@ class DatabaseManager:
             logger.error(f"Error getting publishing queue: {e}")
             return []
     
+    async def schedule_article(self, article_id: str, publish_time: datetime) -> Optional[Dict]:
+        """Hold an article as a draft until publish_time"""
+        return await self.update_article(article_id, {
+            "status": "draft",
+            "scheduled_at": _local_timestamp(publish_time)
+        })
+    
+    async def publish_due_articles(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Publish every draft whose scheduled_at has passed, with one bulk update"""
+        try:
+            timestamp = _local_timestamp(now or datetime.now())
+            
+            result = await self.supabase.table(self.table_name).update({
+                "status": "published",
+                "published_at": timestamp,
+                "updated_at": timestamp
+            }).eq("status", "draft").lte("scheduled_at", timestamp).execute()
+            
+            published = result.data or []
+            if published:
+                self._invalidate_statistics()
+                for row in published:
+                    self._invalidate_article(row)
+                    self._remember(row)
+                self._replicate(published)
+                await self.refresh_related_articles(published)
+                logger.info(f"Published {len(published)} scheduled articles")
+            return published
+            
+        except Exception as e:
+            logger.error(f"Error publishing scheduled articles: {e}")
+            return []
+    
     async def publish_article(self, article_id: str) -> bool:
         """Publish a draft article"""
         try:
@@ -392,6 +2024,8 @@ class DatabaseManager:
                 "published_at": datetime.now().isoformat()
             })
             
+            if result is not None and not result.get("queued"):
+                await self.refresh_related_articles([result])
             return result is not None
             
         except Exception as e:
@@ -399,13 +2033,29 @@ class DatabaseManager:
             return False
 
 
+def create_database_manager(settings: Optional[Settings] = None):
+    """Create the DatabaseManager for the configured storage backend"""
+    backend = (settings or Settings()).database_backend
+    
+    if backend == "sqlite":
+        from src.database_sqlite import SQLiteDatabaseManager
+        return SQLiteDatabaseManager()
+    if backend == "mock":
+        from src.database_mock import DatabaseManager as MockDatabaseManager
+        return MockDatabaseManager()
+    if backend != "supabase":
+        raise ValueError(f"Unknown database backend '{backend}', expected supabase, sqlite or mock")
+    
+    return DatabaseManager()
+
+
 # Utility functions for database operations
 async def init_database_schema(db_manager: DatabaseManager) -> bool:
     """Initialize database schema (run once for setup)"""
     try:
         # This would typically be done via Supabase dashboard or migration files
         # Here we just verify the table exists
-        result = db_manager.supabase.table(db_manager.table_name).select("id").limit(1).execute()
+        result = await db_manager.supabase.table(db_manager.table_name).select("id").limit(1).execute()
         logger.info("Database schema verified")
         return True
     except Exception as e:
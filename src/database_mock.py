@@ -2,11 +2,18 @@
 Mock Database Manager for testing without Supabase
 """
 
-import json
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set
 from loguru import logger
 
+from src.backup import BackupWriter, backup_extension, is_ndjson_backup, iter_backup_articles, verify_backup
+from src.database import _local_timestamp, article_idempotency_key, derived_columns
+from src.export import EXPORT_BATCH_SIZE, EXPORT_EXTENSIONS, ColumnarWriter
+from src.related import RelatedArticlesIndex
+from src.search import BM25Index, highlight
+from src.seo import generate_sitemap_entry
+from src.utils import create_backup_filename
+
 
 class DatabaseManager:
     """Mock database manager for testing without Supabase"""
@@ -20,10 +27,22 @@ class DatabaseManager:
     async def create_article(self, article_data: Dict) -> Optional[Dict]:
         """Create a new blog article in mock storage"""
         try:
+            key = article_data.get("idempotency_key") or article_idempotency_key(article_data)
+            for article in self.articles:
+                if article.get("idempotency_key") == key:
+                    logger.info(f"Mock: Article already stored: {article['title']}")
+                    return article
+            
             # Add mock ID and save to memory
+            article_data["idempotency_key"] = key
+            article_data.update({**derived_columns(article_data["content"]), **article_data})
             article_data["id"] = f"mock_{self.mock_id_counter}"
             article_data["created_at"] = datetime.now().isoformat()
             article_data["published_at"] = datetime.now().isoformat()
+            if article_data.get("scheduled_at"):
+                article_data["scheduled_at"] = _local_timestamp(article_data["scheduled_at"])
+                article_data["status"] = "draft"
+                article_data["published_at"] = None
             
             self.articles.append(article_data)
             self.mock_id_counter += 1
@@ -35,7 +54,7 @@ class DatabaseManager:
             logger.error(f"Mock: Error creating article: {e}")
             return None
     
-    async def get_article(self, article_id: str = None, slug: str = None) -> Optional[Dict]:
+    async def get_article(self, article_id: str = None, slug: str = None, projection: str = "full") -> Optional[Dict]:
         """Get article by ID or slug from mock storage"""
         try:
             for article in self.articles:
@@ -48,15 +67,25 @@ class DatabaseManager:
             logger.error(f"Mock: Error getting article: {e}")
             return None
     
-    async def get_statistics(self) -> Dict:
-        """Get mock statistics"""
+    async def get_statistics(self, use_cache: bool = True) -> Dict:
+        """Get mock statistics, aggregated the same way as the statistics RPC"""
         try:
+            week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+            published = [a for a in self.articles if a.get("status", "published") == "published"]
+            
+            category_counts = {}
+            for article in published:
+                category = article.get("category") or "unknown"
+                category_counts[category] = category_counts.get(category, 0) + 1
+            
             return {
                 "total_articles": len(self.articles),
-                "published_articles": len(self.articles),
-                "draft_articles": 0,
-                "category_distribution": {},
-                "recent_articles_7_days": len(self.articles),
+                "published_articles": len(published),
+                "draft_articles": len(self.articles) - len(published),
+                "category_distribution": category_counts,
+                "recent_articles_7_days": sum(
+                    1 for a in self.articles if a.get("created_at", "") >= week_ago
+                ),
                 "last_updated": datetime.now().isoformat()
             }
             
@@ -64,21 +93,28 @@ class DatabaseManager:
             logger.error(f"Mock: Error getting statistics: {e}")
             return {}
     
-    async def backup_articles(self, filename: str = None) -> str:
-        """Create mock backup"""
+    async def drain_outbox(self, batch_size: int = 100) -> Dict[str, int]:
+        """Mock outbox drain (mock writes never fail)"""
+        return {"replayed": 0, "failed": 0, "remaining": 0}
+    
+    def get_outbox_stats(self) -> Dict:
+        """Mock outbox statistics"""
+        return {"pending": 0, "dead": 0, "oldest_pending": None}
+    
+    def get_cache_stats(self) -> Dict:
+        """Mock read cache statistics (mock storage is not cached)"""
+        return {"size": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+    
+    async def backup_articles(self, filename: str = None, compression: str = "gzip", incremental: bool = False) -> str:
+        """Create mock backup in the same NDJSON format as the real backend (always full)"""
         try:
             if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"mock_backup_{timestamp}.json"
-            
-            backup_data = {
-                "created_at": datetime.now().isoformat(),
-                "total_articles": len(self.articles),
-                "articles": self.articles
-            }
+                filename = create_backup_filename("mock_backup", backup_extension(compression))
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            with BackupWriter(filename, compression) as writer:
+                for article in self.articles:
+                    writer.write(article)
+                writer.close(table=self.table_name, type="full")
             
             logger.info(f"Mock: Backup created: {filename}")
             return filename
@@ -87,6 +123,42 @@ class DatabaseManager:
             logger.error(f"Mock: Error creating backup: {e}")
             return ""
     
+    async def export_articles(self, filename: str = None, fmt: str = "parquet", batch_size: int = EXPORT_BATCH_SIZE) -> str:
+        """Export mock storage to the same columnar format as the real backend"""
+        try:
+            if not filename:
+                filename = create_backup_filename("mock_articles", EXPORT_EXTENSIONS[fmt])
+            
+            with ColumnarWriter(filename, fmt, batch_size) as writer:
+                for article in self.articles:
+                    writer.write(article)
+                writer.close()
+            
+            logger.info(f"Mock: Export created: {filename}")
+            return filename
+            
+        except Exception as e:
+            logger.error(f"Mock: Error exporting articles: {e}")
+            return ""
+    
+    async def restore_articles(self, paths: Optional[List[str]] = None, concurrency: int = None, chunk_size: int = None) -> Dict:
+        """Restore mock storage from backup files, replacing rows by id"""
+        by_id = {a.get("id"): a for a in self.articles}
+        summary = {"files": len(paths or []), "restored": 0, "invalid": 0, "failed": 0}
+        for path in paths or []:
+            if is_ndjson_backup(path):
+                verify_backup(path)
+            for article in iter_backup_articles(path):
+                if not all(article.get(f) for f in ("id", "title", "slug", "content")):
+                    summary["invalid"] += 1
+                    continue
+                by_id[article["id"]] = article
+                summary["restored"] += 1
+        
+        self.articles = list(by_id.values())
+        logger.info(f"Mock: Restored {summary['restored']} articles")
+        return summary
+    
     # Add other required methods as simple mocks
     async def update_article(self, article_id: str, updates: Dict) -> Optional[Dict]:
         """Mock update article"""
@@ -102,36 +174,148 @@ class DatabaseManager:
         """Mock list articles"""
         return self.articles
     
-    async def search_articles(self, search_term: str, limit: int = 20) -> List[Dict]:
-        """Mock search articles"""
-        return self.articles[:limit]
+    async def iter_articles(self, filters: Optional[Dict] = None, page_size: int = 500, columns: str = "*") -> AsyncIterator[Dict]:
+        """Mock keyset iteration in (published_at, id) order"""
+        rows = [
+            a for a in self.articles
+            if all(a.get(column) == value for column, value in (filters or {}).items())
+        ]
+        rows.sort(key=lambda a: (a.get("published_at") is None, a.get("published_at") or "", a.get("id")))
+        for article in rows:
+            yield article
     
-    async def get_articles_by_category(self, category: str, limit: int = 10) -> List[Dict]:
+    async def search_articles(self, search_term: str, limit: int = 20, projection: str = "summary") -> List[Dict]:
+        """Mock ranked search using a local BM25 index"""
+        published = [a for a in self.articles if a.get("status", "published") == "published"]
+        return [
+            {**article, "rank": round(score, 4), "headline": highlight(article, search_term)}
+            for article, score in BM25Index(published).search(search_term, limit)
+        ]
+    
+    async def get_articles_by_category(self, category: str, limit: int = 10, projection: str = "summary") -> List[Dict]:
         """Mock get articles by category"""
         return [a for a in self.articles if a.get("category") == category][:limit]
     
-    async def get_popular_articles(self, days: int = 30, limit: int = 10) -> List[Dict]:
+    async def get_popular_articles(self, days: int = 30, limit: int = 10, projection: str = "summary") -> List[Dict]:
         """Mock get popular articles"""
         return self.articles[:limit]
     
-    async def get_related_articles(self, article_id: str, limit: int = 5) -> List[Dict]:
-        """Mock get related articles"""
-        return self.articles[:limit]
+    async def record_article_views(self, buckets: List[Dict]) -> int:
+        """Mock view recording"""
+        views = sum(bucket["views"] for bucket in buckets)
+        logger.info(f"Mock: Would record {views} views")
+        return views
+    
+    async def get_article_slugs(self, refresh: bool = False) -> Set[str]:
+        """Mock slug listing"""
+        return {article["slug"] for article in self.articles if article.get("slug")}
+    
+    async def get_trending_articles(self, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Mock trending articles (no traffic data)"""
+        return []
+    
+    async def get_trending_categories(self) -> Dict[str, float]:
+        """Mock trending categories (no traffic data)"""
+        return {}
+    
+    async def get_related_articles(self, article_id: str, limit: int = 5, projection: str = "summary") -> List[Dict]:
+        """Mock get related articles, computed on the fly with the LSH index"""
+        index = RelatedArticlesIndex()
+        for article in self.articles:
+            if article.get("status", "published") == "published":
+                index.add(article)
+        
+        by_id = {str(article["id"]): article for article in self.articles}
+        return [
+            {**by_id[related_id], "related_score": score}
+            for related_id, score in index.top_k(str(article_id), limit)
+        ]
+    
+    async def refresh_related_articles(self, articles: Optional[List[Dict]] = None) -> int:
+        """Mock refresh (related articles are computed on read)"""
+        return 0
+    
+    async def get_internal_link_index(self) -> List[Dict]:
+        """Mock internal link index"""
+        return [a for a in self.articles if a.get("status", "published") == "published"]
+    
+    async def get_sitemap_entries(self) -> List[Dict]:
+        """Mock sitemap entries"""
+        return [generate_sitemap_entry(a) for a in await self.get_internal_link_index()]
+    
+    async def sync_replica(self) -> int:
+        """Mock replica sync (no replica)"""
+        return 0
     
     async def batch_update_articles(self, updates: List[Dict]) -> List[Dict]:
         """Mock batch update"""
         logger.info(f"Mock: Would batch update {len(updates)} articles")
         return updates
     
-    async def cleanup_old_drafts(self, days: int = 30) -> int:
+    async def backfill_derived_columns(self, batch_size: int = 100) -> int:
+        """Mock backfill of word_count, plain_text and content_hash"""
+        updated = 0
+        for article in self.articles:
+            if not article.get("content"):
+                continue
+            derived = derived_columns(article["content"])
+            derived.pop("read_time")
+            if article.get("content_hash") != derived["content_hash"]:
+                article.update(derived)
+                updated += 1
+        logger.info(f"Mock: Backfilled derived columns on {updated} articles")
+        return updated
+    
+    async def cleanup_old_drafts(self, days: int = 30, dry_run: bool = False) -> int:
         """Mock cleanup"""
         logger.info("Mock: Would cleanup old drafts")
         return 0
     
-    async def get_publishing_queue(self, limit: int = 10) -> List[Dict]:
-        """Mock publishing queue"""
+    async def purge_deleted_articles(self, days: int = 30, dry_run: bool = False) -> int:
+        """Mock purge of soft-deleted articles"""
+        logger.info("Mock: Would purge deleted articles")
+        return 0
+    
+    async def purge_articles(self, status: str, days: int, date_column: str = "created_at", dry_run: bool = False,
+                             chunk_size: int = 200, pause: float = 0.5) -> Dict:
+        """Mock purge"""
+        logger.info(f"Mock: Would purge {status} articles older than {days} days")
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        return {"status": status, "cutoff": cutoff, "dry_run": dry_run, "matched": 0, "deleted": 0, "chunks": 0}
+    
+    async def get_article_revisions(self, article_id: str) -> List[Dict]:
+        """Mock revision history (not kept)"""
         return []
     
+    async def get_article_revision(self, article_id: str, revision: int) -> Optional[Dict]:
+        """Mock revision lookup"""
+        return None
+    
+    async def rollback_article(self, article_id: str, revision: int) -> Optional[Dict]:
+        """Mock rollback"""
+        logger.info(f"Mock: Would roll back article {article_id} to revision {revision}")
+        return None
+    
+    async def get_publishing_queue(self, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Mock publishing queue of scheduled drafts"""
+        queue = [a for a in self.articles if a.get("status") == "draft" and a.get("scheduled_at")]
+        return sorted(queue, key=lambda a: a["scheduled_at"])[:limit]
+    
+    async def schedule_article(self, article_id: str, publish_time: datetime) -> Optional[Dict]:
+        """Mock schedule article"""
+        article = await self.get_article(article_id=article_id)
+        if article:
+            article.update({"status": "draft", "scheduled_at": _local_timestamp(publish_time)})
+        return article
+    
+    async def publish_due_articles(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Mock publish scheduled drafts that are due"""
+        timestamp = _local_timestamp(now or datetime.now())
+        due = [a for a in await self.get_publishing_queue(limit=len(self.articles)) if a["scheduled_at"] <= timestamp]
+        for article in due:
+            article.update({"status": "published", "published_at": timestamp, "updated_at": timestamp})
+        return due
+    
     async def publish_article(self, article_id: str) -> bool:
         """Mock publish article"""
         logger.info(f"Mock: Would publish article {article_id}")
@@ -0,0 +1,855 @@
+"""
+SQLite Database Manager for Jachtexamen Blog
+Embedded storage backend with the same interface as the Supabase
+DatabaseManager, for single-node deployments and load tests
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from loguru import logger
+
+from src.cache import TTLCache
+from src.database import (
+    ARTICLE_STATS_TABLE, DatabaseManager, ITER_PAGE_SIZE, PURGE_COLUMNS, RELATED_TABLE, REVISIONS_TABLE, TRENDING_TABLE,
+    _columns, _local_timestamp, _with_derived_columns
+)
+from src.revisions import REVISION_FIELDS, snapshot
+from src.search import FIELD_WEIGHTS, highlight, tokenize
+
+
+# blog_articles columns, in schema order
+ARTICLE_COLUMNS = (
+    "id", "title", "slug", "content", "excerpt", "meta_description", "tags",
+    "cover_image_url", "cover_image_alt", "primary_keyword", "secondary_keywords",
+    "internal_links", "schema_markup", "published_at", "created_at", "updated_at",
+    "status", "author", "read_time", "geo_targeting", "language", "category",
+    "topic_id", "seo_score", "keyword_analysis", "scheduled_at", "idempotency_key",
+    "word_count", "plain_text", "content_hash"
+)
+
+# Types of columns added to older database files (default TEXT)
+ADDED_COLUMN_TYPES = {"word_count": "INTEGER"}
+
+# Array/JSONB columns in Postgres, stored as JSON text
+JSON_COLUMNS = {
+    "tags", "secondary_keywords", "internal_links", "schema_markup",
+    "geo_targeting", "keyword_analysis"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blog_articles (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    content TEXT NOT NULL,
+    excerpt TEXT,
+    meta_description TEXT,
+    tags TEXT,
+    cover_image_url TEXT,
+    cover_image_alt TEXT,
+    primary_keyword TEXT,
+    secondary_keywords TEXT,
+    internal_links TEXT,
+    schema_markup TEXT,
+    published_at TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    status TEXT DEFAULT 'published',
+    author TEXT DEFAULT 'Jachtexamen Expert',
+    read_time INTEGER,
+    geo_targeting TEXT,
+    language TEXT DEFAULT 'nl-NL',
+    category TEXT,
+    topic_id INTEGER,
+    seo_score INTEGER,
+    keyword_analysis TEXT,
+    scheduled_at TEXT,
+    idempotency_key TEXT,
+    word_count INTEGER,
+    plain_text TEXT,
+    content_hash TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_blog_slug ON blog_articles(slug);
+CREATE INDEX IF NOT EXISTS idx_blog_status ON blog_articles(status);
+CREATE INDEX IF NOT EXISTS idx_blog_category ON blog_articles(category);
+CREATE INDEX IF NOT EXISTS idx_blog_published ON blog_articles(published_at, id);
+CREATE INDEX IF NOT EXISTS idx_blog_updated ON blog_articles(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_blog_created ON blog_articles(created_at);
+
+-- Stemmed Dutch terms (src.search.tokenize), kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS blog_articles_fts USING fts5(title, excerpt, content);
+
+CREATE TRIGGER IF NOT EXISTS blog_articles_fts_insert AFTER INSERT ON blog_articles BEGIN
+    INSERT INTO blog_articles_fts(rowid, title, excerpt, content)
+    VALUES (new.rowid, search_terms(new.title), search_terms(new.excerpt), search_terms(new.content));
+END;
+
+CREATE TRIGGER IF NOT EXISTS blog_articles_fts_delete AFTER DELETE ON blog_articles BEGIN
+    DELETE FROM blog_articles_fts WHERE rowid = old.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS blog_articles_fts_update AFTER UPDATE OF title, excerpt, content ON blog_articles BEGIN
+    DELETE FROM blog_articles_fts WHERE rowid = old.rowid;
+    INSERT INTO blog_articles_fts(rowid, title, excerpt, content)
+    VALUES (new.rowid, search_terms(new.title), search_terms(new.excerpt), search_terms(new.content));
+END;
+
+CREATE TABLE IF NOT EXISTS related_articles (
+    article_id TEXT NOT NULL REFERENCES blog_articles(id) ON DELETE CASCADE,
+    related_id TEXT NOT NULL REFERENCES blog_articles(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    score REAL NOT NULL,
+    computed_at TEXT,
+    PRIMARY KEY (article_id, rank)
+);
+CREATE INDEX IF NOT EXISTS idx_related_related_id ON related_articles(related_id);
+
+CREATE TABLE IF NOT EXISTS article_revisions (
+    article_id TEXT NOT NULL REFERENCES blog_articles(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    state_hash TEXT,
+    PRIMARY KEY (article_id, revision)
+);
+
+CREATE TABLE IF NOT EXISTS article_stats (
+    article_id TEXT NOT NULL REFERENCES blog_articles(id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    unique_visitors INTEGER NOT NULL DEFAULT 0,
+    visitors_hll TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (article_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_article_stats_day ON article_stats(day);
+
+CREATE TABLE IF NOT EXISTS trending_scores (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value REAL NOT NULL,
+    reference_epoch REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+"""
+
+
+# Indexes on columns that older database files only get from connect()
+LATE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_blog_scheduled_drafts ON blog_articles(scheduled_at)
+    WHERE status = 'draft' AND scheduled_at IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_blog_idempotency_key ON blog_articles(idempotency_key);
+CREATE INDEX IF NOT EXISTS idx_blog_content_hash ON blog_articles(content_hash);
+"""
+
+
+def _search_terms(text: Optional[str]) -> str:
+    return " ".join(tokenize(text or ""))
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open (and create) an article database with the blog_articles schema"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.create_function("search_terms", 1, _search_terms, deterministic=True)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    
+    # Columns added after a database file was created
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(blog_articles)")}
+    for column in ARTICLE_COLUMNS:
+        if column not in existing:
+            conn.execute(
+                f"ALTER TABLE blog_articles ADD COLUMN {column} {ADDED_COLUMN_TYPES.get(column, 'TEXT')}"
+            )
+    revision_columns = {row["name"] for row in conn.execute("PRAGMA table_info(article_revisions)")}
+    if "state_hash" not in revision_columns:
+        conn.execute("ALTER TABLE article_revisions ADD COLUMN state_hash TEXT")
+    conn.executescript(LATE_INDEXES)
+    return conn
+
+
+def select_list(columns: str, alias: str = "") -> str:
+    """Validate a PostgREST-style column list and turn it into SQL"""
+    prefix = f"{alias}." if alias else ""
+    if columns.strip() == "*":
+        return f"{prefix}*"
+
+    selected = [column.strip() for column in columns.split(",")]
+    unknown = [column for column in selected if column not in ARTICLE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return ", ".join(f"{prefix}{column}" for column in selected)
+
+
+def encode_row(article: Dict) -> Dict:
+    """Article dict -> SQLite parameters (JSON columns serialized)"""
+    unknown = [column for column in article if column not in ARTICLE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+    return {
+        column: json.dumps(value, ensure_ascii=False, default=str)
+        if column in JSON_COLUMNS and value is not None else value
+        for column, value in article.items()
+    }
+
+
+def decode_row(row: sqlite3.Row) -> Dict:
+    """SQLite row -> article dict (JSON columns parsed)"""
+    return {
+        key: json.loads(row[key]) if key in JSON_COLUMNS and row[key] is not None else row[key]
+        for key in row.keys()
+    }
+
+
+def upsert_rows(conn: sqlite3.Connection, rows: List[Dict]) -> None:
+    """Insert or update rows by id, one executemany per column set"""
+    groups: Dict[Tuple[str, ...], List[Dict]] = {}
+    for row in rows:
+        encoded = encode_row(row)
+        groups.setdefault(tuple(sorted(encoded)), []).append(encoded)
+
+    for columns, group in groups.items():
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "id")
+        conn.executemany(
+            f"INSERT INTO blog_articles ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + column for column in columns)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {assignments}",
+            group
+        )
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """Manages all database operations in an embedded SQLite file
+
+    Shares slug handling, related-article computation, backup and restore
+    with the Supabase DatabaseManager; only storage access differs. Writes
+    are local, so there is no outbox and no read cache.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        super().__init__()
+        # Reads are local: no read cache, and updates always diff against the row
+        self._read_cache = TTLCache(maxsize=0, ttl=0)
+        self._known_rows = TTLCache(maxsize=0, ttl=0)
+
+    def _open_storage(self) -> None:
+        self.path = self.path or self.settings.sqlite_path
+        self.conn = connect(self.path)
+        logger.info(f"✅ SQLite database opened: {self.path}")
+
+    @property
+    def supabase(self):
+        raise RuntimeError("SQLite backend has no PostgREST client")
+
+    def _open_replica(self):
+        """Already local: no read replica"""
+        return None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    async def create_article(self, article_data: Dict) -> Optional[Dict]:
+        """Create a new blog article, suffixing the slug on collisions
+
+        Storage is local, so there is no outbox: failures are raised.
+        """
+        db_article = self._prepare_article_for_db(article_data)
+        db_article["id"] = str(article_data.get("id") or uuid.uuid4())
+        original_slug = db_article["slug"]
+
+        for candidate in self._slug_candidates(original_slug):
+            db_article["slug"] = candidate
+            row = encode_row(db_article)
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        f"INSERT INTO blog_articles ({', '.join(row)}) VALUES ({', '.join(':' + column for column in row)})",
+                        row
+                    )
+            except sqlite3.IntegrityError:
+                existing = self.conn.execute(
+                    "SELECT * FROM blog_articles WHERE idempotency_key = ?", (db_article["idempotency_key"],)
+                ).fetchone()
+                if existing:
+                    logger.info(f"Article already stored, returning existing row: {existing['slug']}")
+                    return decode_row(existing)
+                if self.conn.execute("SELECT 1 FROM blog_articles WHERE id = ?", (db_article["id"],)).fetchone():
+                    logger.error(f"Failed to create article - id {db_article['id']} already exists")
+                    return None
+                logger.info(f"Slug already exists, trying: {candidate}")
+                continue
+
+            created = await self.get_article(article_id=db_article["id"])
+            self._index_slug(created["slug"], created["id"])
+            self._invalidate_statistics()
+            logger.info(f"Successfully created article: {db_article['title']}")
+            if created.get("status") == "published":
+                await self.refresh_related_articles([created])
+            return created
+
+        logger.error(f"Could not find a unique slug for: {original_slug}")
+        return None
+
+    async def get_article(self, article_id: str = None, slug: str = None, projection: str = "full") -> Optional[Dict]:
+        """Get article by ID or slug"""
+        try:
+            if article_id:
+                column, value = "id", article_id
+            elif slug:
+                column, value = "slug", slug
+            else:
+                raise ValueError("Either article_id or slug must be provided")
+
+            row = self.conn.execute(
+                f"SELECT {select_list(_columns(projection))} FROM blog_articles WHERE {column} = ?", (value,)
+            ).fetchone()
+            return decode_row(row) if row else None
+
+        except Exception as e:
+            logger.error(f"Error getting article: {e}")
+            return None
+
+    async def update_article(self, article_id: str, updates: Dict) -> Optional[Dict]:
+        """Update article with new data"""
+        try:
+            updates = {**_with_derived_columns(updates), "updated_at": datetime.now().isoformat()}
+            previous = await self._revision_before(article_id, updates)
+            with self.conn:
+                updated = self._update_row(article_id, updates)
+            if not updated:
+                return None
+
+            row = await self.get_article(article_id=article_id)
+            if previous is not None:
+                await self._record_revision(article_id, previous, row)
+            if "slug" in updates:
+                self._index_slug(row["slug"], article_id)
+            self._invalidate_statistics()
+            logger.info(f"Successfully updated article: {article_id}")
+            return row
+
+        except Exception as e:
+            logger.error(f"Error updating article: {e}")
+            return None
+
+    def _update_row(self, article_id: str, values: Dict) -> bool:
+        """UPDATE one row inside the caller's transaction"""
+        values = encode_row({k: v for k, v in values.items() if k != "id"})
+        if not values:
+            return False
+        cursor = self.conn.execute(
+            f"UPDATE blog_articles SET {', '.join(f'{column} = :{column}' for column in values)} "
+            f"WHERE id = :_id",
+            {**values, "_id": article_id}
+        )
+        return cursor.rowcount > 0
+
+    async def delete_article(self, article_id: str) -> bool:
+        """Delete article (soft delete by updating status)"""
+        row = await self.update_article(article_id, {"status": "deleted"})
+        if row is None:
+            return False
+        if self._related_index is not None:
+            await self.refresh_related_articles([row])
+        return True
+
+    async def list_articles(
+        self,
+        status: str = "published",
+        category: str = None,
+        limit: int = 50,
+        offset: int = 0,
+        order_by: str = "published_at",
+        order_direction: str = "desc",
+        projection: str = "summary"
+    ) -> List[Dict]:
+        """List articles with filtering and pagination"""
+        try:
+            if order_by not in ARTICLE_COLUMNS:
+                raise ValueError(f"Unknown order column: {order_by}")
+
+            where, params = self._where({"status": status, "category": category})
+            direction = "DESC" if order_direction == "desc" else "ASC"
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection))} FROM blog_articles {where} "
+                f"ORDER BY {order_by} {direction} LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+            return [decode_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error listing articles: {e}")
+            return []
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> Tuple[str, list]:
+        """Equality filters -> WHERE clause (None values are skipped)"""
+        filters = {column: value for column, value in filters.items() if value is not None}
+        unknown = [column for column in filters if column not in ARTICLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        if not filters:
+            return "", []
+        return "WHERE " + " AND ".join(f"{column} = ?" for column in filters), list(filters.values())
+
+    async def iter_articles(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        columns: str = "*",
+        order_by: str = "published_at",
+        start_after: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Stream articles in (order_by, id) order using keyset pagination"""
+        if order_by not in ARTICLE_COLUMNS:
+            raise ValueError(f"Unknown order column: {order_by}")
+        if columns != "*":
+            selected = [c.strip() for c in columns.split(",")]
+            columns = ", ".join(selected + [c for c in ("id", order_by) if c not in selected])
+        select = select_list(columns)
+        where, params = self._where(filters or {})
+        where = f"{where} AND" if where else "WHERE"
+
+        cursor = None
+        while True:
+            if cursor:
+                condition = f"({order_by} > ? OR ({order_by} = ? AND id > ?))"
+                page_params = [*params, cursor[0], cursor[0], cursor[1], page_size]
+            elif start_after is not None:
+                condition = f"{order_by} > ?"
+                page_params = [*params, start_after, page_size]
+            else:
+                condition = f"{order_by} IS NOT NULL"
+                page_params = [*params, page_size]
+            rows = self.conn.execute(
+                f"SELECT {select} FROM blog_articles {where} {condition} "
+                f"ORDER BY {order_by}, id LIMIT ?",
+                page_params
+            ).fetchall()
+            for row in rows:
+                yield decode_row(row)
+            if len(rows) < page_size:
+                break
+            cursor = (rows[-1][order_by], rows[-1]["id"])
+
+        if start_after is not None:
+            return
+
+        last_id = ""
+        while True:
+            rows = self.conn.execute(
+                f"SELECT {select} FROM blog_articles {where} {order_by} IS NULL AND id > ? "
+                f"ORDER BY id LIMIT ?",
+                (*params, last_id, page_size)
+            ).fetchall()
+            for row in rows:
+                yield decode_row(row)
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+
+    async def search_articles(self, search_term: str, limit: int = 20, projection: str = "summary") -> List[Dict]:
+        """Ranked Dutch full-text search over title, excerpt and content (FTS5 bm25)
+
+        Query terms are stemmed like the indexed text and all must match.
+        Results carry `rank` (higher is better) and a `headline` snippet.
+        """
+        try:
+            terms = list(dict.fromkeys(tokenize(search_term)))
+            if not terms:
+                return []
+
+            weights = ", ".join(str(weight) for weight in FIELD_WEIGHTS.values())
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection), 'a')}, "
+                f"a.excerpt AS _excerpt, a.content AS _content, "
+                f"-bm25(blog_articles_fts, {weights}) AS _rank "
+                f"FROM blog_articles_fts JOIN blog_articles AS a ON a.rowid = blog_articles_fts.rowid "
+                f"WHERE blog_articles_fts MATCH ? AND a.status = 'published' "
+                f"ORDER BY _rank DESC LIMIT ?",
+                (" ".join(f'"{term}"' for term in terms), limit)
+            ).fetchall()
+
+            results = []
+            for row in rows:
+                article = decode_row(row)
+                text = {"excerpt": article.pop("_excerpt"), "content": article.pop("_content")}
+                article["rank"] = round(article.pop("_rank"), 4)
+                article["headline"] = highlight(text, search_term)
+                results.append(article)
+            return results
+
+        except Exception as e:
+            logger.error(f"Error searching articles: {e}")
+            return []
+
+    async def get_articles_by_category(self, category: str, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Get recent articles from specific category"""
+        return await self.list_articles(category=category, limit=limit, projection=projection)
+
+    async def get_popular_articles(self, days: int = 30, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Get the most viewed published articles, falling back to recent ones"""
+        try:
+            since = (datetime.now() - timedelta(days=days)).date().isoformat()
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection), 'a')}, "
+                f"SUM(s.views) AS views, SUM(s.unique_visitors) AS unique_visitors "
+                f"FROM {ARTICLE_STATS_TABLE} AS s JOIN blog_articles AS a ON a.id = s.article_id "
+                f"WHERE s.day >= ? AND a.status = 'published' "
+                f"GROUP BY a.id ORDER BY views DESC LIMIT ?",
+                (since, limit)
+            ).fetchall()
+            if rows:
+                return [decode_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error getting popular articles: {e}")
+
+        return await self._get_recent_articles(days, limit, projection)
+
+    async def _get_recent_articles(self, days: int, limit: int, projection: str) -> List[Dict]:
+        """Most recently published articles of the last days"""
+        try:
+            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection))} FROM blog_articles "
+                f"WHERE status = 'published' AND published_at >= ? ORDER BY published_at DESC LIMIT ?",
+                (cutoff_date, limit)
+            ).fetchall()
+            return [decode_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error getting recent articles: {e}")
+            return []
+
+    async def _resolve_slugs(self, slugs: List[str]) -> List[Dict]:
+        rows = self.conn.execute(
+            f"SELECT id, slug FROM blog_articles WHERE slug IN ({', '.join('?' * len(slugs))})", slugs
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def _load_article_stats(self, article_ids: List[str], days: List[str]) -> Dict[tuple, Dict]:
+        """Stored article_stats rows keyed by (article_id, day)"""
+        rows = self.conn.execute(
+            f"SELECT article_id, day, views, visitors_hll FROM {ARTICLE_STATS_TABLE} "
+            f"WHERE article_id IN ({', '.join('?' * len(article_ids))}) AND day IN ({', '.join('?' * len(days))})",
+            [*article_ids, *days]
+        ).fetchall()
+        return {(row["article_id"], row["day"]): dict(row) for row in rows}
+
+    async def _store_article_stats(self, rows: List[Dict]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {ARTICLE_STATS_TABLE} (article_id, day, views, unique_visitors, visitors_hll, updated_at) "
+                f"VALUES (:article_id, :day, :views, :unique_visitors, :visitors_hll, :updated_at) "
+                f"ON CONFLICT(article_id, day) DO UPDATE SET views = excluded.views, "
+                f"unique_visitors = excluded.unique_visitors, visitors_hll = excluded.visitors_hll, "
+                f"updated_at = excluded.updated_at",
+                rows
+            )
+
+    async def _get_articles_by_ids(self, article_ids: List[str], columns: str) -> List[Dict]:
+        rows = self.conn.execute(
+            f"SELECT {select_list(columns)} FROM blog_articles "
+            f"WHERE id IN ({', '.join('?' * len(article_ids))})",
+            article_ids
+        ).fetchall()
+        return [decode_row(row) for row in rows]
+
+    async def _load_trending_rows(self) -> List[Dict]:
+        rows = self.conn.execute(f"SELECT scope, key, value, reference_epoch FROM {TRENDING_TABLE}").fetchall()
+        return [dict(row) for row in rows]
+
+    async def _store_trending(self, rows: List[Dict]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {TRENDING_TABLE} (scope, key, value, reference_epoch) "
+                f"VALUES (:scope, :key, :value, :reference_epoch) "
+                f"ON CONFLICT(scope, key) DO UPDATE SET value = excluded.value, "
+                f"reference_epoch = excluded.reference_epoch",
+                rows
+            )
+
+    async def get_related_articles(self, article_id: str, limit: int = 5, projection: str = "summary") -> List[Dict]:
+        """Get precomputed related articles, falling back to the same category"""
+        try:
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection), 'a')}, r.score AS related_score "
+                f"FROM {RELATED_TABLE} AS r JOIN blog_articles AS a ON a.id = r.related_id "
+                f"WHERE r.article_id = ? AND a.status = 'published' ORDER BY r.rank LIMIT ?",
+                (article_id, limit)
+            ).fetchall()
+            if rows:
+                return [decode_row(row) for row in rows]
+
+            source_article = await self.get_article(article_id=article_id, projection="summary")
+            if not source_article:
+                return []
+
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection))} FROM blog_articles "
+                f"WHERE category = ? AND status = 'published' AND id != ? "
+                f"ORDER BY published_at DESC LIMIT ?",
+                (source_article["category"], article_id, limit)
+            ).fetchall()
+            return [decode_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error getting related articles: {e}")
+            return []
+
+    async def get_article_revisions(self, article_id: str) -> List[Dict]:
+        """Revision metadata for an article, oldest first"""
+        rows = self.conn.execute(
+            f"SELECT revision, kind, size, created_at FROM {REVISIONS_TABLE} WHERE article_id = ? ORDER BY revision",
+            (article_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def _revision_snapshots(self, rows: List[Dict]) -> Dict[str, Dict]:
+        """Versioned fields before a bulk write, keyed by id, for rows that change them"""
+        article_ids = [row["id"] for row in rows if any(field in row for field in REVISION_FIELDS)]
+        if not article_ids:
+            return {}
+        found = self.conn.execute(
+            f"SELECT id, {select_list(', '.join(REVISION_FIELDS))} FROM blog_articles "
+            f"WHERE id IN ({', '.join('?' * len(article_ids))})",
+            article_ids
+        ).fetchall()
+        return {str(row["id"]): snapshot(decode_row(row)) for row in found}
+
+    async def _revision_snapshot(self, article_id: str) -> Optional[Dict]:
+        """Current versioned fields of an article"""
+        row = self.conn.execute(
+            f"SELECT {select_list(', '.join(REVISION_FIELDS))} FROM blog_articles WHERE id = ?", (article_id,)
+        ).fetchone()
+        return snapshot(decode_row(row)) if row else None
+
+    async def _latest_revision(self, article_id: str) -> Optional[Dict]:
+        """Number and state_hash of the last revision, None without history"""
+        row = self.conn.execute(
+            f"SELECT revision, state_hash FROM {REVISIONS_TABLE} WHERE article_id = ? "
+            f"ORDER BY revision DESC LIMIT 1",
+            (article_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    async def _insert_revisions(self, rows: List[Dict]) -> bool:
+        """Insert revision rows; False when a revision number is already taken"""
+        created_at = datetime.now().isoformat()
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO {REVISIONS_TABLE} (article_id, revision, kind, data, size, created_at, state_hash) "
+                    f"VALUES (:article_id, :revision, :kind, :data, :size, :created_at, :state_hash)",
+                    [{**row, "created_at": created_at} for row in rows]
+                )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    async def _load_revisions(self, article_id: str, first: int, last: int) -> List[Dict]:
+        """Revision rows first..last, in order"""
+        rows = self.conn.execute(
+            f"SELECT revision, kind, data FROM {REVISIONS_TABLE} "
+            f"WHERE article_id = ? AND revision BETWEEN ? AND ? ORDER BY revision",
+            (article_id, first, last)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def _store_related(self, target_ids: List[str], related: Dict[str, List[tuple]]) -> None:
+        """Replace the related_articles rows of the given articles in one transaction"""
+        computed_at = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                f"DELETE FROM {RELATED_TABLE} WHERE article_id = ?", [(article_id,) for article_id in target_ids]
+            )
+            self.conn.executemany(
+                f"INSERT INTO {RELATED_TABLE} (article_id, related_id, rank, score, computed_at) "
+                f"VALUES (?, ?, ?, ?, ?)",
+                [
+                    (article_id, related_id, rank, score, computed_at)
+                    for article_id in target_ids
+                    for rank, (related_id, score) in enumerate(related.get(article_id, []))
+                ]
+            )
+
+    async def get_statistics(self, use_cache: bool = True) -> Dict:
+        """Get comprehensive database statistics with two aggregate queries"""
+        try:
+            week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+            total, published, recent = self.conn.execute(
+                "SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'published'), "
+                "COUNT(*) FILTER (WHERE created_at >= ?) FROM blog_articles",
+                (week_ago,)
+            ).fetchone()
+            categories = self.conn.execute(
+                "SELECT COALESCE(category, 'unknown'), COUNT(*) FROM blog_articles "
+                "WHERE status = 'published' GROUP BY 1"
+            ).fetchall()
+
+            return {
+                "total_articles": total,
+                "published_articles": published,
+                "draft_articles": total - published,
+                "category_distribution": dict(categories),
+                "recent_articles_7_days": recent,
+                "last_updated": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting statistics: {e}")
+            return {}
+
+    async def batch_update_articles(self, updates: List[Dict]) -> List[Dict]:
+        """Batch update multiple articles in a single transaction
+
+        Updates are applied to existing rows only; an update never inserts.
+        """
+        timestamp = datetime.now().isoformat()
+        rows = []
+        for update in updates:
+            if "id" not in update:
+                logger.warning("Skipping update without ID")
+                continue
+            rows.append({**_with_derived_columns(update), "updated_at": timestamp})
+
+        previous = await self._revision_snapshots(rows)
+        try:
+            with self.conn:
+                updated_ids = [row["id"] for row in rows if self._update_row(row["id"], row)]
+        except Exception as e:
+            logger.error(f"Error in batch update: {e}")
+            return []
+
+        results = [row for row in [await self.get_article(article_id=i) for i in updated_ids] if row]
+        await self._record_revisions(previous, results)
+        for row in results:
+            self._index_slug(row["slug"], row["id"])
+        if results:
+            self._invalidate_statistics()
+        logger.info(f"Batch updated {len(results)} articles")
+        return results
+
+    async def _store_derived_columns(self, article_id: str, values: Dict, updated_at: Optional[str]) -> Optional[Dict]:
+        """UPDATE the derived columns of one row if it is unchanged since updated_at"""
+        with self.conn:
+            cursor = self.conn.execute(
+                f"UPDATE blog_articles SET {', '.join(f'{column} = :{column}' for column in values)} "
+                f"WHERE id = :_id AND updated_at IS :_updated_at",
+                {**values, "_id": article_id, "_updated_at": updated_at}
+            )
+        if not cursor.rowcount:
+            return None
+        return decode_row(self.conn.execute("SELECT * FROM blog_articles WHERE id = ?", (article_id,)).fetchone())
+
+    @staticmethod
+    def _purge_where(status: str, date_column: str) -> str:
+        """WHERE clause for rows a purge may delete (never scheduled drafts)"""
+        where = f"status = ? AND {select_list(date_column)} < ?"
+        return where + " AND scheduled_at IS NULL" if status == "draft" else where
+
+    async def _count_purgeable(self, status: str, date_column: str, cutoff: str) -> int:
+        """Count rows a purge would delete"""
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM blog_articles WHERE {self._purge_where(status, date_column)}", (status, cutoff)
+        ).fetchone()[0]
+
+    async def _purge_candidates(
+        self, status: str, date_column: str, cutoff: str, after_id: Optional[str], limit: int
+    ) -> List[Dict]:
+        """Next chunk of rows to purge, in primary key order"""
+        rows = self.conn.execute(
+            f"SELECT {select_list(PURGE_COLUMNS)} FROM blog_articles "
+            f"WHERE {self._purge_where(status, date_column)} AND id > ? ORDER BY id LIMIT ?",
+            (status, cutoff, after_id or "", limit)
+        ).fetchall()
+        return [decode_row(row) for row in rows]
+
+    async def _delete_rows(self, article_ids: List[str], status: str, date_column: str, cutoff: str) -> List[str]:
+        """Delete rows by primary key that still match the purge filters; returns the deleted ids"""
+        with self.conn:
+            rows = self.conn.execute(
+                f"DELETE FROM blog_articles WHERE id IN ({', '.join('?' * len(article_ids))}) "
+                f"AND {self._purge_where(status, date_column)} RETURNING id",
+                [*article_ids, status, cutoff]
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    async def _restore_chunk(self, rows: List[Dict]) -> tuple:
+        """Upsert restored rows in one transaction, bisecting a failed chunk"""
+        try:
+            with self.conn:
+                upsert_rows(self.conn, rows)
+            return len(rows), 0
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Error restoring article {rows[0].get('id')}: {e}")
+                return 0, 1
+
+            middle = len(rows) // 2
+            left = await self._restore_chunk(rows[:middle])
+            right = await self._restore_chunk(rows[middle:])
+            return left[0] + right[0], left[1] + right[1]
+
+    async def get_publishing_queue(self, limit: int = 10, projection: str = "summary") -> List[Dict]:
+        """Get scheduled drafts, next to be published first"""
+        try:
+            rows = self.conn.execute(
+                f"SELECT {select_list(_columns(projection))} FROM blog_articles "
+                f"WHERE status = 'draft' AND scheduled_at IS NOT NULL ORDER BY scheduled_at LIMIT ?",
+                (limit,)
+            ).fetchall()
+            return [decode_row(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Error getting publishing queue: {e}")
+            return []
+
+    async def publish_due_articles(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Publish every draft whose scheduled_at has passed in one transaction"""
+        try:
+            timestamp = _local_timestamp(now or datetime.now())
+            with self.conn:
+                due_ids = [row["id"] for row in self.conn.execute(
+                    "SELECT id FROM blog_articles WHERE status = 'draft' AND scheduled_at <= ?", (timestamp,)
+                )]
+                self.conn.executemany(
+                    "UPDATE blog_articles SET status = 'published', published_at = ?, updated_at = ? WHERE id = ?",
+                    [(timestamp, timestamp, article_id) for article_id in due_ids]
+                )
+
+            published = [await self.get_article(article_id=article_id) for article_id in due_ids]
+            if published:
+                self._invalidate_statistics()
+                await self.refresh_related_articles(published)
+                logger.info(f"Published {len(published)} scheduled articles")
+            return published
+
+        except Exception as e:
+            logger.error(f"Error publishing scheduled articles: {e}")
+            return []
+
+    async def drain_outbox(self, batch_size: int = 100) -> Dict[str, int]:
+        """Local writes are never queued"""
+        return {"replayed": 0, "failed": 0, "remaining": 0}
+
+    def get_outbox_stats(self) -> Dict:
+        """Local writes are never queued"""
+        return {"pending": 0, "dead": 0, "oldest_pending": None}
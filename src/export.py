@@ -0,0 +1,180 @@
+"""
+Columnar export for Jachtexamen Blog System
+Streams articles with their numeric SEO features into Parquet or Arrow IPC
+files in fixed-size record batches, for vectorized offline analysis
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+EXPORT_EXTENSIONS = {
+    "parquet": "parquet",
+    "arrow": "arrow"
+}
+
+# Rows buffered per record batch; bounds memory regardless of corpus size
+EXPORT_BATCH_SIZE = 1000
+
+# blog_articles columns read for an export
+EXPORT_COLUMNS = (
+    "id, title, slug, status, category, topic_id, primary_keyword, secondary_keywords, "
+    "word_count, read_time, seo_score, keyword_analysis, created_at, updated_at, published_at"
+)
+
+# Exported columns and their Arrow types
+EXPORT_FIELDS = (
+    ("id", "string"),
+    ("title", "string"),
+    ("slug", "string"),
+    ("status", "string"),
+    ("category", "string"),
+    ("topic_id", "int64"),
+    ("primary_keyword", "string"),
+    ("secondary_keyword_count", "int32"),
+    ("word_count", "int32"),
+    ("read_time", "int32"),
+    ("seo_score", "int32"),
+    ("primary_keyword_count", "int32"),
+    ("primary_keyword_density", "float64"),
+    ("primary_keyword_in_title", "bool"),
+    ("secondary_keyword_density", "float64"),
+    ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+    ("published_at", "timestamp")
+)
+
+
+def _require_arrow() -> None:
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("Columnar export requires the pyarrow package. Install: pip install pyarrow")
+
+
+def export_schema() -> "pa.Schema":
+    _require_arrow()
+    types = {
+        "string": pa.string(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us")
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_FIELDS])
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Naive local datetime, like the timestamps the application writes"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def article_features(row: Dict) -> Dict[str, Any]:
+    """One export row: identity, category, dates and numeric SEO features"""
+    analysis = row.get("keyword_analysis") or {}
+    primary = analysis.get("primary_keyword") or {}
+    secondary = analysis.get("secondary_keywords") or []
+    return {
+        "id": str(row["id"]),
+        "title": row.get("title"),
+        "slug": row.get("slug"),
+        "status": row.get("status"),
+        "category": row.get("category"),
+        "topic_id": row.get("topic_id"),
+        "primary_keyword": row.get("primary_keyword"),
+        "secondary_keyword_count": len(row.get("secondary_keywords") or []),
+        "word_count": row.get("word_count"),
+        "read_time": row.get("read_time"),
+        "seo_score": row.get("seo_score"),
+        "primary_keyword_count": primary.get("content_count"),
+        "primary_keyword_density": primary.get("density"),
+        "primary_keyword_in_title": primary.get("title_present"),
+        "secondary_keyword_density": (
+            sum(keyword.get("density") or 0 for keyword in secondary) / len(secondary) if secondary else None
+        ),
+        "created_at": _timestamp(row.get("created_at")),
+        "updated_at": _timestamp(row.get("updated_at")),
+        "published_at": _timestamp(row.get("published_at"))
+    }
+
+
+class ColumnarWriter:
+    """Writes article feature rows to a Parquet or Arrow IPC file in record batches
+
+    Like BackupWriter, the file is written under a temporary name and only
+    moved into place on close, so a partial export never looks complete.
+    """
+
+    def __init__(self, path: str, fmt: str = "parquet", batch_size: int = EXPORT_BATCH_SIZE):
+        if fmt not in EXPORT_EXTENSIONS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        _require_arrow()
+
+        self.path = path
+        self.format = fmt
+        self.batch_size = batch_size
+        self.schema = export_schema()
+        self.row_count = 0
+        self.closed = False
+        self._buffer: List[Dict[str, Any]] = []
+        self._tmp_path = f"{path}.tmp"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._tmp_path, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(self._tmp_path, self.schema)
+
+    def write(self, article: Dict) -> None:
+        """Add one article, writing a record batch once batch_size rows are buffered"""
+        self._buffer.append(article_features(article))
+        self.row_count += 1
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        batch = pa.RecordBatch.from_pylist(self._buffer, schema=self.schema)
+        if self.format == "parquet":
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+        self._buffer = []
+
+    def close(self) -> int:
+        """Write the remaining rows and move the file into place"""
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+        self.closed = True
+        return self.row_count
+
+    def abort(self) -> None:
+        """Discard the partially written file"""
+        try:
+            self._writer.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        elif not self.closed:
+            self.close()
@@ -0,0 +1,239 @@
+"""
+Database query metrics for Jachtexamen Blog System
+Latency, row count and payload histograms per PostgREST operation,
+recorded by an httpx transport wrapper around the Supabase connection pool
+"""
+
+import atexit
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from loguru import logger
+
+
+# Histogram upper bounds; values above the last bound land in an overflow bucket
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000)
+BYTE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Query parameters that shape the response rather than filter rows
+NON_FILTER_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+HTTP_OPERATIONS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(self.max, 2),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class QueryMetrics:
+    """Per-operation query statistics, safe to read from another thread"""
+
+    def __init__(self, slow_query_ms: float = 1000):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.started_at = datetime.now().isoformat()
+
+    def record(
+        self,
+        operation: str,
+        filters: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        size: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record one query; logs it when slower than slow_query_ms"""
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            stats = self._stats.get((operation, filters))
+            if stats is None:
+                stats = self._stats[(operation, filters)] = {
+                    "errors": 0,
+                    "latency_ms": Histogram(LATENCY_BUCKETS_MS),
+                    "rows": Histogram(ROW_BUCKETS),
+                    "bytes": Histogram(BYTE_BUCKETS)
+                }
+            stats["latency_ms"].observe(elapsed_ms)
+            if rows is not None:
+                stats["rows"].observe(rows)
+            if size is not None:
+                stats["bytes"].observe(size)
+            if error:
+                stats["errors"] += 1
+
+        if elapsed_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Slow query: {operation} [{filters or 'no filters'}] {elapsed_ms:.0f} ms, "
+                f"{'?' if rows is None else rows} rows, {'?' if size is None else size} bytes"
+                + (f" ({error})" if error else "")
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All recorded operations, slowest (by total time) first"""
+        with self._lock:
+            queries = [
+                {
+                    "operation": operation,
+                    "filters": filters,
+                    "count": stats["latency_ms"].count,
+                    "errors": stats["errors"],
+                    "total_ms": round(stats["latency_ms"].total, 1),
+                    "latency_ms": stats["latency_ms"].snapshot(),
+                    "rows": stats["rows"].snapshot(),
+                    "bytes": stats["bytes"].snapshot()
+                }
+                for (operation, filters), stats in self._stats.items()
+            ]
+
+        queries.sort(key=lambda query: query["total_ms"], reverse=True)
+        return {
+            "since": self.started_at,
+            "slow_query_ms": self.slow_query_ms,
+            "totals": {
+                "queries": sum(query["count"] for query in queries),
+                "errors": sum(query["errors"] for query in queries),
+                "total_ms": round(sum(query["total_ms"] for query in queries), 1),
+                "bytes": sum(int(query["bytes"]["mean"] * query["bytes"]["count"]) for query in queries)
+            },
+            "queries": queries
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = datetime.now().isoformat()
+
+    def dump(self, path: str) -> None:
+        """Write the current snapshot as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        logger.info(f"Database query metrics written to {path}")
+
+
+# Process-wide metrics for the Supabase connection pool
+QUERY_METRICS = QueryMetrics()
+
+_dump_registered = False
+
+
+def dump_metrics_at_exit(path: str) -> None:
+    """Write QUERY_METRICS to path when the process exits (registered once)"""
+    global _dump_registered
+    if path and not _dump_registered:
+        atexit.register(QUERY_METRICS.dump, path)
+        _dump_registered = True
+
+
+def describe_request(request: httpx.Request) -> Tuple[str, str]:
+    """(operation, filter shape) of a PostgREST request, e.g. ("select blog_articles", "status=eq")
+
+    Filter values are dropped so every call of the same query shape shares
+    one entry.
+    """
+    resource = request.url.path.split("/rest/v1/", 1)[-1].strip("/")
+    if resource.startswith("rpc/"):
+        operation = f"rpc {resource[4:]}"
+    else:
+        verb = HTTP_OPERATIONS.get(request.method, request.method.lower())
+        if request.method == "POST" and "merge-duplicates" in request.headers.get("prefer", ""):
+            verb = "upsert"
+        operation = f"{verb} {resource}"
+
+    filters = set()
+    for key, value in request.url.params.multi_items():
+        if key in NON_FILTER_PARAMS:
+            continue
+        if key in ("or", "and"):
+            filters.add(key)
+            continue
+        parts = value.split(".")
+        operator = ".".join(parts[:2]) if parts[0] == "not" else parts[0]
+        filters.add(f"{key}={operator}")
+    return operation, ",".join(sorted(filters))
+
+
+def _row_count(response: httpx.Response) -> Optional[int]:
+    """Rows in a PostgREST response, from its Content-Range header ("0-24/*")"""
+    content_range = response.headers.get("content-range")
+    if not content_range:
+        return None
+    span = content_range.split("/", 1)[0]
+    if span == "*":
+        return 0
+    try:
+        first, last = span.split("-")
+        return int(last) - int(first) + 1
+    except ValueError:
+        return None
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper timing each request until its body has been read"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: QueryMetrics = QUERY_METRICS):
+        self.transport = transport
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        operation, filters = describe_request(request)
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+            body = await response.aread()
+        except Exception as e:
+            self.metrics.record(operation, filters, time.perf_counter() - started, error=type(e).__name__)
+            raise
+
+        self.metrics.record(
+            operation, filters, time.perf_counter() - started,
+            rows=_row_count(response),
+            size=len(body),
+            error=f"HTTP {response.status_code}" if response.status_code >= 400 else None
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,136 @@
+"""
+Write-behind outbox for Jachtexamen Blog System
+Durable local queue (SQLite, fsync on commit) for database writes that
+failed, replayed by DatabaseManager.drain_outbox once Supabase recovers
+"""
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(status, next_attempt_at, id);
+CREATE INDEX IF NOT EXISTS idx_outbox_article ON outbox(article_id, status);
+"""
+
+# Supported operations
+OUTBOX_INSERT = "insert"
+OUTBOX_UPDATE = "update"
+
+# Retry backoff for failed replays: 30s, 60s, 120s ... capped at one hour
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 3600
+
+
+class WriteOutbox:
+    """Append-only queue of pending article writes
+
+    Entries are replayed in id order. An entry that keeps failing is marked
+    dead after max_attempts and left in place for inspection.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 20):
+        self.path = path
+        self.max_attempts = max_attempts
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(OUTBOX_SCHEMA)
+
+    def enqueue(self, op: str, article_id: str, payload: Dict) -> int:
+        """Durably append a write; returns the entry id"""
+        if op not in (OUTBOX_INSERT, OUTBOX_UPDATE):
+            raise ValueError(f"Unknown outbox operation: {op}")
+
+        cursor = self._conn.execute(
+            "INSERT INTO outbox (op, article_id, payload, created_at) VALUES (?, ?, ?, ?)",
+            (op, str(article_id), json.dumps(payload, ensure_ascii=False, default=str), datetime.now().isoformat())
+        )
+        logger.warning(f"Queued failed {op} for article {article_id} in outbox (entry {cursor.lastrowid})")
+        return cursor.lastrowid
+
+    def pending(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Pending entries that are due for replay, oldest first
+
+        An entry is held back while an older entry for the same article is
+        still backing off or dead, so writes are never applied out of order.
+        """
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT id, op, article_id, payload, attempts FROM outbox AS entry "
+            "WHERE status = 'pending' AND next_attempt_at <= ? AND NOT EXISTS ("
+            "SELECT 1 FROM outbox AS earlier WHERE earlier.article_id = entry.article_id "
+            "AND earlier.id < entry.id AND (earlier.status = 'dead' OR earlier.next_attempt_at > ?)"
+            ") ORDER BY id LIMIT ?",
+            (now, now, limit)
+        ).fetchall()
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def has_pending(self, article_id: str) -> bool:
+        """Check whether an article still has queued writes"""
+        row = self._conn.execute(
+            "SELECT 1 FROM outbox WHERE article_id = ? AND status = 'pending' LIMIT 1",
+            (str(article_id),)
+        ).fetchone()
+        return row is not None
+
+    def mark_done(self, entry_ids: List[int]) -> None:
+        """Remove replayed entries"""
+        if entry_ids:
+            self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+
+    def mark_failed(self, entry_ids: List[int], error: str) -> None:
+        """Record a failed replay and schedule the next attempt with backoff"""
+        for entry_id in entry_ids:
+            row = self._conn.execute("SELECT attempts FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                continue
+
+            attempts = row["attempts"] + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"Outbox entry {entry_id} failed {attempts} times, giving up: {error}")
+                status, next_attempt_at = "dead", 0
+            else:
+                status = "pending"
+                next_attempt_at = time.time() + min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                (status, attempts, str(error)[:500], next_attempt_at, entry_id)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts of pending and dead entries"""
+        counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        oldest: Optional[str] = self._conn.execute(
+            "SELECT MIN(created_at) FROM outbox WHERE status = 'pending'"
+        ).fetchone()[0]
+        return {
+            "pending": counts.get("pending", 0),
+            "dead": counts.get("dead", 0),
+            "oldest_pending": oldest
+        }
+
+    def close(self) -> None:
+        self._conn.close()
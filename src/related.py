@@ -0,0 +1,158 @@
+"""
+Related article computation for Jachtexamen Blog System
+MinHash signatures over tags and keywords, bucketed with LSH so candidate
+pairs are found without comparing every article to every other article
+"""
+
+import hashlib
+import random
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.search import stem_dutch, TOKEN_PATTERN, DUTCH_STOP_WORDS
+
+
+# 16 bands x 4 rows: pairs with Jaccard ~0.5 collide with ~60% probability,
+# pairs at ~0.25 with ~6%
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Columns needed to compute related articles (no content)
+FEATURE_COLUMNS = "id, category, tags, primary_keyword, secondary_keywords, published_at"
+
+# Score bonus for candidates in the same category
+SAME_CATEGORY_BONUS = 0.1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def article_features(article: Dict) -> Set[str]:
+    """Normalized feature set: whole tags/keywords plus their stemmed words"""
+    phrases = [
+        *(article.get("tags") or []),
+        *(article.get("secondary_keywords") or []),
+        article.get("primary_keyword") or ""
+    ]
+
+    features = set()
+    for phrase in phrases:
+        phrase = " ".join(str(phrase).lower().split())
+        if not phrase:
+            continue
+        features.add(f"p:{phrase}")
+        for word in TOKEN_PATTERN.findall(phrase):
+            if word not in DUTCH_STOP_WORDS:
+                features.add(f"w:{stem_dutch(word)}")
+    return features
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+class MinHasher:
+    """Computes MinHash signatures with universal hash permutations"""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[str]) -> Tuple[int, ...]:
+        hashes = [_feature_hash(feature) for feature in features]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+
+class RelatedArticlesIndex:
+    """LSH index over published articles for top-K related lookups"""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS):
+        self.bands = bands
+        self.rows = rows
+        self.hasher = MinHasher(bands * rows)
+        self.articles: Dict[str, Dict] = {}
+        self.features: Dict[str, Set[str]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = defaultdict(set)
+        self._bucket_keys: Dict[str, List[Tuple[int, Tuple[int, ...]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def add(self, article: Dict) -> None:
+        """Index (or re-index) one article"""
+        article_id = str(article["id"])
+        self.remove(article_id)
+
+        features = article_features(article)
+        self.articles[article_id] = article
+        self.features[article_id] = features
+        if not features:
+            self._bucket_keys[article_id] = []
+            return
+
+        signature = self.hasher.signature(features)
+        keys = [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+        for key in keys:
+            self.buckets[key].add(article_id)
+        self._bucket_keys[article_id] = keys
+
+    def remove(self, article_id: str) -> None:
+        """Drop an article from the index"""
+        for key in self._bucket_keys.pop(article_id, []):
+            self.buckets[key].discard(article_id)
+            if not self.buckets[key]:
+                del self.buckets[key]
+        self.articles.pop(article_id, None)
+        self.features.pop(article_id, None)
+
+    def candidates(self, article_id: str) -> Set[str]:
+        """Articles sharing at least one LSH bucket"""
+        found = set()
+        for key in self._bucket_keys.get(article_id, []):
+            found |= self.buckets[key]
+        found.discard(article_id)
+        return found
+
+    def score(self, article_id: str, other_id: str) -> float:
+        """Exact Jaccard similarity of feature sets plus a same-category bonus"""
+        a, b = self.features[article_id], self.features[other_id]
+        union = len(a | b)
+        score = len(a & b) / union if union else 0.0
+        if score and self.articles[article_id].get("category") == self.articles[other_id].get("category"):
+            score += SAME_CATEGORY_BONUS
+        return score
+
+    def top_k(self, article_id: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Best k related (id, score) pairs, ties broken by most recent"""
+        scored = [
+            (other_id, self.score(article_id, other_id))
+            for other_id in self.candidates(article_id)
+        ]
+        scored = [(other_id, score) for other_id, score in scored if score > 0]
+        scored.sort(
+            key=lambda pair: (pair[1], self.articles[pair[0]].get("published_at") or ""),
+            reverse=True
+        )
+        return [(other_id, round(score, 4)) for other_id, score in scored[:k]]
+
+    def affected_by(self, article_id: str) -> Set[str]:
+        """Articles whose top-K may change when article_id is added or changed"""
+        return {article_id} | self.candidates(article_id)
+
+    def compute(self, article_ids: Optional[Iterable[str]] = None, k: int = 5) -> Dict[str, List[Tuple[str, float]]]:
+        """Top-K related articles for the given (default: all) articles"""
+        ids = self.articles.keys() if article_ids is None else article_ids
+        return {str(article_id): self.top_k(str(article_id), k) for article_id in ids if str(article_id) in self.articles}
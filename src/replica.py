@@ -0,0 +1,168 @@
+"""
+Local read replica for Jachtexamen Blog System
+SQLite copy of blog_articles kept in sync with the primary by polling
+updated_at > watermark, serving the read-heavy maintenance and SEO paths
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from loguru import logger
+
+from src.database_sqlite import ARTICLE_COLUMNS, SQLiteDatabaseManager, upsert_rows
+
+
+# Seconds re-read before the watermark so rows committed late are not missed
+SYNC_OVERLAP = 300
+
+# Rows per transaction while syncing
+SYNC_CHUNK_SIZE = 500
+
+# Seconds between full id comparisons with the primary, which catch hard
+# deletes made by processes that did not have the replica open
+RECONCILE_INTERVAL = 3600
+
+# Ids per page while reconciling
+RECONCILE_PAGE_SIZE = 1000
+
+REPLICA_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replica_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ArticleReplica(SQLiteDatabaseManager):
+    """Read-only SQLite replica of the primary blog_articles table
+
+    sync() pulls rows changed since the stored watermark and, every
+    RECONCILE_INTERVAL, drops rows deleted on the primary; apply() and
+    remove() mirror writes the primary has just made. Related articles are
+    recomputed locally, on the next related-articles read after a change.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.conn.executescript(REPLICA_STATE_SCHEMA)
+        self.last_sync = 0.0
+        self._related_dirty: Dict[str, Dict] = {}
+        self._related_full_refresh = self.watermark is None
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM replica_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: Optional[str]) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO replica_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Highest updated_at seen on the primary"""
+        return self._get_state("watermark")
+
+    @watermark.setter
+    def watermark(self, value: Optional[str]) -> None:
+        self._set_state("watermark", value)
+
+    def is_stale(self, max_age: float) -> bool:
+        return time.monotonic() - self.last_sync >= max_age
+
+    async def sync(self, primary) -> int:
+        """Pull rows changed on the primary since the watermark; returns rows applied"""
+        watermark = self.watermark
+        self.last_sync = time.monotonic()
+
+        if watermark:
+            start_after = (datetime.fromisoformat(watermark) - timedelta(seconds=SYNC_OVERLAP)).isoformat()
+            rows = primary.iter_articles(order_by="updated_at", start_after=start_after)
+        else:
+            logger.info("Replica is empty, copying all articles from the primary")
+            rows = primary.iter_articles()
+
+        synced = 0
+        chunk: List[Dict] = []
+        async for row in rows:
+            chunk.append(row)
+            updated_at = row.get("updated_at")
+            if updated_at and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+            if len(chunk) >= SYNC_CHUNK_SIZE:
+                synced += self.apply(chunk)
+                chunk = []
+        if chunk:
+            synced += self.apply(chunk)
+
+        self.watermark = watermark
+        if synced:
+            logger.info(f"Replica synced {synced} articles (watermark {watermark})")
+
+        reconciled_at = float(self._get_state("reconciled_at") or 0)
+        if time.time() - reconciled_at >= RECONCILE_INTERVAL:
+            await self.reconcile(primary)
+        return synced
+
+    async def reconcile(self, primary) -> int:
+        """Drop local rows whose id no longer exists on the primary; returns rows dropped"""
+        primary_ids = set()
+        async for row in primary.iter_articles(columns="id", page_size=RECONCILE_PAGE_SIZE):
+            primary_ids.add(str(row["id"]))
+        local_ids = {str(row[0]) for row in self.conn.execute("SELECT id FROM blog_articles")}
+
+        removed = sorted(local_ids - primary_ids)
+        if removed:
+            self.remove(removed)
+            logger.info(f"Replica dropped {len(removed)} articles deleted on the primary")
+        self._set_state("reconciled_at", str(time.time()))
+        return len(removed)
+
+    def apply(self, rows: Iterable[Dict]) -> int:
+        """Upsert rows written to (or read from) the primary"""
+        local_rows = [
+            {column: row[column] for column in ARTICLE_COLUMNS if column in row}
+            for row in rows if row.get("id")
+        ]
+        with self.conn:
+            upsert_rows(self.conn, local_rows)
+
+        for row in local_rows:
+            self._related_dirty[str(row["id"])] = row
+        self._invalidate_statistics()
+        return len(local_rows)
+
+    def remove(self, article_ids: Iterable[str]) -> None:
+        """Drop rows hard-deleted on the primary"""
+        article_ids = [str(article_id) for article_id in article_ids]
+        with self.conn:
+            self.conn.executemany("DELETE FROM blog_articles WHERE id = ?", [(i,) for i in article_ids])
+        for article_id in article_ids:
+            self._related_dirty[article_id] = {"id": article_id, "status": "deleted"}
+        self._invalidate_statistics()
+
+    def reset(self) -> None:
+        """Force a full copy on the next sync (e.g. after a restore on the primary)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM blog_articles")
+            self.conn.execute("DELETE FROM replica_state")
+        self.last_sync = 0.0
+        self._related_index = None
+        self._related_dirty.clear()
+        self._related_full_refresh = True
+
+    async def get_related_articles(self, article_id: str, limit: int = 5, projection: str = "summary") -> List[Dict]:
+        """Read related articles after recomputing rows changed since the last read"""
+        if self._related_full_refresh:
+            self._related_full_refresh = False
+            self._related_dirty.clear()
+            await self.refresh_related_articles()
+        elif self._related_dirty:
+            changed = list(self._related_dirty.values())
+            self._related_dirty.clear()
+            await self.refresh_related_articles(changed)
+
+        return await super().get_related_articles(article_id, limit, projection)
@@ -0,0 +1,136 @@
+"""
+Article revision history for Jachtexamen Blog System
+Revisions are stored as a keyframe (full snapshot) followed by compressed
+line-level deltas, so a chain of small edits costs a fraction of the
+article size per revision
+"""
+
+import base64
+import hashlib
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+
+# Columns versioned in article_revisions (status/timestamps are not history)
+REVISION_FIELDS = (
+    "title", "slug", "content", "excerpt", "meta_description", "category", "tags",
+    "primary_keyword", "secondary_keywords", "internal_links", "schema_markup",
+    "cover_image_url", "cover_image_alt"
+)
+
+# Every KEYFRAME_INTERVAL-th revision is a full snapshot, bounding how many
+# deltas a reconstruction has to apply
+KEYFRAME_INTERVAL = 20
+
+REVISION_BASE = "base"
+REVISION_DELTA = "delta"
+
+# A "line" ends at a newline or a closing angle bracket, so generated HTML
+# without newlines still diffs at tag granularity
+_LINE_PATTERN = re.compile(r"[^\n>]*(?:\n|>)|[^\n>]+")
+
+
+def snapshot(row: Dict) -> Dict[str, Any]:
+    """Versioned fields of an article row"""
+    return {field: row[field] for field in REVISION_FIELDS if field in row}
+
+
+def split_lines(text: str) -> List[str]:
+    return _LINE_PATTERN.findall(text)
+
+
+def diff_text(old: str, new: str) -> List[Any]:
+    """Line delta from old to new: [start, end] copies old lines, a string inserts text"""
+    old_lines, new_lines = split_lines(old), split_lines(new)
+    ops: List[Any] = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def patch_text(old: str, ops: List[Any]) -> str:
+    old_lines = split_lines(old)
+    return "".join(
+        "".join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in ops
+    )
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Field-level delta; changed text fields are stored as line deltas"""
+    delta: Dict[str, Any] = {}
+    for field, value in new.items():
+        previous = old.get(field)
+        if value == previous:
+            continue
+        if isinstance(value, str) and isinstance(previous, str):
+            delta[field] = {"ops": diff_text(previous, value)}
+        else:
+            delta[field] = {"value": value}
+    return delta
+
+
+def apply_delta(old: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    result = dict(old)
+    for field, change in delta.items():
+        result[field] = patch_text(old.get(field) or "", change["ops"]) if "ops" in change else change["value"]
+    return result
+
+
+def encode(data: Any) -> str:
+    """Compact JSON, zlib-compressed and base64-encoded for a text column"""
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.b64encode(zlib.compress(raw, 9)).decode("ascii")
+
+
+def decode(data: str) -> Any:
+    return json.loads(zlib.decompress(base64.b64decode(data)))
+
+
+def state_hash(state: Dict[str, Any]) -> str:
+    """Fingerprint of a snapshot, stored with each revision so the chain can be
+    checked against the row it is extended from"""
+    raw = json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def keyframe_of(revision: int) -> int:
+    """Revision number of the keyframe a revision is reconstructed from"""
+    return (revision - 1) // KEYFRAME_INTERVAL * KEYFRAME_INTERVAL + 1
+
+
+def build_revision(article_id: str, revision: int, previous: Optional[Dict], current: Dict) -> Dict[str, Any]:
+    """article_revisions row for current, as a keyframe or a delta on previous
+
+    Without previous (the state at revision - 1) the row is a keyframe.
+    """
+    if previous is None or keyframe_of(revision) == revision:
+        kind, data = REVISION_BASE, encode(current)
+    else:
+        kind, data = REVISION_DELTA, encode(diff_snapshots(previous, current))
+    return {
+        "article_id": article_id,
+        "revision": revision,
+        "kind": kind,
+        "data": data,
+        "size": len(data),
+        "state_hash": state_hash(current)
+    }
+
+
+def reconstruct(rows: List[Dict]) -> Dict[str, Any]:
+    """Snapshot at the last of rows (a keyframe followed by its deltas, in order)"""
+    if not rows or rows[0]["kind"] != REVISION_BASE:
+        raise ValueError("Revision chain does not start with a keyframe")
+
+    state = decode(rows[0]["data"])
+    for row in rows[1:]:
+        state = decode(row["data"]) if row["kind"] == REVISION_BASE else apply_delta(state, decode(row["data"]))
+    return state
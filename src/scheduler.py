@@ -14,36 +14,36 @@ import pytz
 from src.topics import TopicManager, get_seasonal_category
 from src.generator import ContentGenerator
 from src.seo import SEOOptimizer
-from src.database import DatabaseManager
+from src.database import DatabaseManager, close_postgrest_client, create_database_manager
 from config.settings import PUBLISHING_SCHEDULE, API_CONFIG
 
 
 class BlogScheduler:
     """Manages automated blog publishing schedule"""
     
-    def __init__(self):
+    def __init__(self, database_manager: Optional[DatabaseManager] = None):
         self.topic_manager = TopicManager()
         self.content_generator = ContentGenerator()
         self.seo_optimizer = SEOOptimizer()
-        self.database_manager = DatabaseManager()
+        self.database_manager = database_manager or create_database_manager()
         self.timezone = pytz.timezone('Europe/Amsterdam')
         self.is_running = False
         self.daily_generation_count = 0
         self.last_generation_date = None
+        # One event loop for every scheduled job, so the pooled client is reused
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
     def start_scheduler(self):
         """Start the automated scheduler"""
         logger.info("Starting automated blog scheduler...")
         
-        # Schedule daily content generation
-        for time_slot in PUBLISHING_SCHEDULE["optimal_times"]:
-            schedule.every().day.at(time_slot).do(self._run_daily_generation)
+        self._schedule_publishing(PUBLISHING_SCHEDULE)
         
         # Schedule weekly maintenance tasks
-        schedule.every().monday.at("02:00").do(self._run_weekly_maintenance)
+        schedule.every().monday.at("02:00").do(self._run_async, self._run_weekly_maintenance)
         
         # Schedule monthly cleanup
-        schedule.every().month.do(self._run_monthly_cleanup)
+        schedule.every(4).weeks.do(self._run_async, self._run_monthly_cleanup)
         
         self.is_running = True
         self._run_scheduler_loop()
@@ -53,6 +53,47 @@ class BlogScheduler:
         logger.info("Stopping blog scheduler...")
         self.is_running = False
         schedule.clear()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(close_postgrest_client())
+            self._loop.close()
+    
+    def _schedule_publishing(self, publishing_schedule: Dict):
+        """Generate drafts off-peak and release them at the optimal times"""
+        generation_time = publishing_schedule.get("generation_time", "03:00")
+        schedule.every().day.at(generation_time).do(self._run_async, self._run_daily_generation)
+        
+        # Scheduled drafts are published by one bulk update per minute
+        schedule.every().minute.do(self._run_async, self._run_publisher)
+    
+    def _run_async(self, job):
+        """Run an async job from the synchronous schedule loop
+        
+        Jobs share one event loop for the scheduler's lifetime, so the
+        per-minute publisher keeps its pooled connections instead of
+        rebuilding the pool on every run; stop_scheduler closes both.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(job())
+    
+    def _next_publish_time(self, now: Optional[datetime] = None) -> datetime:
+        """Next optimal publishing slot after now, in the blog's timezone"""
+        now = now or datetime.now(self.timezone)
+        for days in range(2):
+            day = now.date() + timedelta(days=days)
+            for time_slot in sorted(PUBLISHING_SCHEDULE["optimal_times"]):
+                hour, minute = map(int, time_slot.split(":"))
+                slot = self.timezone.localize(datetime(day.year, day.month, day.day, hour, minute))
+                if slot > now:
+                    return slot
+        return now
+    
+    async def _run_publisher(self):
+        """Publish scheduled drafts whose publish time has passed"""
+        try:
+            await self.database_manager.publish_due_articles()
+        except Exception as e:
+            logger.error(f"Error publishing scheduled articles: {e}")
     
     def _run_scheduler_loop(self):
         """Main scheduler loop"""
@@ -91,7 +132,8 @@ class BlogScheduler:
             
             logger.info("Starting daily content generation...")
             
-            # Get next topic based on category rotation
+            # Get next topic based on category rotation, weighted by traffic
+            self.topic_manager.set_category_trends(await self.database_manager.get_trending_categories())
             category = self._get_next_category()
             topic = self.topic_manager.get_next_topic(category)
             
@@ -99,8 +141,8 @@ class BlogScheduler:
                 logger.warning("No available topics found")
                 return
             
-            # Generate article
-            article = await self._generate_and_publish_article(topic)
+            # Generate article as a draft for the next publishing slot
+            article = await self._generate_and_publish_article(topic, scheduled_at=self._next_publish_time())
             
             if article:
                 self.daily_generation_count += 1
@@ -109,8 +151,8 @@ class BlogScheduler:
         except Exception as e:
             logger.error(f"Error in daily generation: {e}")
     
-    async def _generate_and_publish_article(self, topic: Dict) -> Optional[Dict]:
-        """Generate and publish a single article"""
+    async def _generate_and_publish_article(self, topic: Dict, scheduled_at: Optional[datetime] = None) -> Optional[Dict]:
+        """Generate and publish a single article (or schedule it for scheduled_at)"""
         try:
             logger.info(f"Generating article for topic: {topic['title']}")
             
@@ -127,6 +169,8 @@ class BlogScheduler:
             
             # Optimize for SEO
             article = self.seo_optimizer.optimize_article(article)
+            if scheduled_at:
+                article["scheduled_at"] = scheduled_at
             
             # Save to database
             saved_article = await self.database_manager.create_article(article)
@@ -140,7 +184,10 @@ class BlogScheduler:
             # Update published tracking
             self.topic_manager.add_published_article(saved_article)
             
-            logger.info(f"Successfully published article: {article['title']}")
+            if scheduled_at:
+                logger.info(f"Scheduled article for {scheduled_at}: {article['title']}")
+            else:
+                logger.info(f"Successfully published article: {article['title']}")
             return saved_article
             
         except Exception as e:
@@ -183,6 +230,9 @@ class BlogScheduler:
             # Cleanup old data
             await self.database_manager.cleanup_old_drafts(days=30)
             
+            # Full rebuild of precomputed related articles
+            await self.database_manager.refresh_related_articles()
+            
             logger.info("Weekly maintenance completed")
             
         except Exception as e:
@@ -193,8 +243,8 @@ class BlogScheduler:
         try:
             logger.info("Starting monthly cleanup...")
             
-            # Create backup
-            backup_file = await self.database_manager.backup_articles()
+            # Create backup (incremental; rebases onto a full one when the chain is long)
+            backup_file = await self.database_manager.backup_articles(incremental=True)
             logger.info(f"Monthly backup created: {backup_file}")
             
             # Get comprehensive statistics
@@ -274,16 +324,16 @@ class BlogScheduler:
     async def schedule_article(self, topic_id: int, publish_time: datetime) -> bool:
         """Schedule an article for future publishing"""
         try:
-            # This would require extending the database schema to support scheduled publishing
-            # For now, we'll log the request
-            logger.info(f"Article scheduling requested for topic {topic_id} at {publish_time}")
-            
-            # In a full implementation, this would:
-            # 1. Generate the article
-            # 2. Save as draft with scheduled publish time
-            # 3. Use a separate process to check for scheduled articles
+            topic = next(
+                (t for t in self.topic_manager.topics_data["topics"] if t.get("id") == topic_id), None
+            )
+            if not topic:
+                logger.error(f"Topic {topic_id} not found for scheduling")
+                return False
             
-            return True
+            # Saved as a draft; the publisher job releases it at publish_time
+            article = await self._generate_and_publish_article(topic, scheduled_at=publish_time)
+            return article is not None
             
         except Exception as e:
             logger.error(f"Error scheduling article: {e}")
@@ -297,6 +347,7 @@ class BlogScheduler:
             "last_generation_date": str(self.last_generation_date) if self.last_generation_date else None,
             "next_scheduled_jobs": [str(job) for job in schedule.jobs],
             "scheduled_times": PUBLISHING_SCHEDULE["optimal_times"],
+            "generation_time": PUBLISHING_SCHEDULE.get("generation_time"),
             "timezone": str(self.timezone),
             "current_time": datetime.now(self.timezone).isoformat()
         }
@@ -307,13 +358,10 @@ class BlogScheduler:
             # Clear existing schedule
             schedule.clear()
             
-            # Apply new schedule
-            optimal_times = new_schedule.get("optimal_times", ["09:00", "14:00"])
-            for time_slot in optimal_times:
-                schedule.every().day.at(time_slot).do(self._run_daily_generation)
-            
-            # Update configuration
+            # Update configuration and apply new schedule
             PUBLISHING_SCHEDULE.update(new_schedule)
+            optimal_times = PUBLISHING_SCHEDULE["optimal_times"]
+            self._schedule_publishing(PUBLISHING_SCHEDULE)
             
             logger.info(f"Schedule updated: {optimal_times}")
             return True
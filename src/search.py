@@ -0,0 +1,158 @@
+"""
+Local full-text search for Jachtexamen Blog System
+Weighted BM25 ranking with light Dutch stemming, used where the Postgres
+search_blog_articles RPC is not available (mock and embedded backends)
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils import hash_content
+
+
+# Field weights mirror the tsvector weights: title (A) > excerpt (B) > content (C)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "excerpt": 2.0,
+    "content": 1.0
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+DUTCH_STOP_WORDS = {
+    'de', 'het', 'een', 'van', 'in', 'voor', 'met', 'op', 'te', 'is', 'als', 'bij', 'dit', 'dat',
+    'die', 'deze', 'naar', 'aan', 'om', 'door', 'over', 'tot', 'uit', 'ook', 'maar', 'zijn',
+    'en', 'of', 'je', 'jij', 'we', 'wij', 'zij', 'ze', 'hij', 'er', 'niet', 'wat', 'wordt',
+    'worden', 'kan', 'kunnen', 'heeft', 'hebben', 'hoe', 'waar', 'welke', 'haar', 'hem'
+}
+
+# Longest suffix first; stems shorter than MIN_STEM_LENGTH are left alone
+DUTCH_SUFFIXES = ("heden", "heid", "ingen", "ing", "ende", "end", "en", "e", "s")
+MIN_STEM_LENGTH = 3
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Average reading speed used for read_time (matches ContentGenerator)
+WORDS_PER_MINUTE = 250
+
+
+def strip_html(text: str) -> str:
+    """Remove HTML tags and collapse whitespace"""
+    return " ".join(TAG_PATTERN.sub(" ", text or "").split())
+
+
+def derived_columns(content: str) -> Dict[str, Any]:
+    """Columns computed from content once at write time (database_migration_010)"""
+    plain_text = strip_html(content)
+    word_count = len(plain_text.split())
+    return {
+        "plain_text": plain_text,
+        "word_count": word_count,
+        "content_hash": hash_content(content),
+        "read_time": max(1, round(word_count / WORDS_PER_MINUTE))
+    }
+
+
+def stem_dutch(word: str) -> str:
+    """Light Dutch stemmer: strip one common inflectional suffix"""
+    for suffix in DUTCH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            word = word[:-len(suffix)]
+            break
+
+    # Undouble final consonant (jagers -> jager, bossen -> boss -> bos)
+    if len(word) > MIN_STEM_LENGTH and word[-1] == word[-2] and word[-1] not in "aeiou":
+        word = word[:-1]
+    return word
+
+
+def _field_text(article: Dict, field: str) -> str:
+    """Field text, using the stored plain_text column for content when present"""
+    if field == "content" and article.get("plain_text"):
+        return article["plain_text"]
+    return article.get(field) or ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, drop stop words and stem"""
+    return [
+        stem_dutch(token)
+        for token in TOKEN_PATTERN.findall(strip_html(text).lower())
+        if token not in DUTCH_STOP_WORDS
+    ]
+
+
+class BM25Index:
+    """In-memory BM25F-style index over title, excerpt and content"""
+
+    def __init__(self, articles: List[Dict]):
+        self.articles = articles
+        self.doc_terms: List[Dict[str, Counter]] = []
+        self.doc_lengths: List[Dict[str, int]] = []
+        self.doc_freq: Counter = Counter()
+
+        for article in articles:
+            fields = {field: Counter(tokenize(_field_text(article, field))) for field in FIELD_WEIGHTS}
+            self.doc_terms.append(fields)
+            self.doc_lengths.append({field: sum(terms.values()) for field, terms in fields.items()})
+            self.doc_freq.update(set().union(*(terms.keys() for terms in fields.values())))
+
+        count = max(len(articles), 1)
+        self.avg_lengths = {
+            field: (sum(lengths[field] for lengths in self.doc_lengths) / count) or 1.0
+            for field in FIELD_WEIGHTS
+        }
+
+    def _idf(self, term: str) -> float:
+        n = len(self.articles)
+        df = self.doc_freq.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, index: int, query_terms: List[str]) -> float:
+        """BM25 score of one document, with per-field length normalization"""
+        score = 0.0
+        for term in query_terms:
+            weighted_tf = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                tf = self.doc_terms[index][field].get(term, 0)
+                if tf:
+                    norm = 1 - BM25_B + BM25_B * self.doc_lengths[index][field] / self.avg_lengths[field]
+                    weighted_tf += weight * tf / norm
+            if weighted_tf:
+                score += self._idf(term) * weighted_tf * (BM25_K1 + 1) / (weighted_tf + BM25_K1)
+        return score
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Dict, float]]:
+        """Return (article, score) pairs for matching articles, best first"""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        scored = [
+            (article, self.score(i, query_terms))
+            for i, article in enumerate(self.articles)
+        ]
+        scored = [(article, score) for article, score in scored if score > 0]
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored[:limit]
+
+
+def highlight(article: Dict, query: str, max_words: int = 30) -> str:
+    """Snippet around the first query match with matches wrapped in <mark>"""
+    query_terms = set(tokenize(query))
+    words = strip_html(f"{article.get('excerpt') or ''} {_field_text(article, 'content')}").split()
+    if not words:
+        return ""
+
+    def matches(word: str) -> bool:
+        token = TOKEN_PATTERN.findall(word.lower())
+        return bool(token) and stem_dutch(token[0]) in query_terms
+
+    first: Optional[int] = next((i for i, word in enumerate(words) if matches(word)), None)
+    start = max(0, (first or 0) - max_words // 3)
+    snippet = words[start:start + max_words]
+    return " ".join(f"<mark>{word}</mark>" if matches(word) else word for word in snippet)
@@ -12,6 +12,7 @@ from loguru import logger
 from bs4 import BeautifulSoup
 
 from config.settings import SEO_CONFIG
+from src.search import derived_columns
 
 
 class SEOOptimizer:
@@ -24,6 +25,12 @@ class SEOOptimizer:
         """Perform comprehensive SEO optimization on article"""
         logger.info(f"Optimizing SEO for article: {article['title']}")
         
+        # Word count, plain text and reading time, computed once for the analysis and the markup
+        derived = derived_columns(article["content"])
+        if article.get("read_time"):
+            derived.pop("read_time")
+        article.update(derived)
+        
         # Optimize title
         article["title"] = self.optimize_title(article["title"], article.get("primary_keyword", ""))
         
@@ -106,12 +113,15 @@ class SEOOptimizer:
     
     def analyze_keyword_density(self, article: Dict) -> Dict:
         """Analyze keyword density and distribution"""
-        content = self._extract_text_content(article["content"])
+        if "plain_text" in article and "word_count" in article:
+            content, word_count = article["plain_text"], article["word_count"]
+        else:
+            content = self._extract_text_content(article["content"])
+            word_count = len(content.split())
         title = article["title"]
         primary_keyword = article.get("primary_keyword", "").lower()
         secondary_keywords = [kw.lower() for kw in article.get("secondary_keywords", [])]
         
-        word_count = len(content.split())
         content_lower = content.lower()
         title_lower = title.lower()
         
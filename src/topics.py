@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from GoogleNews import GoogleNews
 from loguru import logger
-from config.settings import GOOGLE_NEWS_CONFIG
+from config.settings import GOOGLE_NEWS_CONFIG, PUBLISHING_SCHEDULE
 import re
 from src.sheets_integration import SheetsManager
 
@@ -23,6 +23,8 @@ class TopicManager:
         self.published_file = published_file
         self.topics_data = self._load_topics()
         self.published_data = self._load_published()
+        # Decayed view score per category (see set_category_trends)
+        self.category_trends: Dict[str, float] = {}
         
         # Initialize Google Sheets integration
         self.sheets_manager = SheetsManager()
@@ -146,17 +148,36 @@ class TopicManager:
             category_count[category] = category_count.get(category, 0) + 1
         return category_count
     
+    def set_category_trends(self, scores: Dict[str, float]) -> None:
+        """Use trending scores per category (DatabaseManager.get_trending_categories) in get_next_category"""
+        self.category_trends = dict(scores or {})
+    
+    def _traffic_share(self, category: str) -> float:
+        """Category traffic relative to an even split (1.0 = average, 0 without data)"""
+        total = sum(self.category_trends.values())
+        if total <= 0:
+            return 0.0
+        return self.category_trends.get(category, 0.0) * len(self.topics_data["categories"]) / total
+    
     def get_next_category(self) -> str:
-        """Get next category to write about based on distribution and rotation"""
+        """Get next category to write about based on distribution and rotation
+        
+        Picks the category with the fewest published articles, where a
+        category with more traffic counts as having fewer: at twice the
+        average traffic it keeps its turn until it has about three times as
+        many articles (trending_weight 1.0). Without trending data this is
+        plain rotation.
+        """
         all_categories = self.topics_data["categories"]
         published_distribution = self.get_category_distribution()
+        weight = PUBLISHING_SCHEDULE.get("trending_weight", 0)
         
-        # Find category with least published articles
+        # Find category with least (traffic-weighted) published articles
         min_count = float('inf')
         next_category = all_categories[0]
         
         for category in all_categories:
-            count = published_distribution.get(category, 0)
+            count = (published_distribution.get(category, 0) + 1) / (1 + weight * self._traffic_share(category))
             unused_count = len(self.get_unused_topics(category))
             
             # Only consider categories that have unused topics
@@ -0,0 +1,128 @@
+"""
+Trending scores for Jachtexamen Blog System
+Exponentially decayed view scores per article and per category, updated
+incrementally on every view flush instead of recomputed over history
+"""
+
+import bisect
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+ARTICLE_SCOPE = "article"
+CATEGORY_SCOPE = "category"
+
+# Move the reference time forward after this many half-lives (keeps the
+# stored values well inside float range)
+REBASE_AFTER_HALF_LIVES = 64
+
+
+class DecayedScores:
+    """Scores that halve every half_life seconds, ranked without re-decaying
+
+    A score is stored as its value at a common reference time, so adding
+    amount at time t stores amount * 2^((t - reference) / half_life). All
+    stored values decay by the same factor; the ranking only changes when
+    a key is updated, so it is kept sorted on update and top() is a slice.
+    """
+
+    def __init__(self, half_life: float, reference: Optional[float] = None):
+        self.half_life = half_life
+        self.reference = time.time() if reference is None else reference
+        self._values: Dict[str, float] = {}
+        self._ranked: List[Tuple[float, str]] = []
+
+    def _growth(self, at: float) -> float:
+        return 2.0 ** ((at - self.reference) / self.half_life)
+
+    def _set(self, key: str, value: float) -> None:
+        old = self._values.get(key)
+        if old is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, (-old, key))]
+        self._values[key] = value
+        bisect.insort(self._ranked, (-value, key))
+
+    def _rebase(self, at: float) -> None:
+        if (at - self.reference) / self.half_life < REBASE_AFTER_HALF_LIVES:
+            return
+        factor = 1.0 / self._growth(at)
+        self.reference = at
+        self._values = {key: value * factor for key, value in self._values.items()}
+        self._ranked = [(value * factor, key) for value, key in self._ranked]
+
+    def add(self, key: str, amount: float, at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        self._rebase(at)
+        self._set(key, self._values.get(key, 0.0) + amount * self._growth(at))
+
+    def load(self, key: str, value: float, reference: float) -> None:
+        """Restore a value stored relative to another reference time"""
+        self._set(key, value * 2.0 ** ((reference - self.reference) / self.half_life))
+
+    def score(self, key: str, at: Optional[float] = None) -> float:
+        return self._values.get(key, 0.0) / self._growth(time.time() if at is None else at)
+
+    def top(self, k: int, at: Optional[float] = None) -> List[Tuple[str, float]]:
+        """The k highest (key, current score) pairs"""
+        decay = 1.0 / self._growth(time.time() if at is None else at)
+        return [(key, -value * decay) for value, key in self._ranked[:k]]
+
+    def scores(self, at: Optional[float] = None) -> Dict[str, float]:
+        decay = 1.0 / self._growth(time.time() if at is None else at)
+        return {key: value * decay for key, value in self._values.items()}
+
+    def stored(self, key: str) -> float:
+        """Value relative to self.reference, as persisted"""
+        return self._values.get(key, 0.0)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TrendingEngine:
+    """Decayed view scores per article and per category"""
+
+    def __init__(self, half_life_hours: float = 24):
+        half_life = half_life_hours * 3600
+        self.scopes = {
+            ARTICLE_SCOPE: DecayedScores(half_life),
+            CATEGORY_SCOPE: DecayedScores(half_life)
+        }
+        self._dirty: Set[Tuple[str, str]] = set()
+
+    @property
+    def articles(self) -> DecayedScores:
+        return self.scopes[ARTICLE_SCOPE]
+
+    @property
+    def categories(self) -> DecayedScores:
+        return self.scopes[CATEGORY_SCOPE]
+
+    def record(self, article_id: str, category: Optional[str], views: int, at: Optional[float] = None) -> None:
+        """Add views to the article and its category"""
+        self.articles.add(str(article_id), views, at)
+        self._dirty.add((ARTICLE_SCOPE, str(article_id)))
+        if category:
+            self.categories.add(category, views, at)
+            self._dirty.add((CATEGORY_SCOPE, category))
+
+    def load(self, rows: Iterable[Dict]) -> None:
+        """Restore persisted trending_scores rows"""
+        for row in rows:
+            scope = self.scopes.get(row["scope"])
+            if scope is not None:
+                scope.load(row["key"], row["value"], row["reference_epoch"])
+
+    def dirty_rows(self) -> List[Dict]:
+        """trending_scores rows changed since the last call"""
+        rows = [
+            {
+                "scope": scope,
+                "key": key,
+                "value": self.scopes[scope].stored(key),
+                "reference_epoch": self.scopes[scope].reference
+            }
+            for scope, key in sorted(self._dirty)
+        ]
+        self._dirty.clear()
+        return rows
@@ -50,10 +50,10 @@ def validate_environment() -> bool:
     """Validate that all required environment variables are set"""
     required_vars = [
         "OPENAI_API_KEY",
-        "ANTHROPIC_API_KEY", 
-        "SUPABASE_URL",
-        "SUPABASE_SERVICE_KEY"
+        "ANTHROPIC_API_KEY"
     ]
+    if os.getenv("DATABASE_BACKEND", "supabase") == "supabase":
+        required_vars += ["SUPABASE_URL", "SUPABASE_SERVICE_KEY"]
     
     missing_vars = []
     for var in required_vars:
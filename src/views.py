@@ -0,0 +1,155 @@
+"""
+Page-view aggregation for Jachtexamen Blog System
+View events are counted in memory per slug and day, with a HyperLogLog
+sketch for unique visitors, and flushed to article_stats in batches
+"""
+
+import base64
+import hashlib
+import math
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 2^12 registers: ~1.6% standard error in 4 KB per article and day
+HLL_PRECISION = 12
+
+# Cap on distinct (slug, day) buckets held between flushes
+MAX_PENDING_BUCKETS = 10000
+
+# Of those, buckets of slugs not (yet) known to be articles
+MAX_UNVERIFIED_BUCKETS = 1000
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch with small-range correction"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError(f"Expected {self.size} registers, got {len(self.registers)}")
+
+    def add(self, item: str) -> None:
+        value = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Union with another sketch of the same precision"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size ** 2 / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+    def to_text(self) -> str:
+        """Registers as base64 text (for a text column)"""
+        return base64.b64encode(bytes(self.registers)).decode("ascii")
+
+    @classmethod
+    def from_text(cls, text: Optional[str], precision: int = HLL_PRECISION) -> "HyperLogLog":
+        return cls(precision, base64.b64decode(text) if text else None)
+
+
+class ViewAggregator:
+    """Thread-safe in-memory view counters, drained by a periodic flush
+
+    Slugs not in the known set (set_known_slugs) may hold at most
+    max_unverified buckets between flushes; the flush resolves them and
+    discards the ones that are not articles, so junk slugs cost a bounded
+    number of lookups and new articles are still counted.
+    """
+
+    def __init__(self, max_buckets: int = MAX_PENDING_BUCKETS, max_unverified: int = MAX_UNVERIFIED_BUCKETS):
+        self.max_buckets = max_buckets
+        self.max_unverified = max_unverified
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], Dict] = {}
+        self._known_slugs: Set[str] = set()
+        self._unverified = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def set_known_slugs(self, slugs: Iterable[str]) -> None:
+        """Slugs that are known articles (e.g. the database manager's slug index)"""
+        known = set(slugs)
+        with self._lock:
+            self._known_slugs = known
+
+    def _bucket(self, key: Tuple[str, str], views: int) -> Optional[Dict]:
+        """Existing or new bucket for key, or None (counted) when it is not admitted"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        if len(self._buckets) >= self.max_buckets:
+            self.dropped += views
+            return None
+        if key[0] not in self._known_slugs:
+            if self._unverified >= self.max_unverified:
+                self.rejected += views
+                return None
+            self._unverified += 1
+        bucket = self._buckets[key] = {"views": 0, "visitors": HyperLogLog()}
+        return bucket
+
+    def record(self, slug: str, visitor: str, day: Optional[date] = None) -> bool:
+        """Count one view; returns False when the event was dropped or rejected"""
+        key = (slug, (day or date.today()).isoformat())
+        with self._lock:
+            bucket = self._bucket(key, 1)
+            if bucket is None:
+                return False
+            bucket["views"] += 1
+            bucket["visitors"].add(visitor)
+        return True
+
+    def drain(self) -> List[Dict]:
+        """Take all pending buckets as [{"slug", "day", "views", "visitors"}]"""
+        with self._lock:
+            buckets, self._buckets = self._buckets, {}
+            self._unverified = 0
+        return [
+            {"slug": slug, "day": day, "views": bucket["views"], "visitors": bucket["visitors"]}
+            for (slug, day), bucket in buckets.items()
+        ]
+
+    def restore(self, buckets: List[Dict]) -> None:
+        """Put drained buckets back after a failed flush, under the same caps as record"""
+        with self._lock:
+            for bucket in buckets:
+                pending = self._bucket((bucket["slug"], bucket["day"]), bucket["views"])
+                if pending is not None:
+                    pending["views"] += bucket["views"]
+                    pending["visitors"].merge(bucket["visitors"])
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(bucket["views"] for bucket in self._buckets.values())
+
+
+def merge_stats(existing: Optional[Dict], bucket: Dict) -> Dict:
+    """article_stats values after adding a drained bucket to the stored row"""
+    visitors = bucket["visitors"]
+    views = bucket["views"]
+    if existing:
+        stored = HyperLogLog.from_text(existing.get("visitors_hll"))
+        stored.merge(visitors)
+        visitors = stored
+        views += existing.get("views") or 0
+    return {
+        "views": views,
+        "unique_visitors": visitors.count(),
+        "visitors_hll": visitors.to_text()
+    }
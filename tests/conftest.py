@@ -0,0 +1,21 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from config.settings import Settings
+from src.database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager backed by a mocked PostgREST client"""
+    settings = Settings(
+        supabase_url="https://test.supabase.co", supabase_service_key="test-key",
+        outbox_path=str(tmp_path / "outbox.sqlite3")
+    )
+    with patch("src.database.Settings", return_value=settings), \
+         patch("src.database.get_postgrest_client", return_value=MagicMock()):
+        yield DatabaseManager()
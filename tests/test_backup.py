@@ -0,0 +1,189 @@
+"""
+Tests for backup module
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import pytest
+
+from src.backup import (
+    BackupWriter, MANIFEST_KEY, backup_chain, load_backup_state, verify_backup
+)
+from src.database_mock import DatabaseManager as MockDatabaseManager
+
+
+def sample_articles(count: int = 3) -> list:
+    return [
+        {"id": str(i), "slug": f"artikel-{i}", "title": f"Artikel {i}", "content": "<p>Reeën</p>"}
+        for i in range(count)
+    ]
+
+
+class TestBackupWriter:
+    """Test cases for the streaming NDJSON backup writer"""
+    
+    def test_writes_ndjson_with_trailing_manifest(self, tmp_path):
+        """Test rows and manifest are written to a gzip NDJSON file"""
+        path = str(tmp_path / "backup.ndjson.gz")
+        
+        with BackupWriter(path, "gzip") as writer:
+            for article in sample_articles():
+                writer.write(article)
+        
+        with gzip.open(path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        
+        manifest = json.loads(lines[-1])[MANIFEST_KEY]
+        assert manifest["row_count"] == 3
+        assert manifest["sha256"] == hashlib.sha256(b"".join(lines[:-1])).hexdigest()
+        assert json.loads(lines[0])["title"] == "Artikel 0"
+    
+    def test_failed_backup_leaves_no_file(self, tmp_path):
+        """Test an exception while writing discards the partial file"""
+        path = str(tmp_path / "backup.ndjson")
+        
+        with pytest.raises(RuntimeError):
+            with BackupWriter(path, "none") as writer:
+                writer.write(sample_articles(1)[0])
+                raise RuntimeError("database went away")
+        
+        assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_mock_backup_uses_ndjson_format(tmp_path):
+    """Test the mock backend writes the same backup format"""
+    db = MockDatabaseManager()
+    db.articles = sample_articles(2)
+    
+    filename = await db.backup_articles(str(tmp_path / "mock.ndjson"), compression="none")
+    
+    with open(filename, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[-1])[MANIFEST_KEY]["row_count"] == 2
+
+
+@pytest.mark.asyncio
+class TestIncrementalBackup:
+    """Test cases for watermark-based incremental backups"""
+    
+    @pytest.fixture
+    def db(self, tmp_path):
+        from unittest.mock import MagicMock, patch
+        from config.settings import Settings
+        from src.database import DatabaseManager
+        
+        settings = Settings(
+            supabase_url="https://test.supabase.co",
+            supabase_service_key="test-key",
+            backup_dir=str(tmp_path),
+            backup_compression="gzip"
+        )
+        with patch("src.database.Settings", return_value=settings), \
+             patch("src.database.get_postgrest_client", return_value=MagicMock()):
+            yield DatabaseManager()
+    
+    async def test_incremental_exports_rows_after_watermark(self, db):
+        """Test second backup only scans rows updated after the first one"""
+        calls = []
+        rows = [
+            {"id": "1", "slug": "a", "updated_at": "2024-05-01T10:00:00+00:00"},
+            {"id": "2", "slug": "b", "updated_at": "2024-05-02T10:00:00+00:00"},
+        ]
+        
+        async def fake_iter(**kwargs):
+            calls.append(kwargs)
+            since = kwargs.get("start_after")
+            for row in rows:
+                if since is None or row["updated_at"] > since:
+                    yield row
+        
+        db.iter_articles = fake_iter
+        full = await db.backup_articles()
+        rows.append({"id": "3", "slug": "c", "updated_at": "2024-05-03T10:00:00+00:00"})
+        incremental = await db.backup_articles(incremental=True)
+        
+        assert calls[1]["order_by"] == "updated_at"
+        assert calls[1]["start_after"] < "2024-05-02T10:00:00+00:00"
+        manifest = verify_backup(incremental)
+        assert manifest["type"] == "incremental"
+        assert manifest["watermark"] == "2024-05-03T10:00:00+00:00"
+        
+        state = load_backup_state(db.settings.backup_dir)
+        assert backup_chain(state) == [full, incremental]
+    
+    async def test_incremental_without_base_takes_full_backup(self, db):
+        """Test the first incremental backup falls back to a full one"""
+        async def fake_iter(**kwargs):
+            assert "start_after" not in kwargs
+            yield {"id": "1", "slug": "a", "updated_at": "2024-05-01T10:00:00+00:00"}
+        
+        db.iter_articles = fake_iter
+        filename = await db.backup_articles(incremental=True)
+        
+        assert verify_backup(filename)["type"] == "full"
+
+
+class TestBackupParsing:
+    """Test cases for reading backups of every supported format"""
+    
+    def test_legacy_json_streamed_in_small_chunks(self, tmp_path):
+        """Test the incremental JSON parser handles objects split across reads"""
+        from src.backup import iter_json_backup
+        
+        path = tmp_path / "blog_backup.json.gz"
+        articles = sample_articles(20)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"created_at": "2024-01-01", "total_articles": 20, "articles": articles},
+                      f, ensure_ascii=False, indent=2)
+        
+        assert list(iter_json_backup(str(path), chunk_size=16)) == articles
+    
+    def test_ndjson_and_json_detected(self, tmp_path):
+        """Test format detection picks the right parser"""
+        from src.backup import iter_backup_articles
+        
+        ndjson_path = str(tmp_path / "backup.ndjson")
+        with BackupWriter(ndjson_path, "none") as writer:
+            for article in sample_articles(2):
+                writer.write(article)
+        json_path = tmp_path / "backup.json"
+        json_path.write_text(json.dumps({"articles": sample_articles(2)}), encoding="utf-8")
+        
+        assert list(iter_backup_articles(ndjson_path)) == sample_articles(2)
+        assert list(iter_backup_articles(str(json_path))) == sample_articles(2)
+
+
+@pytest.mark.asyncio
+async def test_restore_isolates_failing_rows(tmp_path):
+    """Test bulk restore bisects a rejected chunk and skips invalid rows"""
+    from unittest.mock import AsyncMock, MagicMock, patch
+    from config.settings import Settings
+    from src.database import DatabaseManager
+    
+    path = str(tmp_path / "backup.ndjson.gz")
+    with BackupWriter(path, "gzip") as writer:
+        for article in sample_articles(8):
+            writer.write(article)
+        writer.write({"id": "99", "title": "Zonder inhoud"})
+    
+    settings = Settings(supabase_url="https://test.supabase.co", supabase_service_key="test-key")
+    with patch("src.database.Settings", return_value=settings), \
+         patch("src.database.get_postgrest_client", return_value=MagicMock()):
+        db = DatabaseManager()
+        upsert = db.supabase.table.return_value.upsert
+        
+        async def execute():
+            rows = upsert.call_args[0][0]
+            if any(row["id"] == "5" for row in rows):
+                raise RuntimeError("duplicate slug")
+        
+        upsert.return_value.execute = AsyncMock(side_effect=execute)
+        summary = await db.restore_articles([path], concurrency=2, chunk_size=4)
+    
+    assert summary["restored"] == 7
+    assert summary["failed"] == 1
+    assert summary["invalid"] == 1
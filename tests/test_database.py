@@ -0,0 +1,671 @@
+"""
+Tests for database manager module
+"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from postgrest.exceptions import APIError
+from tenacity import wait_none
+
+from src.database import DatabaseManager, PROJECTIONS, UNIQUE_VIOLATION, derived_columns
+from src.outbox import OUTBOX_INSERT, OUTBOX_UPDATE
+from src.scheduler import BlogScheduler
+from src.seo import SEOOptimizer
+from src.views import HyperLogLog
+
+
+def sample_article(**overrides) -> dict:
+    article = {
+        "title": "Wilde Zwijnen: Gedrag en Veilige Jacht",
+        "slug": "wilde-zwijnen",
+        "content": "<p>Wilde zwijnen leven in Nederlandse bossen.</p>",
+        "category": "wild",
+    }
+    article.update(overrides)
+    return article
+
+
+@pytest.mark.asyncio
+class TestSlugIndex:
+    """Test cases for slug index and unique insert"""
+    
+    async def test_create_article_single_round_trip(self, db):
+        """Test unused slug is inserted without duplicate checks"""
+        db._slug_index = {}
+        table = db.supabase.table.return_value
+        table.insert.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "slug": "wilde-zwijnen"}]
+        ))
+        
+        created = await db.create_article(sample_article())
+        
+        assert created["slug"] == "wilde-zwijnen"
+        table.select.assert_not_called()
+        assert db._slug_index == {"wilde-zwijnen": "1"}
+    
+    async def test_create_article_skips_indexed_slug(self, db):
+        """Test known slug gets a date suffix before inserting"""
+        db._slug_index = {"wilde-zwijnen": "1"}
+        table = db.supabase.table.return_value
+        table.insert.return_value.execute = AsyncMock(side_effect=lambda: MagicMock(
+            data=[{"id": "2", "slug": table.insert.call_args[0][0]["slug"]}]
+        ))
+        
+        created = await db.create_article(sample_article())
+        
+        assert created["slug"].startswith("wilde-zwijnen-")
+        assert table.insert.call_count == 1
+    
+    async def test_create_article_retries_on_unique_violation(self, db):
+        """Test a racing insert is retried with the next suffix"""
+        db._slug_index = {}
+        table = db.supabase.table.return_value
+        table.insert.return_value.execute = AsyncMock(side_effect=[
+            APIError({"code": UNIQUE_VIOLATION, "message": "duplicate key"}),
+            MagicMock(data=[{"id": "3", "slug": "wilde-zwijnen-x"}]),
+        ])
+        table.select.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[])
+        )
+        
+        created = await db.create_article(sample_article())
+        
+        assert created["id"] == "3"
+        assert "wilde-zwijnen" in db._slug_index
+        second_slug = table.insert.call_args_list[1][0][0]["slug"]
+        assert second_slug != "wilde-zwijnen"
+    
+    async def test_retried_insert_returns_existing_row(self, db):
+        """Test a conflict on the idempotency key returns the row stored earlier"""
+        db._slug_index = {}
+        table = db.supabase.table.return_value
+        table.insert.return_value.execute = AsyncMock(
+            side_effect=APIError({"code": UNIQUE_VIOLATION, "message": "duplicate key"})
+        )
+        lookup = table.select.return_value.eq
+        lookup.return_value.limit.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "slug": "wilde-zwijnen"}]
+        ))
+        
+        created = await db.create_article(sample_article(topic_id=7))
+        
+        assert created["id"] == "1"
+        assert table.insert.call_count == 1
+        key = table.insert.call_args[0][0]["idempotency_key"]
+        lookup.assert_called_once_with("idempotency_key", key)
+    
+    async def test_update_article_reindexes_renamed_slug(self, db):
+        """Test slug renames replace the old index entry"""
+        db._slug_index = {"oude-slug": "1"}
+        table = db.supabase.table.return_value
+        table.update.return_value.eq.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "slug": "nieuwe-slug"}]
+        ))
+        
+        await db.update_article("1", {"slug": "nieuwe-slug"})
+        
+        assert db._slug_index == {"nieuwe-slug": "1"}
+
+
+@pytest.mark.asyncio
+class TestBatchUpdate:
+    """Test cases for set-based batch updates"""
+    
+    async def test_full_rows_grouped_into_one_upsert(self, db):
+        """Test full rows are sent as a single upsert keyed on id"""
+        table = db.supabase.table.return_value
+        table.select.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": str(i)} for i in range(3)]
+        ))
+        table.upsert.return_value.execute = AsyncMock(side_effect=lambda: MagicMock(
+            data=table.upsert.call_args[0][0]
+        ))
+        updates = [sample_article(id=str(i), slug=f"artikel-{i}") for i in range(3)]
+        
+        results = await db.batch_update_articles(updates)
+        
+        assert len(results) == 3
+        table.upsert.assert_called_once()
+        assert table.upsert.call_args.kwargs["on_conflict"] == "id"
+        assert all("id" in update for update in updates)  # caller dicts untouched
+    
+    async def test_upsert_never_inserts_missing_ids(self, db):
+        """Test full-row updates of articles that no longer exist are dropped"""
+        table = db.supabase.table.return_value
+        table.select.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1"}]
+        ))
+        table.upsert.return_value.execute = AsyncMock(side_effect=lambda: MagicMock(
+            data=table.upsert.call_args[0][0]
+        ))
+        
+        results = await db.batch_update_articles(
+            [sample_article(id=str(i), slug=f"artikel-{i}") for i in range(2)]
+        )
+        
+        assert [row["id"] for row in results] == ["1"]
+        assert [row["id"] for row in table.upsert.call_args[0][0]] == ["1"]
+    
+    async def test_upserted_rows_record_revisions(self, db):
+        """Test full-row updates append to the revision chain like single updates"""
+        table = db.supabase.table.return_value
+        table.select.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "title": "Oude titel"}]
+        ))
+        table.upsert.return_value.execute = AsyncMock(side_effect=lambda: MagicMock(
+            data=table.upsert.call_args[0][0]
+        ))
+        table.select.return_value.eq.return_value.order.return_value.limit.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[])
+        )
+        table.insert.return_value.execute = AsyncMock()
+        
+        await db.batch_update_articles([sample_article(id="1")])
+        
+        revisions = table.insert.call_args[0][0]
+        assert [(row["article_id"], row["revision"]) for row in revisions] == [("1", 1), ("1", 2)]
+    
+    async def test_identical_partial_updates_share_one_request(self, db):
+        """Test partial updates with equal values become one filtered update"""
+        table = db.supabase.table.return_value
+        table.update.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1"}, {"id": "2"}]
+        ))
+        
+        results = await db.batch_update_articles([
+            {"id": "1", "status": "published"},
+            {"id": "2", "status": "published"},
+        ])
+        
+        assert len(results) == 2
+        table.update.return_value.in_.assert_called_once_with("id", ["1", "2"])
+        table.upsert.assert_not_called()
+
+    
+    async def test_backfill_writes_only_derived_columns(self, db):
+        """Test the backfill updates by id, guarded on updated_at, and never upserts"""
+        rows = [
+            {"id": "1", "content": "<p>Twee woorden</p>", "content_hash": None, "updated_at": "2024-01-01T00:00:00"},
+            {"id": "2", "content": "<p>Al gedaan</p>", "content_hash": derived_columns("<p>Al gedaan</p>")["content_hash"],
+             "updated_at": "2024-01-01T00:00:00"}
+        ]
+        
+        async def iter_articles(**kwargs):
+            for row in rows:
+                yield row
+        
+        db.iter_articles = iter_articles
+        table = db.supabase.table.return_value
+        guarded = table.update.return_value.eq.return_value.eq
+        guarded.return_value.execute = AsyncMock(return_value=MagicMock(data=[{"id": "1"}]))
+        
+        assert await db.backfill_derived_columns() == 1
+        
+        values = table.update.call_args[0][0]
+        assert set(values) == {"plain_text", "word_count", "content_hash"}
+        table.update.return_value.eq.assert_called_once_with("id", "1")
+        guarded.assert_called_once_with("updated_at", "2024-01-01T00:00:00")
+        table.upsert.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestViews:
+    """Test cases for flushing page views"""
+    
+    async def test_unknown_slugs_resolved_in_chunks_and_discarded(self, db):
+        """Test a flush full of junk slugs stays within short lookups and writes nothing"""
+        db._slug_index = {}
+        lookup = db.supabase.table.return_value.select.return_value.in_
+        lookup.return_value.execute = AsyncMock(return_value=MagicMock(data=[]))
+        buckets = [
+            {"slug": f"onzin-{i}", "day": "2026-03-01", "views": 1, "visitors": HyperLogLog()}
+            for i in range(250)
+        ]
+        
+        assert await db.record_article_views(buckets) == 0
+        assert [len(call.args[1]) for call in lookup.call_args_list] == [100, 100, 50]
+        db.supabase.table.return_value.upsert.assert_not_called()
+
+
+class TestDerivedColumns:
+    """Test cases for columns computed from content"""
+    
+    def test_schema_markup_word_count_matches_content(self, db):
+        """Test the JSON-LD wordCount is the derived word count, before and after edits"""
+        article = SEOOptimizer().optimize_article(sample_article())
+        assert article["schema_markup"]["article"]["wordCount"] == article["word_count"] == 6
+        
+        article["content"] += "<p>Nog vier extra woorden.</p>"
+        row = db._prepare_article_for_db(article)
+        
+        assert row["schema_markup"]["article"]["wordCount"] == row["word_count"] == 10
+        assert article["schema_markup"]["article"]["wordCount"] == 6
+
+
+class TestScheduledPublishing:
+    """Test cases for scheduled drafts and the bulk publisher"""
+    
+    def test_scheduled_article_is_stored_as_draft(self, db):
+        """Test a scheduled_at turns the new row into a scheduled draft"""
+        row = db._prepare_article_for_db(sample_article(scheduled_at="2026-03-01T09:00:00"))
+        
+        assert row["status"] == "draft"
+        assert row["published_at"] is None
+        assert row["scheduled_at"] == "2026-03-01T09:00:00"
+    
+    def test_scheduler_jobs_share_one_event_loop(self):
+        """Test the per-minute publisher reuses one loop (and its connection pool)"""
+        scheduler = BlogScheduler.__new__(BlogScheduler)
+        scheduler._loop = None
+        loops = []
+        
+        async def job():
+            loops.append(asyncio.get_running_loop())
+        
+        scheduler._run_async(job)
+        scheduler._run_async(job)
+        assert loops[0] is loops[1]
+        
+        scheduler.stop_scheduler()
+        assert scheduler._loop.is_closed()
+    
+    @pytest.mark.asyncio
+    async def test_due_drafts_published_with_one_update(self, db):
+        """Test publish_due_articles is a single filtered bulk update"""
+        table = db.supabase.table.return_value
+        query = table.update.return_value.eq.return_value.lte.return_value
+        query.execute = AsyncMock(return_value=MagicMock(data=[{"id": "1", "status": "published"}]))
+        db.refresh_related_articles = AsyncMock()
+        now = datetime(2026, 3, 1, 9, 0)
+        
+        published = await db.publish_due_articles(now)
+        
+        assert [row["id"] for row in published] == ["1"]
+        table.update.assert_called_once()
+        assert table.update.call_args[0][0]["status"] == "published"
+        table.update.return_value.eq.assert_called_once_with("status", "draft")
+        table.update.return_value.eq.return_value.lte.assert_called_once_with("scheduled_at", now.isoformat())
+        db.refresh_related_articles.assert_awaited_once_with(published)
+
+
+@pytest.mark.asyncio
+class TestPurge:
+    """Test cases for chunked purges"""
+    
+    async def test_purge_deletes_in_keyset_chunks(self, db, monkeypatch):
+        """Test rows are deleted by id in bounded chunks with a pause in between"""
+        sleep = AsyncMock()
+        monkeypatch.setattr("src.database.asyncio.sleep", sleep)
+        table = db.supabase.table.return_value
+        candidates = table.select.return_value.eq.return_value.lt.return_value.is_.return_value
+        candidates.order.return_value.limit.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "slug": "a"}, {"id": "2", "slug": "b"}]
+        ))
+        candidates.gt.return_value.order.return_value.limit.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "3", "slug": "c"}]
+        ))
+        delete = table.delete.return_value.in_.return_value.eq.return_value.lt.return_value.is_.return_value
+        delete.execute = AsyncMock(side_effect=[MagicMock(count=2), MagicMock(count=1)])
+        
+        summary = await db.purge_articles("draft", 30, chunk_size=2, pause=0.1)
+        
+        assert summary["deleted"] == 3
+        assert summary["chunks"] == 2
+        candidates.gt.assert_called_once_with("id", "2")
+        assert [c.args for c in table.delete.return_value.in_.call_args_list] == [("id", ["1", "2"]), ("id", ["3"])]
+        table.delete.return_value.in_.return_value.eq.assert_called_with("status", "draft")
+        table.select.return_value.eq.return_value.lt.return_value.is_.assert_called_with("scheduled_at", "null")
+        sleep.assert_awaited_once_with(0.1)
+    
+    async def test_dry_run_only_counts(self, db):
+        """Test a dry run counts matching rows and deletes nothing"""
+        table = db.supabase.table.return_value
+        table.select.return_value.eq.return_value.lt.return_value.limit.return_value.execute = AsyncMock(
+            return_value=MagicMock(count=42)
+        )
+        
+        assert await db.purge_deleted_articles(days=7, dry_run=True) == 42
+        table.select.return_value.eq.assert_called_once_with("status", "deleted")
+        table.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestPatchUpdates:
+    """Test cases for sending only changed columns"""
+    
+    async def test_update_sends_only_changed_columns(self, db):
+        """Test unchanged content is left out of the request after a read"""
+        table = db.supabase.table.return_value
+        article = sample_article(id="1", tags=["wild"])
+        article.update(derived_columns(article["content"]))
+        table.select.return_value.eq.return_value.execute = AsyncMock(return_value=MagicMock(data=[article]))
+        table.update.return_value.eq.return_value.execute = AsyncMock(side_effect=lambda: MagicMock(
+            data=[{**article, **table.update.call_args[0][0]}]
+        ))
+        
+        await db.get_article(article_id="1")
+        await db.update_article("1", {**article, "title": "Nieuwe titel"})
+        
+        sent = table.update.call_args[0][0]
+        assert set(sent) == {"title", "updated_at"}
+    
+    async def test_noop_update_makes_no_request(self, db):
+        """Test an update equal to the known row is skipped entirely"""
+        table = db.supabase.table.return_value
+        db._remember(sample_article(id="1"))
+        
+        row = await db.update_article("1", {"title": sample_article()["title"]})
+        results = await db.batch_update_articles([{"id": "1", "slug": "wilde-zwijnen"}])
+        
+        assert row["id"] == "1"
+        assert [r["id"] for r in results] == ["1"]
+        table.update.assert_not_called()
+        table.upsert.assert_not_called()
+    
+    async def test_empty_update_without_known_row_reads_the_row(self, db):
+        """Test an update with nothing to send returns the stored row when none is remembered"""
+        table = db.supabase.table.return_value
+        table.select.return_value.eq.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[sample_article(id="a")]
+        ))
+        
+        row = await db.update_article("a", {})
+        results = await db.batch_update_articles([{"id": "a"}])
+        
+        assert row["id"] == "a"
+        assert [r["id"] for r in results] == ["a"]
+        table.update.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestStatistics:
+    """Test cases for aggregated statistics"""
+    
+    async def test_statistics_single_rpc_and_cached(self, db):
+        """Test statistics come from one RPC and are served from cache"""
+        db.settings.stats_cache_ttl = 60
+        db.supabase.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data={
+            "total_articles": 5,
+            "published_articles": 4,
+            "recent_articles": 2,
+            "category_distribution": {"wild": 3, "wapens": 1},
+        }))
+        
+        stats = await db.get_statistics()
+        await db.get_statistics()
+        
+        assert stats["draft_articles"] == 1
+        assert stats["category_distribution"] == {"wild": 3, "wapens": 1}
+        db.supabase.rpc.assert_called_once()
+        db.supabase.table.assert_not_called()
+    
+    async def test_mock_statistics_match_rpc_shape(self):
+        """Test the mock backend aggregates statistics locally"""
+        from src.database_mock import DatabaseManager as MockDatabaseManager
+        
+        mock_db = MockDatabaseManager()
+        await mock_db.create_article(sample_article())
+        await mock_db.create_article(sample_article(slug="reeen", content="<p>Reeën.</p>", category="wild"))
+        mock_db.articles[1]["status"] = "draft"
+        
+        stats = await mock_db.get_statistics()
+        
+        assert stats["total_articles"] == 2
+        assert stats["published_articles"] == 1
+        assert stats["category_distribution"] == {"wild": 1}
+
+
+@pytest.mark.asyncio
+class TestReadCache:
+    """Test cases for the read-through cache"""
+    
+    async def test_get_article_served_from_cache(self, db):
+        """Test repeated lookups hit the database once"""
+        table = db.supabase.table.return_value
+        table.select.return_value.eq.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[{"id": "1", "slug": "wilde-zwijnen"}])
+        )
+        
+        first = await db.get_article(article_id="1")
+        first["title"] = "changed by caller"
+        second = await db.get_article(article_id="1")
+        
+        assert "title" not in second
+        table.select.return_value.eq.return_value.execute.assert_awaited_once()
+        assert db.get_cache_stats()["hits"] == 1
+    
+    async def test_update_invalidates_matching_entries_only(self, db):
+        """Test writes drop entries containing or matching the article"""
+        db._read_cache.set(("article", "id", "1"), {"id": "1", "category": "wild"})
+        db._read_cache.set(("article", "id", "2"), {"id": "2", "category": "wapens"})
+        db._read_cache.set(("list", "published", "wild", 10, 0, "published_at", "desc"), [])
+        db._read_cache.set(("list", "published", "wapens", 10, 0, "published_at", "desc"), [{"id": "2"}])
+        
+        db._invalidate_article({"id": "1", "status": "published", "category": "wild"})
+        
+        assert ("article", "id", "1") not in db._read_cache
+        assert ("list", "published", "wild", 10, 0, "published_at", "desc") not in db._read_cache
+        assert ("article", "id", "2") in db._read_cache
+        assert ("list", "published", "wapens", 10, 0, "published_at", "desc") in db._read_cache
+
+
+@pytest.mark.asyncio
+class TestIterArticles:
+    """Test cases for keyset-paginated iteration"""
+    
+    async def test_pages_continue_from_last_key(self, db):
+        """Test each page filters after the previous page's last row"""
+        pages = [
+            [{"id": "a", "published_at": "2024-01-01"}, {"id": "b", "published_at": "2024-01-02"}],
+            [{"id": "c", "published_at": "2024-01-03"}],
+            [],
+        ]
+        query = db.supabase.table.return_value.select.return_value
+        query.not_.is_.return_value = query
+        query.is_.return_value = query
+        query.or_.return_value = query
+        query.order.return_value = query
+        query.limit.return_value = query
+        query.execute = AsyncMock(side_effect=[MagicMock(data=page) for page in pages])
+        
+        rows = [row async for row in db.iter_articles(page_size=2)]
+        
+        assert [row["id"] for row in rows] == ["a", "b", "c"]
+        query.or_.assert_called_once()
+        assert '"2024-01-02"' in query.or_.call_args[0][0]
+        assert 'id.gt."b"' in query.or_.call_args[0][0]
+
+
+@pytest.mark.asyncio
+class TestProjections:
+    """Test cases for named column projections"""
+    
+    async def test_list_endpoints_default_to_summary(self, db):
+        """Test list reads do not select full content by default"""
+        query = db.supabase.table.return_value.select.return_value
+        query.eq.return_value = query
+        query.order.return_value = query
+        query.limit.return_value = query
+        query.execute = AsyncMock(return_value=MagicMock(data=[]))
+        
+        await db.get_articles_by_category("wild")
+        
+        columns = db.supabase.table.return_value.select.call_args[0][0]
+        assert columns == PROJECTIONS["summary"]
+        assert "content" not in columns.split(", ")
+    
+    async def test_projection_is_part_of_cache_key(self, db):
+        """Test different projections of the same list are cached separately"""
+        query = db.supabase.table.return_value.select.return_value
+        query.eq.return_value = query
+        query.order.return_value = query
+        query.limit.return_value = query
+        query.execute = AsyncMock(return_value=MagicMock(data=[{"id": "1"}]))
+        
+        await db.get_articles_by_category("wild", projection="summary")
+        await db.get_articles_by_category("wild", projection="seo")
+        
+        assert query.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+class TestSearch:
+    """Test cases for ranked full-text search"""
+    
+    async def test_search_calls_ranked_rpc_with_projection(self, db):
+        """Test search goes through the RPC with the projected columns"""
+        db.supabase.rpc.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": "1", "title": "Wilde zwijnen", "rank": 0.5, "headline": "<mark>zwijnen</mark>"}]
+        ))
+        
+        results = await db.search_articles("wilde zwijnen", limit=5)
+        
+        name, params = db.supabase.rpc.call_args[0]
+        assert name == "search_blog_articles"
+        assert params["result_limit"] == 5
+        assert "content" not in params["result_columns"]
+        assert results[0]["rank"] == 0.5
+    
+    async def test_mock_search_ranks_title_matches_first(self):
+        """Test the mock BM25 search prefers title matches and stems Dutch plurals"""
+        from src.database_mock import DatabaseManager as MockDatabaseManager
+        
+        mock_db = MockDatabaseManager()
+        await mock_db.create_article(sample_article(
+            title="Reeën herkennen", slug="reeen", content="<p>Reeën en zwijnen in het bos.</p>"
+        ))
+        await mock_db.create_article(sample_article())
+        await mock_db.create_article(sample_article(
+            title="Wapenverzorging", slug="wapens", content="<p>Onderhoud van geweren.</p>"
+        ))
+        
+        results = await mock_db.search_articles("zwijn")
+        
+        assert [r["slug"] for r in results] == ["wilde-zwijnen", "reeen"]
+        assert "<mark>" in results[0]["headline"]
+
+
+class TestRelatedArticles:
+    """Test cases for MinHash/LSH related articles"""
+    
+    def test_index_ranks_shared_tags_first(self):
+        """Test articles with overlapping tags rank above unrelated ones"""
+        from src.related import RelatedArticlesIndex
+        
+        index = RelatedArticlesIndex()
+        index.add({"id": "a", "category": "wild", "tags": ["wilde zwijnen", "drukjacht", "bos"]})
+        index.add({"id": "b", "category": "wild", "tags": ["wilde zwijnen", "drukjacht", "veld"]})
+        index.add({"id": "c", "category": "wapens", "tags": ["geweer", "onderhoud"]})
+        
+        related = index.top_k("a", k=5)
+        
+        assert related[0][0] == "b"
+        assert "c" not in [other_id for other_id, _ in related]
+        
+        index.remove("b")
+        assert index.top_k("a") == []
+    
+    @pytest.mark.asyncio
+    async def test_get_related_reads_precomputed_rows(self, db):
+        """Test related articles come from one read of the related_articles table"""
+        query = db.supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value
+        query.execute = AsyncMock(return_value=MagicMock(data=[
+            {"score": 0.8, "article": {"id": "b", "title": "B", "status": "published"}},
+            {"score": 0.4, "article": {"id": "c", "title": "C", "status": "draft"}}
+        ]))
+        
+        related = await db.get_related_articles("a")
+        
+        db.supabase.table.assert_called_once_with("related_articles")
+        assert related == [{"id": "b", "title": "B", "status": "published", "related_score": 0.8}]
+
+
+@pytest.mark.asyncio
+class TestDatabaseOutbox:
+    """Test cases for queueing and draining failed database writes"""
+    
+    async def test_failed_insert_is_queued_and_replayed(self, db, monkeypatch):
+        """Test an insert that fails while the database is down is replayed once"""
+        monkeypatch.setattr(DatabaseManager._insert_with_retry.retry, "wait", wait_none())
+        monkeypatch.setattr(db, "_start_outbox_drainer", lambda: None)
+        db._slug_index = {}
+        table = db.supabase.table.return_value
+        table.insert.return_value.execute = AsyncMock(side_effect=httpx.ConnectError("down"))
+        
+        queued = await db.create_article(sample_article())
+        
+        assert queued["queued"] is True
+        assert db.get_outbox_stats()["pending"] == 1
+        
+        table.select.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(data=[]))
+        table.insert.return_value.execute = AsyncMock(return_value=MagicMock(
+            data=[{"id": queued["id"], "slug": "wilde-zwijnen"}]
+        ))
+        
+        summary = await db.drain_outbox()
+        
+        assert summary == {"replayed": 1, "failed": 0, "remaining": 0}
+        assert table.insert.call_args[0][0]["id"] == queued["id"]
+    
+    async def test_only_transient_failures_are_queued(self, db, monkeypatch):
+        """Test constraint errors return None while connection errors queue the update"""
+        monkeypatch.setattr(db, "_start_outbox_drainer", lambda: None)
+        table = db.supabase.table.return_value
+        table.update.return_value.eq.return_value.execute = AsyncMock(
+            side_effect=APIError({"code": "23502", "message": "null value in column"})
+        )
+        
+        assert await db.update_article("a", {"title": None}) is None
+        assert db.get_outbox_stats()["pending"] == 0
+        
+        table.update.return_value.eq.return_value.execute = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+        queued = await db.update_article("a", {"read_time": 7})
+        
+        assert queued["queued"] is True
+        assert queued["read_time"] == 7
+        assert db.get_outbox_stats()["pending"] == 1
+    
+    async def test_drain_skips_inserts_that_already_landed(self, db):
+        """Test replay is idempotent when the original insert reached the database"""
+        db._get_outbox().enqueue(OUTBOX_INSERT, "a", {"id": "a", "title": "A", "slug": "a"})
+        db._get_outbox().enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        db._get_outbox().enqueue(OUTBOX_UPDATE, "a", {"read_time": 7})
+        table = db.supabase.table.return_value
+        table.select.return_value.in_.return_value.execute = AsyncMock(return_value=MagicMock(data=[{"id": "a"}]))
+        table.update.return_value.eq.return_value.execute = AsyncMock(return_value=MagicMock(data=[{"id": "a"}]))
+        
+        summary = await db.drain_outbox()
+        
+        assert summary["replayed"] == 3
+        table.insert.assert_not_called()
+        table.update.assert_called_once_with({"status": "draft", "read_time": 7})
+    
+    async def test_updates_wait_for_an_insert_in_backoff(self, db):
+        """Test an update is not replayed, or lost, while its article's insert backs off"""
+        outbox = db._get_outbox()
+        insert_id = outbox.enqueue(OUTBOX_INSERT, "a", {"id": "a", "title": "A", "slug": "a"})
+        outbox.mark_failed([insert_id], "timeout")
+        outbox.enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        table = db.supabase.table.return_value
+        
+        summary = await db.drain_outbox()
+        
+        assert summary == {"replayed": 0, "failed": 0, "remaining": 2}
+        table.update.assert_not_called()
+    
+    async def test_update_of_missing_article_is_retried(self, db):
+        """Test an update that matches no row is marked failed instead of done"""
+        db._get_outbox().enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        table = db.supabase.table.return_value
+        table.select.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[])
+        )
+        table.update.return_value.eq.return_value.execute = AsyncMock(return_value=MagicMock(data=[]))
+        
+        summary = await db.drain_outbox()
+        
+        assert summary == {"replayed": 0, "failed": 1, "remaining": 1}
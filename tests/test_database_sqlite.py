@@ -0,0 +1,374 @@
+"""
+Tests for the SQLite storage backend
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.database_sqlite import SQLiteDatabaseManager
+from src.replica import ArticleReplica
+from src.views import ViewAggregator
+from tests.test_database import sample_article
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    manager = SQLiteDatabaseManager(str(tmp_path / "blog.sqlite3"))
+    yield manager
+    manager.close()
+
+
+@pytest.mark.asyncio
+class TestSQLiteDatabaseManager:
+    """Test cases for the embedded SQLite backend"""
+    
+    async def test_create_get_and_update_round_trip(self, sqlite_db):
+        """Test rows keep their JSON columns and updates are persisted"""
+        created = await sqlite_db.create_article(sample_article(tags=["wild", "zwijnen"]))
+        
+        fetched = await sqlite_db.get_article(slug="wilde-zwijnen")
+        assert fetched["id"] == created["id"]
+        assert fetched["tags"] == ["wild", "zwijnen"]
+        
+        updated = await sqlite_db.update_article(created["id"], {"title": "Nieuwe titel"})
+        assert updated["title"] == "Nieuwe titel"
+        assert (await sqlite_db.update_article(created["id"], {"bogus": 1})) is None
+        assert (await sqlite_db.update_article(created["id"], {"title": None})) is None
+    
+    async def test_create_with_existing_id_does_not_overwrite(self, sqlite_db):
+        """Test a create reusing an existing id fails instead of replacing that article"""
+        created = await sqlite_db.create_article(sample_article())
+        
+        assert await sqlite_db.create_article(sample_article(id=created["id"], slug="ander", content="<p>Ander</p>")) is None
+        assert (await sqlite_db.get_article(article_id=created["id"]))["slug"] == created["slug"]
+    
+    async def test_duplicate_slug_gets_suffix(self, sqlite_db):
+        """Test the unique slug index forces a suffixed slug"""
+        first = await sqlite_db.create_article(sample_article())
+        second = await sqlite_db.create_article(sample_article(content="<p>Een ander artikel.</p>"))
+        
+        assert first["slug"] == "wilde-zwijnen"
+        assert second["slug"].startswith("wilde-zwijnen-")
+    
+    async def test_repeated_create_returns_existing_article(self, sqlite_db):
+        """Test creating the same generated article twice is a no-op"""
+        first = await sqlite_db.create_article(sample_article(topic_id=7))
+        second = await sqlite_db.create_article(sample_article(topic_id=7))
+        
+        assert second["id"] == first["id"]
+        assert (await sqlite_db.get_statistics())["total_articles"] == 1
+    
+    async def test_search_stems_and_ranks_title_first(self, sqlite_db):
+        """Test FTS5 search matches stemmed Dutch terms and weights titles"""
+        await sqlite_db.create_article(sample_article(
+            title="Reeën herkennen", slug="reeen", content="<p>Reeën en zwijnen in het bos.</p>"
+        ))
+        await sqlite_db.create_article(sample_article())
+        await sqlite_db.create_article(sample_article(
+            title="Wapenverzorging", slug="wapens", content="<p>Onderhoud van geweren.</p>"
+        ))
+        
+        results = await sqlite_db.search_articles("zwijn")
+        
+        assert [r["slug"] for r in results] == ["wilde-zwijnen", "reeen"]
+        assert "<mark>" in results[0]["headline"]
+        assert "content" not in results[0]
+    
+    async def test_batch_update_statistics_and_listing(self, sqlite_db):
+        """Test transactional batch updates are reflected in reads"""
+        a = await sqlite_db.create_article(sample_article(slug="a", content="a", category="wild"))
+        b = await sqlite_db.create_article(sample_article(slug="b", content="b", category="wapens"))
+        
+        updated = await sqlite_db.batch_update_articles([
+            {"id": a["id"], "status": "draft"},
+            {"id": b["id"], "read_time": 9},
+            sample_article(id="verwijderd", slug="verwijderd", content="weg")
+        ])
+        
+        assert {row["id"] for row in updated} == {a["id"], b["id"]}
+        assert await sqlite_db.get_article(article_id="verwijderd") is None
+        stats = await sqlite_db.get_statistics()
+        assert stats["published_articles"] == 1
+        assert stats["category_distribution"] == {"wapens": 1}
+        assert [row["slug"] for row in await sqlite_db.list_articles()] == ["b"]
+        assert [row["id"] async for row in sqlite_db.iter_articles(filters={"status": "draft"})] == [a["id"]]
+    
+    async def test_backup_restore_round_trip(self, sqlite_db, tmp_path):
+        """Test the shared backup/restore path works against SQLite storage"""
+        await sqlite_db.create_article(sample_article(slug="a", content="a"))
+        await sqlite_db.create_article(sample_article(slug="b", content="b"))
+        sqlite_db.settings.backup_dir = str(tmp_path / "backups")
+        
+        backup = await sqlite_db.backup_articles()
+        restored_db = SQLiteDatabaseManager(str(tmp_path / "restored.sqlite3"))
+        summary = await restored_db.restore_articles([backup])
+        
+        assert summary["restored"] == 2
+        assert (await restored_db.get_statistics())["total_articles"] == 2
+        restored_db.close()
+    
+    async def test_due_scheduled_drafts_are_published(self, sqlite_db):
+        """Test only drafts scheduled before now are published, in queue order"""
+        later = await sqlite_db.create_article(sample_article(slug="later", content="later", scheduled_at="2026-03-02T09:00:00"))
+        due = await sqlite_db.create_article(sample_article(slug="due", content="due", scheduled_at="2026-03-01T09:00:00"))
+        
+        queue = await sqlite_db.get_publishing_queue()
+        assert [row["slug"] for row in queue] == ["due", "later"]
+        
+        published = await sqlite_db.publish_due_articles(datetime(2026, 3, 1, 12, 0))
+        
+        assert [row["id"] for row in published] == [due["id"]]
+        assert (await sqlite_db.get_article(article_id=due["id"]))["status"] == "published"
+        assert (await sqlite_db.get_article(article_id=later["id"]))["status"] == "draft"
+        assert [row["slug"] for row in await sqlite_db.get_publishing_queue()] == ["later"]
+    
+    async def test_purge_old_drafts_in_chunks(self, sqlite_db):
+        """Test old drafts are purged chunk by chunk; newer and scheduled drafts are kept"""
+        old = (datetime.now() - timedelta(days=60)).isoformat()
+        for i in range(5):
+            await sqlite_db.create_article(sample_article(slug=f"oud-{i}", content=f"oud-{i}"))
+        await sqlite_db.create_article(sample_article(slug="nieuw", content="nieuw"))
+        await sqlite_db.create_article(sample_article(
+            slug="gepland", content="gepland", scheduled_at=datetime.now() + timedelta(days=1)
+        ))
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("UPDATE blog_articles SET status = 'draft'")
+            sqlite_db.conn.execute("UPDATE blog_articles SET created_at = ? WHERE slug != 'nieuw'", (old,))
+        
+        assert await sqlite_db.cleanup_old_drafts(days=30, dry_run=True) == 5
+        summary = await sqlite_db.purge_articles("draft", 30, chunk_size=2, pause=0)
+        
+        assert (summary["deleted"], summary["chunks"]) == (5, 3)
+        remaining = [row["slug"] async for row in sqlite_db.iter_articles(filters={"status": "draft"})]
+        assert sorted(remaining) == ["gepland", "nieuw"]
+    
+    async def test_purge_keeps_rows_changed_after_selection(self, sqlite_db, monkeypatch):
+        """Test the DELETE re-checks the filters, so a draft published mid-purge survives"""
+        old = (datetime.now() - timedelta(days=60)).isoformat()
+        created = await sqlite_db.create_article(sample_article(slug="oud", content="oud"))
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("UPDATE blog_articles SET status = 'draft', created_at = ?", (old,))
+        select_candidates = sqlite_db._purge_candidates
+        
+        async def candidates_then_publish(*args):
+            rows = await select_candidates(*args)
+            with sqlite_db.conn:
+                sqlite_db.conn.execute("UPDATE blog_articles SET status = 'published'")
+            return rows
+        
+        monkeypatch.setattr(sqlite_db, "_purge_candidates", candidates_then_publish)
+        summary = await sqlite_db.purge_articles("draft", 30, pause=0)
+        
+        assert (summary["matched"], summary["deleted"]) == (1, 0)
+        assert await sqlite_db.get_article(article_id=created["id"]) is not None
+    
+    async def test_derived_columns_written_and_backfilled(self, sqlite_db):
+        """Test derived columns are stored on create and filled in by the backfill"""
+        created = await sqlite_db.create_article(sample_article(content="<p>Drie <b>losse</b> woorden</p>"))
+        assert (created["word_count"], created["plain_text"]) == (3, "Drie losse woorden")
+        
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("UPDATE blog_articles SET word_count = NULL, plain_text = NULL, content_hash = NULL")
+        
+        assert await sqlite_db.backfill_derived_columns() == 1
+        assert await sqlite_db.backfill_derived_columns() == 0
+        backfilled = await sqlite_db.get_article(article_id=created["id"])
+        assert backfilled["word_count"] == 3
+        assert (backfilled["updated_at"], backfilled["read_time"]) == (created["updated_at"], created["read_time"])
+    
+    async def test_backfill_skips_rows_changed_since_the_scan(self, sqlite_db):
+        """Test a row deleted or edited after the backfill scanned it is left alone"""
+        created = await sqlite_db.create_article(sample_article(content="<p>Drie losse woorden</p>"))
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("UPDATE blog_articles SET content_hash = NULL")
+        
+        scanned = sqlite_db.iter_articles
+        
+        async def iter_then_delete(**kwargs):
+            async for row in scanned(**kwargs):
+                with sqlite_db.conn:
+                    sqlite_db.conn.execute("DELETE FROM blog_articles WHERE id = ?", (row["id"],))
+                yield row
+        
+        sqlite_db.iter_articles = iter_then_delete
+        
+        assert await sqlite_db.backfill_derived_columns() == 0
+        assert await sqlite_db.get_article(article_id=created["id"]) is None
+    
+    async def test_views_flush_merges_and_ranks_popular(self, sqlite_db):
+        """Test flushed view buckets accumulate and drive get_popular_articles"""
+        quiet = await sqlite_db.create_article(sample_article(slug="stil", content="stil"))
+        busy = await sqlite_db.create_article(sample_article(slug="druk", content="druk"))
+        views = ViewAggregator()
+        
+        for visitor in ("a", "b"):
+            views.record("druk", visitor)
+        views.record("stil", "a")
+        views.record("onbekend", "a")
+        assert await sqlite_db.record_article_views(views.drain()) == 3
+        views.record("druk", "a")
+        await sqlite_db.record_article_views(views.drain())
+        
+        popular = await sqlite_db.get_popular_articles()
+        
+        assert [row["id"] for row in popular] == [busy["id"], quiet["id"]]
+        assert (popular[0]["views"], popular[0]["unique_visitors"]) == (3, 2)
+    
+    async def test_views_flush_updates_trending_scores(self, sqlite_db):
+        """Test flushed views feed persisted trending scores per article and category"""
+        await sqlite_db.create_article(sample_article(slug="stil", content="stil", category="wild"))
+        busy = await sqlite_db.create_article(sample_article(slug="druk", content="druk", category="wapens"))
+        views = ViewAggregator()
+        
+        for visitor in ("a", "b", "c"):
+            views.record("druk", visitor)
+        views.record("stil", "a")
+        await sqlite_db.record_article_views(views.drain())
+        
+        trending = await sqlite_db.get_trending_articles(limit=1)
+        assert [row["id"] for row in trending] == [busy["id"]]
+        assert trending[0]["trending_score"] == pytest.approx(3, rel=0.01)
+        
+        # A fresh manager restores the scores from trending_scores
+        reopened = SQLiteDatabaseManager(sqlite_db.path)
+        categories = await reopened.get_trending_categories()
+        reopened.close()
+        assert categories == {"wapens": pytest.approx(3, rel=0.01), "wild": pytest.approx(1, rel=0.01)}
+    
+    async def test_revisions_record_changes_and_roll_back(self, sqlite_db):
+        """Test content updates build a revision chain that rollback restores from"""
+        created = await sqlite_db.create_article(sample_article())
+        await sqlite_db.update_article(created["id"], {"content": "<p>Tweede versie.</p>"})
+        await sqlite_db.update_article(created["id"], {"read_time": 4})
+        await sqlite_db.update_article(created["id"], {"content": "<p>Derde versie.</p>"})
+        
+        revisions = await sqlite_db.get_article_revisions(created["id"])
+        assert [(r["revision"], r["kind"]) for r in revisions] == [(1, "base"), (2, "delta"), (3, "delta")]
+        assert (await sqlite_db.get_article_revision(created["id"], 2))["content"] == "<p>Tweede versie.</p>"
+        
+        restored = await sqlite_db.rollback_article(created["id"], 1)
+        
+        assert restored["content"] == created["content"]
+        assert len(await sqlite_db.get_article_revisions(created["id"])) == 4
+    
+    async def test_unrecorded_write_starts_a_keyframe(self, sqlite_db):
+        """Test a delta is never applied to a base the chain did not record"""
+        created = await sqlite_db.create_article(sample_article(content="<p>a</p><p>d</p>"))
+        await sqlite_db.update_article(created["id"], {"content": "<p>a2</p><p>d</p>"})
+        # A write from outside the manager records no revision
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("UPDATE blog_articles SET content = '<p>b</p><p>new</p>'")
+        await sqlite_db.update_article(created["id"], {"content": "<p>c</p>"})
+        
+        revisions = await sqlite_db.get_article_revisions(created["id"])
+        assert [(r["revision"], r["kind"]) for r in revisions] == [(1, "base"), (2, "delta"), (3, "base")]
+        assert (await sqlite_db.get_article_revision(created["id"], 3))["content"] == "<p>c</p>"
+        assert (await sqlite_db.get_article_revision(created["id"], 2))["content"] == "<p>a2</p><p>d</p>"
+    
+    async def test_batch_updates_record_revisions(self, sqlite_db):
+        """Test versioned fields changed by a batch update land in the revision chain"""
+        created = await sqlite_db.create_article(sample_article(content="<p>a</p>"))
+        await sqlite_db.batch_update_articles([
+            {"id": created["id"], "content": "<p>b</p>"},
+            {"id": created["id"], "status": "draft"}
+        ])
+        
+        revisions = await sqlite_db.get_article_revisions(created["id"])
+        assert [(r["revision"], r["kind"]) for r in revisions] == [(1, "base"), (2, "delta")]
+        assert (await sqlite_db.get_article_revision(created["id"], 1))["content"] == "<p>a</p>"
+    
+    async def test_revision_number_conflict_is_retried(self, sqlite_db, monkeypatch):
+        """Test a revision taken by a concurrent update is re-appended, not lost"""
+        created = await sqlite_db.create_article(sample_article())
+        await sqlite_db.update_article(created["id"], {"content": "<p>Tweede versie.</p>"})
+        latest = sqlite_db._latest_revision
+        stale = [await latest(created["id"])]
+        
+        async def stale_once(article_id):
+            # First read misses a revision another process just appended
+            return stale.pop() if stale else await latest(article_id)
+        
+        with sqlite_db.conn:
+            sqlite_db.conn.execute(
+                "INSERT INTO article_revisions (article_id, revision, kind, data, size, created_at) "
+                "SELECT article_id, 3, kind, data, size, created_at FROM article_revisions WHERE revision = 1"
+            )
+        monkeypatch.setattr(sqlite_db, "_latest_revision", stale_once)
+        await sqlite_db.update_article(created["id"], {"content": "<p>Derde versie.</p>"})
+        
+        revisions = await sqlite_db.get_article_revisions(created["id"])
+        assert [(r["revision"], r["kind"]) for r in revisions][-1] == (4, "base")
+        assert (await sqlite_db.get_article_revision(created["id"], 4))["content"] == "<p>Derde versie.</p>"
+
+
+@pytest.mark.asyncio
+class TestArticleReplica:
+    """Test cases for the local read replica"""
+    
+    async def test_sync_pulls_changes_past_watermark(self, sqlite_db, tmp_path):
+        """Test an incremental sync only applies rows updated since the last one"""
+        first = await sqlite_db.create_article(sample_article(slug="a", content="a", tags=["wild"]))
+        replica = ArticleReplica(str(tmp_path / "replica.sqlite3"))
+        
+        assert await replica.sync(sqlite_db) == 1
+        
+        await sqlite_db.create_article(sample_article(slug="b", content="b", tags=["wild"]))
+        await sqlite_db.update_article(first["id"], {"title": "Bijgewerkt"})
+        
+        assert await replica.sync(sqlite_db) == 2
+        assert (await replica.get_article(article_id=first["id"]))["title"] == "Bijgewerkt"
+        assert [r["slug"] for r in await replica.get_related_articles(first["id"])] == ["b"]
+        replica.close()
+    
+    async def test_sync_drops_rows_deleted_on_the_primary(self, sqlite_db, tmp_path, monkeypatch):
+        """Test hard deletes made without the replica open are reconciled by a later sync"""
+        first = await sqlite_db.create_article(sample_article(slug="a", content="a"))
+        await sqlite_db.create_article(sample_article(slug="b", content="b"))
+        replica = ArticleReplica(str(tmp_path / "replica.sqlite3"))
+        await replica.sync(sqlite_db)
+        
+        with sqlite_db.conn:
+            sqlite_db.conn.execute("DELETE FROM blog_articles WHERE id = ?", (first["id"],))
+        await replica.sync(sqlite_db)
+        assert await replica.get_article(article_id=first["id"]) is not None
+        
+        monkeypatch.setattr("src.replica.RECONCILE_INTERVAL", 0)
+        await replica.sync(sqlite_db)
+        
+        assert await replica.get_article(article_id=first["id"]) is None
+        assert (await replica.get_statistics(use_cache=False))["total_articles"] == 1
+        replica.close()
+    
+    async def test_hard_delete_opens_the_replica(self, db, tmp_path):
+        """Test a purge mirrors into the replica file even if this process never read from it"""
+        path = str(tmp_path / "replica.sqlite3")
+        replica = ArticleReplica(path)
+        replica.apply([{**sample_article(), "id": "1"}])
+        replica.close()
+        db.settings.replica_enabled = True
+        db.settings.replica_path = path
+        
+        db._replicate_removal(["1"])
+        
+        assert await db._replica.get_article(article_id="1") is None
+        db._replica.close()
+    
+    async def test_primary_writes_update_replica_and_reads_use_it(self, db, tmp_path):
+        """Test writes are mirrored synchronously and statistics skip the primary"""
+        db._replica = ArticleReplica(str(tmp_path / "replica.sqlite3"))
+        db._replica.last_sync = time.monotonic()
+        db.settings.replica_enabled = True
+        row = {**sample_article(), "id": "1", "status": "published", "updated_at": "2024-01-01T00:00:00"}
+        db.supabase.table.return_value.update.return_value.eq.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[row])
+        )
+        
+        await db.update_article("1", {"title": row["title"]})
+        stats = await db.get_statistics(use_cache=False)
+        
+        assert stats["published_articles"] == 1
+        db.supabase.rpc.assert_not_called()
+        db._replica.close()
@@ -0,0 +1,74 @@
+"""
+Tests for the columnar article export
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.database_sqlite import SQLiteDatabaseManager
+from src.export import EXPORT_FIELDS, article_features
+from tests.test_database import sample_article
+
+
+def analysed_article(**overrides) -> dict:
+    return {
+        "id": "1",
+        "title": "Reeën herkennen",
+        "secondary_keywords": ["ree", "bok"],
+        "word_count": 800,
+        "seo_score": 82,
+        "keyword_analysis": {
+            "primary_keyword": {"content_count": 12, "density": 1.5, "title_present": True},
+            "secondary_keywords": [{"density": 0.5}, {"density": 1.0}]
+        },
+        "published_at": "2024-03-01T09:00:00",
+        **overrides
+    }
+
+
+class TestArticleFeatures:
+    """Test cases for flattening articles into export rows"""
+    
+    def test_flattens_keyword_analysis(self):
+        """Test keyword densities and dates become typed scalar columns"""
+        row = article_features(analysed_article())
+        
+        assert set(row) == {name for name, _ in EXPORT_FIELDS}
+        assert (row["primary_keyword_count"], row["primary_keyword_density"]) == (12, 1.5)
+        assert row["secondary_keyword_density"] == 0.75
+        assert row["secondary_keyword_count"] == 2
+        assert row["published_at"] == datetime(2024, 3, 1, 9, 0)
+    
+    def test_missing_analysis_gives_nulls(self):
+        """Test rows saved before SEO analysis export nulls, not errors"""
+        row = article_features(analysed_article(keyword_analysis=None, secondary_keywords=None, published_at=None))
+        
+        assert row["primary_keyword_density"] is None
+        assert row["secondary_keyword_density"] is None
+        assert row["secondary_keyword_count"] == 0
+        assert row["published_at"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+async def test_export_round_trip(tmp_path, fmt):
+    """Test every article lands in the columnar file across record batches"""
+    pa = pytest.importorskip("pyarrow")
+    manager = SQLiteDatabaseManager(str(tmp_path / "blog.sqlite3"))
+    for i in range(3):
+        await manager.create_article(sample_article(slug=f"artikel-{i}", content=f"<p>Artikel {i}</p>"))
+    
+    path = await manager.export_articles(str(tmp_path / f"articles.{fmt}"), fmt, batch_size=2)
+    manager.close()
+    
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        batches = pq.ParquetFile(path).num_row_groups
+    else:
+        reader = pa.ipc.open_file(path)
+        table, batches = reader.read_all(), reader.num_record_batches
+    assert table.num_rows == 3
+    assert batches == 2
+    assert table.schema.field("published_at").type == pa.timestamp("us")
@@ -0,0 +1,59 @@
+"""
+Tests for database query metrics
+"""
+
+import httpx
+import pytest
+
+from src.metrics import InstrumentedTransport, QueryMetrics, describe_request
+
+
+class TestDescribeRequest:
+    """Test cases for PostgREST request naming"""
+    
+    def test_filters_keep_shape_not_values(self):
+        """Test filter values are dropped so equal query shapes share an entry"""
+        request = httpx.Request(
+            "GET", "https://x.supabase.co/rest/v1/blog_articles",
+            params={"select": "id", "status": "eq.published", "published_at": "not.is.null", "limit": "5"}
+        )
+        
+        assert describe_request(request) == ("select blog_articles", "published_at=not.is,status=eq")
+    
+    def test_rpc_and_upsert_operations(self):
+        """Test RPC calls and merge-duplicates inserts are named as such"""
+        rpc = httpx.Request("POST", "https://x.supabase.co/rest/v1/rpc/blog_article_statistics")
+        upsert = httpx.Request(
+            "POST", "https://x.supabase.co/rest/v1/blog_articles",
+            headers={"Prefer": "resolution=merge-duplicates"}
+        )
+        
+        assert describe_request(rpc) == ("rpc blog_article_statistics", "")
+        assert describe_request(upsert)[0] == "upsert blog_articles"
+
+
+@pytest.mark.asyncio
+class TestInstrumentedTransport:
+    """Test cases for per-request recording"""
+    
+    async def test_records_rows_bytes_and_errors(self):
+        """Test rows come from Content-Range and HTTP errors are counted"""
+        metrics = QueryMetrics(slow_query_ms=10_000)
+        
+        def handler(request):
+            if request.method == "DELETE":
+                return httpx.Response(500, json={"message": "boom"})
+            return httpx.Response(200, json=[{"id": 1}, {"id": 2}], headers={"Content-Range": "0-1/*"})
+        
+        transport = InstrumentedTransport(httpx.MockTransport(handler), metrics)
+        async with httpx.AsyncClient(transport=transport, base_url="https://x.supabase.co/rest/v1") as client:
+            await client.get("/blog_articles", params={"status": "eq.published"})
+            await client.get("/blog_articles", params={"status": "eq.draft"})
+            await client.delete("/blog_articles", params={"id": "eq.1"})
+        
+        snapshot = metrics.snapshot()
+        select = next(q for q in snapshot["queries"] if q["operation"] == "select blog_articles")
+        assert select["count"] == 2
+        assert select["rows"]["mean"] == 2
+        assert select["bytes"]["count"] == 2
+        assert snapshot["totals"]["errors"] == 1
@@ -0,0 +1,47 @@
+"""
+Tests for the write-behind outbox
+"""
+
+from src.outbox import OUTBOX_INSERT, OUTBOX_UPDATE, WriteOutbox
+
+
+class TestWriteOutbox:
+    """Test cases for the SQLite outbox"""
+    
+    def test_entries_survive_reopen_in_order(self, tmp_path):
+        """Test queued writes are durable and replayed oldest first"""
+        path = str(tmp_path / "outbox.sqlite3")
+        outbox = WriteOutbox(path)
+        outbox.enqueue(OUTBOX_INSERT, "a", {"title": "A"})
+        outbox.enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        outbox.close()
+        
+        reopened = WriteOutbox(path)
+        entries = reopened.pending()
+        
+        assert [entry["op"] for entry in entries] == [OUTBOX_INSERT, OUTBOX_UPDATE]
+        assert entries[0]["payload"] == {"title": "A"}
+        assert reopened.has_pending("a")
+    
+    def test_failed_entries_back_off_and_die(self, tmp_path):
+        """Test failed replays are delayed and given up after max_attempts"""
+        outbox = WriteOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=2)
+        entry_id = outbox.enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        
+        outbox.mark_failed([entry_id], "timeout")
+        assert outbox.pending() == []
+        assert outbox.stats()["pending"] == 1
+        
+        outbox.mark_failed([entry_id], "timeout")
+        assert outbox.stats() == {"pending": 0, "dead": 1, "oldest_pending": None}
+    
+    def test_later_entries_wait_for_older_ones(self, tmp_path):
+        """Test an article's writes are held back while an older one backs off or is dead"""
+        outbox = WriteOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=1)
+        insert_id = outbox.enqueue(OUTBOX_INSERT, "a", {"title": "A"})
+        outbox.enqueue(OUTBOX_UPDATE, "a", {"status": "draft"})
+        outbox.enqueue(OUTBOX_UPDATE, "b", {"status": "draft"})
+        
+        outbox.mark_failed([insert_id], "constraint")
+        
+        assert [entry["article_id"] for entry in outbox.pending()] == ["b"]
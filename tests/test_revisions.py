@@ -0,0 +1,53 @@
+"""
+Tests for delta-compressed article revisions
+"""
+
+from src.revisions import (
+    KEYFRAME_INTERVAL, REVISION_BASE, REVISION_DELTA, build_revision, diff_snapshots, apply_delta,
+    keyframe_of, reconstruct
+)
+
+
+def article_html(paragraphs: int = 60) -> str:
+    return "".join(
+        f"<p>Alinea {i} over wilde zwijnen, reeën en veilige jacht in Nederlandse bossen.</p>"
+        for i in range(paragraphs)
+    )
+
+
+class TestRevisionDeltas:
+    """Test cases for snapshot deltas"""
+    
+    def test_delta_round_trip(self):
+        """Test applying a delta reproduces the new snapshot, lists included"""
+        old = {"title": "Wilde Zwijnen", "content": article_html(), "tags": ["wild"]}
+        new = {**old, "content": old["content"].replace("Alinea 7 ", "Alinea zeven "), "tags": ["wild", "jacht"]}
+        
+        delta = diff_snapshots(old, new)
+        
+        assert set(delta) == {"content", "tags"}
+        assert apply_delta(old, delta) == new
+    
+    def test_small_edit_costs_a_fraction_of_the_article(self):
+        """Test a one-paragraph edit stores far less than a full copy"""
+        old = {"content": article_html()}
+        new = {"content": old["content"].replace("Alinea 30 ", "Alinea dertig ")}
+        
+        base = build_revision("a", 1, None, old)
+        delta = build_revision("a", 2, old, new)
+        
+        assert (base["kind"], delta["kind"]) == (REVISION_BASE, REVISION_DELTA)
+        assert delta["size"] < len(new["content"]) / 10
+    
+    def test_chain_reconstructs_across_keyframes(self):
+        """Test every revision is rebuilt from its keyframe and the deltas after it"""
+        versions = [{"content": article_html(5 + i)} for i in range(KEYFRAME_INTERVAL + 5)]
+        rows = [
+            build_revision("a", revision, versions[revision - 2] if revision > 1 else None, version)
+            for revision, version in enumerate(versions, start=1)
+        ]
+        
+        assert rows[KEYFRAME_INTERVAL]["kind"] == REVISION_BASE
+        for revision in (1, 2, KEYFRAME_INTERVAL, KEYFRAME_INTERVAL + 3):
+            chain = rows[keyframe_of(revision) - 1:revision]
+            assert reconstruct(chain) == versions[revision - 1]
@@ -0,0 +1,94 @@
+"""
+Tests for decayed trending scores and the traffic-weighted category rotation
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.topics import TopicManager
+from src.trending import DecayedScores, TrendingEngine
+
+HOUR = 3600
+
+
+class TestDecayedScores:
+    """Test cases for exponentially decayed scores"""
+    
+    def test_scores_halve_every_half_life(self):
+        """Test a score decays by half per half-life and new views add on top"""
+        scores = DecayedScores(half_life=HOUR, reference=0)
+        scores.add("a", 8, at=0)
+        assert scores.score("a", at=2 * HOUR) == 2
+        
+        scores.add("a", 2, at=2 * HOUR)
+        assert scores.score("a", at=3 * HOUR) == 2
+    
+    def test_recent_views_outrank_old_ones(self):
+        """Test the maintained ranking prefers recent traffic over older, larger traffic"""
+        scores = DecayedScores(half_life=HOUR, reference=0)
+        scores.add("old", 10, at=0)
+        scores.add("new", 4, at=3 * HOUR)
+        scores.add("other", 1, at=3 * HOUR)
+        
+        assert [key for key, _ in scores.top(2, at=3 * HOUR)] == ["new", "old"]
+        assert scores.top(1, at=4 * HOUR) == [("new", 2)]
+    
+    def test_rebase_keeps_scores(self):
+        """Test moving the reference time far ahead leaves scores and order intact"""
+        scores = DecayedScores(half_life=HOUR, reference=0)
+        scores.add("a", 1, at=0)
+        scores.add("b", 3, at=0)
+        scores.add("a", 1024, at=100 * HOUR)
+        
+        assert scores.reference == 100 * HOUR
+        assert [key for key, _ in scores.top(2, at=100 * HOUR)] == ["a", "b"]
+        assert scores.score("a", at=100 * HOUR) == 1024
+
+
+class TestTrendingEngine:
+    """Test cases for article and category trending"""
+    
+    def test_dirty_rows_round_trip(self):
+        """Test changed scores are emitted once and restore into a new engine"""
+        now = time.time()
+        engine = TrendingEngine(half_life_hours=1)
+        engine.record("1", "wild", 5, at=now)
+        engine.record("2", "wild", 2, at=now)
+        
+        rows = engine.dirty_rows()
+        assert {(row["scope"], row["key"]) for row in rows} == {
+            ("article", "1"), ("article", "2"), ("category", "wild")
+        }
+        assert engine.dirty_rows() == []
+        
+        restored = TrendingEngine(half_life_hours=1)
+        restored.load(rows)
+        assert restored.categories.score("wild", at=now + HOUR) == pytest.approx(3.5)
+
+
+class TestTrendingCategoryRotation:
+    """Test cases for traffic-weighted get_next_category"""
+    
+    def _manager(self, published):
+        with patch.object(TopicManager, "__init__", return_value=None):
+            manager = TopicManager()
+        manager.topics_data = {
+            "categories": ["wild", "wapens"],
+            "topics": [
+                {"id": 1, "category": "wild", "priority": "high", "used": False},
+                {"id": 2, "category": "wapens", "priority": "high", "used": False}
+            ]
+        }
+        manager.published_data = {"published_articles": published}
+        manager.category_trends = {}
+        return manager
+    
+    def test_traffic_steers_rotation(self):
+        """Test a busier category is picked despite having more articles"""
+        manager = self._manager([{"category": "wild"}])
+        assert manager.get_next_category() == "wapens"
+        
+        manager.set_category_trends({"wild": 90.0, "wapens": 10.0})
+        assert manager.get_next_category() == "wild"
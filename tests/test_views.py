@@ -0,0 +1,118 @@
+"""
+Tests for page-view aggregation
+"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from src.views import HyperLogLog, ViewAggregator, merge_stats
+
+
+class TestHyperLogLog:
+    """Test cases for the unique visitor sketch"""
+    
+    def test_estimate_within_a_few_percent(self):
+        """Test distinct counts are estimated closely and repeats are ignored"""
+        sketch = HyperLogLog()
+        for i in range(20000):
+            sketch.add(f"visitor-{i % 10000}")
+        
+        assert abs(sketch.count() - 10000) < 500
+    
+    def test_merge_survives_serialization(self):
+        """Test stored registers merge with new ones as a union"""
+        stored, fresh = HyperLogLog(), HyperLogLog()
+        for i in range(300):
+            stored.add(f"v{i}")
+        for i in range(200, 500):
+            fresh.add(f"v{i}")
+        
+        restored = HyperLogLog.from_text(stored.to_text())
+        restored.merge(fresh)
+        
+        assert abs(restored.count() - 500) < 25
+
+
+class TestViewAggregator:
+    """Test cases for in-memory view counters"""
+    
+    def test_drain_restore_and_merge(self):
+        """Test buckets per slug and day, re-queued after a failed flush"""
+        views = ViewAggregator()
+        today = date(2026, 3, 1)
+        for visitor in ("a", "b", "a"):
+            views.record("wilde-zwijnen", visitor, today)
+        
+        buckets = views.drain()
+        assert [(b["slug"], b["day"], b["views"]) for b in buckets] == [("wilde-zwijnen", "2026-03-01", 3)]
+        assert views.pending() == 0
+        
+        views.restore(buckets)
+        views.record("wilde-zwijnen", "c", today)
+        (bucket,) = views.drain()
+        stats = merge_stats({"views": 10, "visitors_hll": None}, bucket)
+        
+        assert (stats["views"], stats["unique_visitors"]) == (14, 3)
+    
+    def test_bucket_cap_drops_new_slugs(self):
+        """Test the number of pending buckets is bounded"""
+        views = ViewAggregator(max_buckets=1)
+        
+        assert views.record("a", "v")
+        assert views.record("a", "w")
+        assert not views.record("b", "v")
+        assert views.dropped == 1
+    
+    def test_unknown_slugs_are_capped(self):
+        """Test slugs not known to be articles hold a bounded number of buckets, also on restore"""
+        views = ViewAggregator(max_buckets=4, max_unverified=1)
+        views.set_known_slugs(["a", "b"])
+        
+        assert views.record("a", "v")
+        assert views.record("nieuw", "v")
+        assert not views.record("onzin", "v")
+        assert views.rejected == 1
+        
+        buckets = views.drain()
+        views.record("b", "v")
+        views.record("onzin", "v")
+        views.restore(buckets)
+        
+        assert sorted(bucket["slug"] for bucket in views.drain()) == ["a", "b", "onzin"]
+        assert views.rejected == 2
+
+
+class TestClientAddress:
+    """Test cases for the visitor address behind proxies"""
+    
+    def test_forwarded_for_only_from_trusted_proxies(self):
+        """Test X-Forwarded-For is ignored unless the peer is a trusted proxy"""
+        from health_server import client_address
+        
+        assert client_address("203.0.113.9", "1.2.3.4", frozenset()) == "203.0.113.9"
+        assert client_address("10.0.0.1", "6.6.6.6, 198.51.100.7", {"10.0.0.1"}) == "198.51.100.7"
+        assert client_address("10.0.0.1", "198.51.100.7, 10.0.0.2", {"10.0.0.1", "10.0.0.2"}) == "198.51.100.7"
+
+
+class TestFlushViews:
+    """Test cases for the health server's view flush"""
+    
+    def test_slug_index_reloaded_only_on_refresh_interval(self, monkeypatch):
+        """Test an idle flush touches nothing and busy flushes reuse the slug index"""
+        import health_server
+        
+        monkeypatch.setattr(health_server, "VIEWS", ViewAggregator())
+        monkeypatch.setattr(health_server, "_slugs_refreshed_at", float("-inf"))
+        manager = MagicMock()
+        manager.get_article_slugs = AsyncMock(return_value={"a"})
+        manager.record_article_views = AsyncMock(return_value=1)
+        
+        assert health_server.flush_views(manager) == 0
+        manager.get_article_slugs.assert_not_called()
+        
+        for _ in range(2):
+            health_server.VIEWS.record("a", "v")
+            assert health_server.flush_views(manager) == 1
+        
+        refreshes = [call.kwargs.get("refresh", False) for call in manager.get_article_slugs.call_args_list]
+        assert refreshes == [True, False, False]